@@ -4,6 +4,8 @@
 import os
 from kivy.utils import platform
 
+from astra_core.log import LOG
+
 def request_android_permissions():
     """Request Android permissions if on Android platform"""
     if platform == 'android':
@@ -21,10 +23,10 @@ def request_android_permissions():
             return True
             
         except ImportError:
-            print("⚠️ Android permissions module not available")
+            LOG.warning("Android permissions module not available")
             return False
         except Exception as e:
-            print(f"⚠️ Error requesting permissions: {e}")
+            LOG.warning("Error requesting permissions: %s", e)
             return False
     
     return True
@@ -45,15 +47,15 @@ def check_android_permissions():
             for permission in permissions:
                 if not check_permission(permission):
                     granted = False
-                    print(f"⚠️ Permission not granted: {permission}")
+                    LOG.warning("Permission not granted", permission=permission)
             
             return granted
             
         except ImportError:
-            print("⚠️ Android permissions module not available")
+            LOG.warning("Android permissions module not available")
             return True
         except Exception as e:
-            print(f"⚠️ Error checking permissions: {e}")
+            LOG.warning("Error checking permissions: %s", e)
             return True
     
     return True
@@ -65,10 +67,10 @@ def get_android_storage_path():
             from android.storage import primary_external_storage_path
             return primary_external_storage_path()
         except ImportError:
-            print("⚠️ Android storage module not available")
+            LOG.warning("Android storage module not available")
             return None
         except Exception as e:
-            print(f"⚠️ Error getting storage path: {e}")
+            LOG.warning("Error getting storage path: %s", e)
             return None
     
     return None
@@ -85,11 +87,53 @@ def save_to_android_storage(filename, content):
                 with open(file_path, 'w', encoding='utf-8') as f:
                     f.write(content)
                 
-                print(f"✅ Saved to Android storage: {file_path}")
+                LOG.info("Saved to Android storage", path=file_path)
                 return True
                 
-        except Exception as e:
-            print(f"❌ Error saving to Android storage: {e}")
+        except Exception:
+            LOG.exception("Error saving to Android storage")
             return False
     
-    return False 
\ No newline at end of file
+    return False
+
+
+def register_trim_memory_callback(on_trim):
+    """Forward Android onTrimMemory/onLowMemory levels to on_trim(level)
+    
+    Runs on the Android UI thread; returns the callbacks object, which the
+    caller must keep a reference to, or None off Android.
+    """
+    if platform == 'android':
+        try:
+            from jnius import PythonJavaClass, autoclass, java_method
+            
+            class TrimMemoryCallbacks(PythonJavaClass):
+                __javainterfaces__ = ['android/content/ComponentCallbacks2']
+                __javacontext__ = 'app'
+                
+                @java_method('(I)V')
+                def onTrimMemory(self, level):
+                    on_trim(level)
+                
+                @java_method('()V')
+                def onLowMemory(self):
+                    # Same as the most severe trim level (TRIM_MEMORY_COMPLETE)
+                    on_trim(80)
+                
+                @java_method('(Landroid/content/res/Configuration;)V')
+                def onConfigurationChanged(self, config):
+                    pass
+            
+            callbacks = TrimMemoryCallbacks()
+            activity = autoclass('org.kivy.android.PythonActivity').mActivity
+            activity.registerComponentCallbacks(callbacks)
+            return callbacks
+            
+        except ImportError:
+            LOG.warning("pyjnius not available")
+            return None
+        except Exception:
+            LOG.exception("Error registering memory callbacks")
+            return None
+    
+    return None
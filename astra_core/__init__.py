@@ -0,0 +1,15 @@
+# astra_core - Kivy-free core of Astra Mobile
+# Import the response engine from here for tests, tools and servers
+
+from .engine import (
+    COMMANDS,
+    OFFLINE_RESPONSES,
+    QUERY_CACHE,
+    get_offline_response,
+    handle_mobile_commands,
+    process_mobile_query,
+    simple_math,
+    stream_mobile_command,
+    stream_mobile_query
+)
+from .settings import BATTERY_SAVER, LOW_MEMORY_MODE, MEMORY_BUDGET_MB, MOBILE_MODE
@@ -0,0 +1,92 @@
+# astra_core/command_registry.py - Slash-command registry for Astra Mobile
+# Exact names and aliases resolve with one dict lookup; unique prefixes via a trie
+
+class Command:
+    """A registered slash command"""
+    __slots__ = ('name', 'handler', 'aliases', 'cacheable', 'description')
+
+    def __init__(self, name, handler, aliases=(), cacheable=True, description=''):
+        self.name = name
+        self.handler = handler
+        self.aliases = tuple(aliases)
+        self.cacheable = cacheable
+        self.description = description
+
+    def __repr__(self):
+        return f"Command({self.name!r})"
+
+
+class CommandRegistry:
+    """Command handlers indexed by name, alias and prefix
+
+    Exact names and aliases are a single dict lookup. Abbreviations such as
+    '/bat' walk a prefix trie and resolve only when exactly one command
+    starts with them, so lookup cost depends on the typed name, never on
+    how many commands exist.
+    """
+
+    def __init__(self):
+        self._commands = {}
+        self._exact = {}
+        self._trie = {'children': {}, 'names': set()}
+
+    def register(self, name, handler, aliases=(), cacheable=True, description=''):
+        """Register a handler under a name and optional aliases"""
+        name = name.lower()
+        keys = (name,) + tuple(alias.lower() for alias in aliases)
+        for key in keys:
+            if key in self._exact:
+                raise ValueError(f"Command already registered: /{key}")
+
+        command = Command(name, handler, aliases, cacheable, description)
+        self._commands[name] = command
+        for key in keys:
+            self._exact[key] = command
+            self._index_prefixes(key, name)
+        return command
+
+    def command(self, name, *aliases, cacheable=True, description=''):
+        """Decorator form of register()"""
+        def decorator(handler):
+            self.register(name, handler, aliases, cacheable, description)
+            return handler
+        return decorator
+
+    def _index_prefixes(self, key, name):
+        """Record name under every prefix of key"""
+        node = self._trie
+        for char in key:
+            node = node['children'].setdefault(char, {'children': {}, 'names': set()})
+            node['names'].add(name)
+
+    def candidates(self, prefix):
+        """Names of all commands reachable from a prefix"""
+        node = self._trie
+        for char in prefix.lower():
+            node = node['children'].get(char)
+            if node is None:
+                return []
+        return sorted(node['names'])
+
+    def resolve(self, name):
+        """Find a command by exact name, alias or unique prefix"""
+        if not name:
+            return None
+        name = name.lower()
+        command = self._exact.get(name)
+        if command is not None:
+            return command
+        names = self.candidates(name)
+        if len(names) == 1:
+            return self._commands[names[0]]
+        return None
+
+    def commands(self):
+        """All registered commands in registration order"""
+        return list(self._commands.values())
+
+    def __contains__(self, name):
+        return self.resolve(name) is not None
+
+    def __len__(self):
+        return len(self._commands)
@@ -0,0 +1,471 @@
+# astra_core/engine.py - Astra Mobile response engine
+# Offline replies, math and slash commands; no UI imports so it loads headless
+
+import time
+from datetime import datetime
+
+from .command_registry import CommandRegistry
+from .keyword_matcher import KeywordMatcher
+from .math_engine import MathError, MathLimitError, calculate, extract_expression
+from .log import LOG, WARNING
+from .metrics import METRICS, current_rss, format_bytes
+from .response_cache import ResponseCache, canonical_query, dynamic_response, resolve_response
+from .settings import BATTERY_SAVER, LOW_MEMORY_MODE, MEMORY_BUDGET_MB
+from .tracing import TRACER
+from .traffic import TRAFFIC
+
+@dynamic_response(ttl=1.0)
+def current_time_response():
+    """Current time, computed per request"""
+    return f"⏰ Current time: {datetime.now().strftime('%H:%M:%S')}"
+
+@dynamic_response(ttl=60.0)
+def current_date_response():
+    """Current date, computed per request"""
+    return f"📅 Today: {datetime.now().strftime('%Y-%m-%d')}"
+
+# Simple offline responses for mobile
+# Entries are static strings or callables evaluated when the query arrives
+OFFLINE_RESPONSES = {
+    'hello': "👋 Hi! I'm Astra Mobile - your lightweight AI assistant!",
+    'hi': "👋 Hello! How can I help you today?",
+    'help': "📱 **Astra Mobile Help**\n\n• Ask me questions\n• I work offline\n• Lightweight & fast\n• Battery friendly",
+    'what can you do': "🤖 I can:\n• Answer questions\n• Work offline\n• Save battery\n• Run on low-end phones",
+    'time': current_time_response,
+    'date': current_date_response,
+    'weather': "🌤️ I can't check weather offline, but I'm here to help with other questions!",
+    'calculator': "🧮 I can do simple math! Try: 'calculate 15 + 23'",
+    'battery': "🔋 Astra Mobile is optimized for battery life!",
+    'memory': "💾 Astra Mobile uses minimal memory for smooth performance!",
+    'offline': "📡 Astra Mobile works completely offline!",
+    'lightweight': "⚡ Astra Mobile is designed to be lightweight and fast!",
+    'mobile': "📱 Astra Mobile - optimized for smartphones!",
+    'fast': "🚀 Astra Mobile is fast and responsive!",
+    'simple': "✨ Astra Mobile keeps things simple and efficient!"
+}
+
+# Math operations
+def simple_math(query):
+    """Handle simple math calculations"""
+    try:
+        result = calculate(extract_expression(query))
+        return f"🧮 Result: {round(result, 2)}"
+    except MathLimitError:
+        return "🧮 That calculation is too big for Astra Mobile. Try smaller numbers."
+    except MathError:
+        return None
+
+# Keyword groups checked after the offline responses (lower priority wins)
+MATH_KEYWORDS = ['calculate', 'math', 'plus', 'minus', 'times', 'multiply', 'multiplied', 'divide', 'divided']
+GREETING_WORDS = ['hello', 'hi', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening']
+HELP_WORDS = ['help', 'what can you do', 'capabilities']
+
+GREETING_RESPONSE = "👋 Hello! I'm Astra Mobile - your lightweight AI assistant!"
+HELP_RESPONSE = "📱 **Astra Mobile Help**\n\n• Ask me questions\n• I work offline\n• Lightweight & fast\n• Battery friendly\n• Simple math\n• Time & date"
+DEFAULT_RESPONSE = "🤖 I'm Astra Mobile - a lightweight AI assistant. I work offline and am optimized for mobile devices. Ask me anything!"
+
+def build_offline_matcher():
+    """Compile every offline keyword into a single matcher"""
+    matcher = KeywordMatcher()
+    for keyword in OFFLINE_RESPONSES:
+        matcher.add(keyword, ('offline', keyword), priority=0)
+    for keyword in MATH_KEYWORDS:
+        matcher.add(keyword, ('math', None), priority=1)
+    for keyword in GREETING_WORDS:
+        matcher.add(keyword, ('greeting', GREETING_RESPONSE), priority=2)
+    for keyword in HELP_WORDS:
+        matcher.add(keyword, ('help', HELP_RESPONSE), priority=3)
+    return matcher.compile()
+
+# Compiled once at load time; rebuild if OFFLINE_RESPONSES gains new keys
+OFFLINE_MATCHER = build_offline_matcher()
+
+# Simple offline AI responses
+def get_offline_response(query):
+    """Get offline response for common queries"""
+    response, _ = match_offline_response(query, query.lower().strip())
+    return response
+
+def match_offline_response(query, query_lower):
+    """Match a query against the offline keywords, returning (text, ttl)"""
+    math_tried = False
+    tracing = TRACER.enabled
+    
+    # One split of the query finds every keyword, best priority first
+    if tracing:
+        mark = time.perf_counter()
+    matches = OFFLINE_MATCHER.ranked(query_lower)
+    if tracing:
+        TRACER.complete('offline.scan', mark, time.perf_counter() - mark)
+    
+    for match in matches:
+        kind, payload = match.value
+        
+        if kind == 'offline':
+            entry = OFFLINE_RESPONSES.get(payload)
+            if entry is not None:
+                if not tracing:
+                    return resolve_response(entry)
+                with TRACER.span('offline.resolve'):
+                    return resolve_response(entry)
+            continue
+        
+        if kind == 'math':
+            if math_tried:
+                continue
+            math_tried = True
+            if tracing:
+                mark = time.perf_counter()
+            math_result = simple_math(query)
+            if tracing:
+                TRACER.complete('offline.math', mark, time.perf_counter() - mark)
+            if math_result:
+                return math_result, None
+            continue
+        
+        # Greeting and help fallbacks are plain strings
+        return payload, None
+    
+    # Default response
+    return DEFAULT_RESPONSE, None
+
+# Finished replies keyed by canonical query; a fixed entry count keeps memory flat
+QUERY_CACHE_SIZE = 64 if LOW_MEMORY_MODE else 512
+MAX_CACHED_QUERY_LENGTH = 200
+QUERY_CACHE = ResponseCache(maxsize=QUERY_CACHE_SIZE)
+METRICS.register_provider('query_cache', QUERY_CACHE.stats)
+
+def iter_chunks(result):
+    """Normalize a handler result (string or iterable of strings) into chunks"""
+    if isinstance(result, str):
+        yield result
+    else:
+        yield from result
+
+# Mobile-optimized query processor
+def process_mobile_query(query):
+    """Process queries with mobile optimization"""
+    return ''.join(stream_mobile_query(query))
+
+def stream_mobile_query(query):
+    """Process a query, yielding the response in chunks as they are produced"""
+    if TRAFFIC.enabled:
+        return record_traffic(query, produce_mobile_query(query))
+    return produce_mobile_query(query)
+
+def record_traffic(query, chunks):
+    """Pass chunks through, then log the query and its reply size"""
+    arrived = TRAFFIC.clock()
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk.encode('utf-8'))
+            yield chunk
+    finally:
+        TRAFFIC.record(query, size, arrived)
+
+def produce_mobile_query(query):
+    """Generate the response chunks for stream_mobile_query
+    
+    Latency is recorded per handler ('cache', 'offline', '/<command>') and
+    counts only time spent producing chunks, not time the consumer holds them.
+    """
+    started = time.perf_counter()
+    if not query or len(query.strip()) == 0:
+        METRICS.record_query('invalid', time.perf_counter() - started)
+        yield "🤖 Please ask me a question!"
+        return
+    
+    if len(query.strip()) < 2:
+        METRICS.record_query('invalid', time.perf_counter() - started)
+        yield "🤖 Please ask a more detailed question."
+        return
+    
+    # Spans are timed by hand behind one flag check: the hot path allocates nothing when off
+    tracing = TRACER.enabled
+    
+    # Handlers answer the canonical text, so the cache key always matches their input
+    if tracing:
+        mark = time.perf_counter()
+    key = canonical_query(query)
+    is_command = key.startswith('/')
+    cacheable = (
+        len(key) <= MAX_CACHED_QUERY_LENGTH
+        and not (is_command and is_uncached_command(key[1:]))
+    )
+    if tracing:
+        TRACER.complete('query.canonicalize', mark, time.perf_counter() - mark)
+    
+    if cacheable:
+        if tracing:
+            mark = time.perf_counter()
+        cached = QUERY_CACHE.get(key)
+        if tracing:
+            TRACER.complete('query.cache_lookup', mark, time.perf_counter() - mark)
+        if cached is not None:
+            elapsed = time.perf_counter() - started
+            METRICS.record_query('cache', elapsed)
+            if tracing:
+                TRACER.complete('query', started, elapsed, {'handler': 'cache'})
+            yield cached
+            return
+    
+    if is_command:
+        if tracing:
+            mark = time.perf_counter()
+        entry = COMMANDS.resolve(split_command(key[1:])[0])
+        if tracing:
+            TRACER.complete('command.parse', mark, time.perf_counter() - mark)
+        handler = f"/{entry.name}" if entry is not None else '/unknown'
+    else:
+        handler = 'offline'
+    
+    parts = []
+    busy = 0.0
+    resumed = started
+    try:
+        # Check for commands
+        if is_command:
+            chunks = stream_mobile_command(key[1:])
+            ttl = None
+        else:
+            # Get offline response and add mobile indicator
+            if tracing:
+                mark = time.perf_counter()
+            text, ttl = match_offline_response(key, key)
+            if tracing:
+                TRACER.complete('offline.match', mark, time.perf_counter() - mark)
+            chunks = (text, " [mobile]")
+        
+        for chunk in chunks:
+            parts.append(chunk)
+            busy += time.perf_counter() - resumed
+            yield chunk
+            resumed = time.perf_counter()
+        
+        if cacheable:
+            if tracing:
+                mark = time.perf_counter()
+            QUERY_CACHE.put(key, ''.join(parts), ttl)
+            if tracing:
+                TRACER.complete('query.cache_store', mark, time.perf_counter() - mark)
+        
+    except Exception:
+        LOG.exception("Mobile query error", handler=handler)
+        error = "🤖 Sorry, I encountered an error. Please try again. [mobile]"
+        yield f"\n{error}" if parts else error
+    
+    finally:
+        busy += time.perf_counter() - resumed
+        METRICS.record_query(handler, busy)
+        # Whole query as one span; its length is production time, not wall time
+        if tracing:
+            TRACER.complete('query', started, busy, {'handler': handler})
+
+# Slash commands; handlers receive the text after the command name
+COMMANDS = CommandRegistry()
+
+COMMAND_HELP = """📱 **Astra Mobile Commands**
+
+**Basic Commands:**
+• /help - Show this help
+• /time - Current time
+• /date - Current date
+• /status - Uptime, queries and latency
+• /clear - Clear chat
+• /battery - Power saving stats
+• /memory - Memory use against the budget
+• /trace - Pipeline tracing (on/off/dump)
+• /logs - Recent warnings and errors (all/export)
+• /offline - Offline status
+
+**Features:**
+• 🔋 Battery optimized
+• 💾 Low memory usage
+• 📡 Works offline
+• ⚡ Fast responses
+• 📱 Mobile friendly
+
+**Examples:**
+• "Hello" - Get greeting
+• "Calculate 15 + 23" - Math
+• "What time is it?" - Time
+• "Help" - Get help
+
+I'm designed for low-end smartphones! 🚀"""
+
+@COMMANDS.command('help', '?', 'commands', description="Show this help")
+def help_command(args):
+    # Long reply: stream it one section at a time
+    sections = COMMAND_HELP.split('\n\n')
+    for index, section in enumerate(sections):
+        yield section if index == 0 else f"\n\n{section}"
+
+@COMMANDS.command('time', 'now', 'clock', cacheable=False, description="Current time")
+def time_command(args):
+    return f"{current_time_response()} [mobile]"
+
+@COMMANDS.command('date', 'today', cacheable=False, description="Current date")
+def date_command(args):
+    return f"{current_date_response()} [mobile]"
+
+def format_ms(value):
+    """Milliseconds for display ('-' when there is no data yet)"""
+    return "-" if value is None else f"{value:.1f}ms"
+
+def format_uptime(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {seconds:02d}s"
+
+@COMMANDS.command('status', cacheable=False, description="App status")
+def status_command(args):
+    latency = METRICS.latency()
+    overall = latency['all']
+    lines = [
+        "📊 **Astra Mobile Status**",
+        f"⏱️ Uptime: {format_uptime(METRICS.uptime())} · CPU: {time.process_time():.1f}s",
+        f"💬 Queries: {METRICS.queries} · p50 {format_ms(overall['p50_ms'])} · "
+        f"p95 {format_ms(overall['p95_ms'])} · p99 {format_ms(overall['p99_ms'])}"
+    ]
+    # Slowest handlers first
+    handlers = sorted(
+        (item for item in latency.items() if item[0] != 'all'),
+        key=lambda item: item[1]['p95_ms'] or 0,
+        reverse=True
+    )
+    for name, summary in handlers[:3]:
+        lines.append(f"  • {name}: {summary['count']}× p95 {format_ms(summary['p95_ms'])}")
+    
+    cache = METRICS.provider('query_cache')
+    if cache is not None:
+        lines.append(f"🗂️ Cache: {cache['hit_rate'] * 100:.0f}% hits · {cache['size']}/{cache['maxsize']} entries")
+    frames = METRICS.provider('frames')
+    if frames is not None:
+        lines.append(f"🎞️ Frames: {frames['fps']:.0f} FPS · p50 {format_ms(frames['p50_ms'])} · "
+                     f"p95 {format_ms(frames['p95_ms'])} · p99 {format_ms(frames['p99_ms'])}")
+    startup = METRICS.provider('startup')
+    if startup is not None and startup.get('time_to_interactive_ms') is not None:
+        lines.append(f"⚡ Time to interactive: {startup['time_to_interactive_ms']:.0f}ms")
+    return '\n'.join(lines) + " [mobile]"
+
+@COMMANDS.command('clear', 'cls', description="Clear chat")
+def clear_command(args):
+    return "🗑️ Chat cleared. [mobile]"
+
+@COMMANDS.command('battery', 'power', cacheable=False, description="Battery info")
+def battery_command(args):
+    lines = [
+        "🔋 **Battery Saver**: " + ("ON" if BATTERY_SAVER else "OFF"),
+        f"⚙️ CPU time: {time.process_time():.1f}s in {format_uptime(METRICS.uptime())}"
+    ]
+    power = METRICS.provider('power')
+    if power is not None:
+        lines.append(f"📍 State: {power['state']} · {power['transitions']} transitions")
+        for state in ('active', 'idle', 'paused'):
+            stats = power[state]
+            if stats['seconds']:
+                lines.append(f"  • {state}: {stats['seconds']:.0f}s · {stats['wakeups_per_second']:.1f} wakeups/s")
+    return '\n'.join(lines) + " [mobile]"
+
+@COMMANDS.command('memory', 'mem', 'ram', cacheable=False, description="Memory usage")
+def memory_command(args):
+    governor = METRICS.provider('memory')
+    rss = governor['rss'] if governor is not None else current_rss()
+    budget = governor['budget'] if governor is not None else MEMORY_BUDGET_MB * 1024 * 1024
+    usage = f" ({rss / budget * 100:.0f}%)" if rss is not None and budget else ""
+    lines = [
+        "💾 **Memory**",
+        f"📈 RSS: {format_bytes(rss)} of {format_bytes(budget)} budget{usage}"
+    ]
+    if governor is not None:
+        lines.append(f"✂️ Trims: {governor['moderate_trims']} moderate · "
+                     f"{governor['critical_trims']} critical · {governor['signals']} OS signals")
+    history = METRICS.provider('history')
+    if history is not None:
+        lines.append(f"📝 History: {history['in_memory']} of {history['messages']} messages "
+                     f"in memory ({format_bytes(history['bytes'])})")
+    cache = METRICS.provider('query_cache')
+    if cache is not None:
+        lines.append(f"🗂️ Query cache: {cache['size']}/{cache['maxsize']} entries")
+    return '\n'.join(lines) + " [mobile]"
+
+@COMMANDS.command('trace', cacheable=False, description="Pipeline tracing")
+def trace_command(args):
+    action = args.lower()
+    if action == 'on':
+        TRACER.enable()
+        return "🔬 Tracing on. Send some queries, then /trace for a summary. [mobile]"
+    if action == 'off':
+        TRACER.disable()
+        return "🔬 Tracing off. [mobile]"
+    if action == 'clear':
+        TRACER.clear()
+        return "🔬 Trace buffer cleared. [mobile]"
+    if action == 'dump':
+        try:
+            path = TRACER.dump()
+        except OSError as e:
+            return f"❌ Could not write trace: {e} [mobile]"
+        return f"🔬 {len(TRACER)} spans written to {path} (open in chrome://tracing or Perfetto) [mobile]"
+    
+    lines = [f"🔬 **Tracing {'ON' if TRACER.enabled else 'OFF'}** · {len(TRACER)} spans"]
+    for row in TRACER.summary()[:8]:
+        lines.append(f"  • {row['name']}: {row['count']}× mean {row['mean_ms']:.3f}ms")
+    lines.append("Use /trace on|off|dump|clear")
+    return '\n'.join(lines) + " [mobile]"
+
+@COMMANDS.command('logs', 'log', cacheable=False, description="Recent diagnostics")
+def logs_command(args):
+    action = args.lower()
+    if action == 'export':
+        try:
+            path = LOG.export()
+        except OSError as e:
+            return f"❌ Could not export logs: {e} [mobile]"
+        return f"📋 {len(LOG.records())} log records exported to {path} [mobile]"
+    
+    # Warnings and errors by default; '/logs all' includes info and debug
+    records = LOG.records(min_level=0 if action == 'all' else WARNING, limit=10)
+    if not records:
+        return "📋 No warnings or errors logged. Use /logs all or /logs export [mobile]"
+    lines = [f"📋 **Recent logs** ({len(records)})"]
+    for entry in records:
+        icon = "❌" if entry['level'] == 'ERROR' else "⚠️" if entry['level'] == 'WARNING' else "•"
+        stamp = datetime.fromtimestamp(entry['time']).strftime('%H:%M:%S')
+        lines.append(f"{icon} {stamp} {entry['message']}")
+    return '\n'.join(lines) + " [mobile]"
+
+@COMMANDS.command('offline', description="Offline status")
+def offline_command(args):
+    return "📡 Astra Mobile works completely offline!\n• No internet required\n• Instant responses\n• Always available [mobile]"
+
+def split_command(command):
+    """Split '/name args' into (name, args)"""
+    name, _, args = command.strip().lstrip('/').partition(' ')
+    return name.lower(), args.strip()
+
+def is_uncached_command(command):
+    """Check whether a command's reply must be computed every time"""
+    entry = COMMANDS.resolve(split_command(command)[0])
+    return entry is not None and not entry.cacheable
+
+def handle_mobile_commands(command):
+    """Handle mobile-specific commands"""
+    return ''.join(stream_mobile_command(command))
+
+def stream_mobile_command(command):
+    """Run a command, yielding its reply in chunks (handlers may be generators)"""
+    name, args = split_command(command)
+    entry = COMMANDS.resolve(name)
+    
+    if entry is None:
+        matches = COMMANDS.candidates(name) if name else []
+        if len(matches) > 1:
+            options = ', '.join(f"/{match}" for match in matches)
+            yield f"❓ Did you mean: {options}? [mobile]"
+            return
+        yield "❓ Unknown command. Type /help for available commands. [mobile]"
+        return
+    
+    yield from iter_chunks(entry.handler(args))
@@ -0,0 +1,62 @@
+# astra_core/frame_scheduler.py - Per-frame UI update coalescing for Astra Mobile
+# Any number of layout/scroll requests within a frame run as one pass
+
+class FrameCoalescer:
+    """Collapse repeated UI update requests into one pass per frame
+
+    Update kinds ('sizes', 'scroll', ...) are registered with a handler and
+    a run order. request() only marks a kind dirty and arms a single
+    next-frame trigger; when the frame boundary comes, every dirty kind runs
+    exactly once, in order. `trigger_factory(callback)` must return a
+    callable that schedules callback for the next frame and is idempotent
+    within a frame (Kivy's Clock.create_trigger(callback, 0) is).
+    """
+
+    def __init__(self, trigger_factory=None):
+        self._handlers = []
+        self._pending = set()
+        self._trigger = trigger_factory(self.flush) if trigger_factory else None
+        self.requests = 0
+        self.passes = 0
+        self.runs = 0
+
+    def register(self, kind, handler, order=0):
+        """Register the handler for an update kind"""
+        self._handlers.append((order, kind, handler))
+        self._handlers.sort(key=lambda entry: entry[0])
+
+    def request(self, kind):
+        """Ask for an update at the next frame boundary"""
+        self.requests += 1
+        self._pending.add(kind)
+        if self._trigger is not None:
+            self._trigger()
+
+    @property
+    def pending(self):
+        return bool(self._pending)
+
+    def flush(self, *args):
+        """Run every pending update once (called at the frame boundary)"""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = set()
+        self.passes += 1
+        for _, kind, handler in self._handlers:
+            if kind in pending:
+                self.runs += 1
+                handler()
+
+    @property
+    def skipped(self):
+        """Requests that were absorbed into an already scheduled run"""
+        return self.requests - self.runs - len(self._pending)
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'passes': self.passes,
+            'runs': self.runs,
+            'skipped': self.skipped
+        }
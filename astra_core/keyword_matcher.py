@@ -0,0 +1,136 @@
+# astra_core/keyword_matcher.py - Precompiled multi-keyword matcher for Astra Mobile
+# Queries are split into words by the regex engine; keywords are found with dict lookups
+
+import re
+
+# Runs of word characters (alphanumerics and '_'): no keyword may touch one
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class KeywordMatch:
+    """A single keyword hit inside a query"""
+    __slots__ = ('start', 'end', 'keyword', 'value', 'priority', 'order')
+
+    def __init__(self, start, end, keyword, value, priority, order):
+        self.start = start
+        self.end = end
+        self.keyword = keyword
+        self.value = value
+        self.priority = priority
+        self.order = order
+
+    def __repr__(self):
+        return f"KeywordMatch({self.keyword!r}, {self.start}-{self.end}, priority={self.priority})"
+
+
+def _is_word_char(char):
+    """Characters that may not touch a whole-word keyword"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """Match many keywords against a query at once
+
+    Keywords are added with a value and a priority (lower wins), then
+    compiled once into a dict from first word to keywords. A whole-word
+    keyword can only occur where its first word is one of the query's
+    words. A query is split into words at C level (str.split, or
+    WORD_PATTERN.findall when it has punctuation) and intersected with the
+    dict, however many keywords are registered; only keywords whose first
+    word is present are then located with str.find. Keywords that may
+    match inside words, or start with punctuation, are always located.
+    """
+
+    def __init__(self):
+        self._patterns = []
+        self._by_first_word = None
+        self._scanned = None
+        self._rank = None
+
+    def add(self, keyword, value, priority=0, whole_word=True):
+        """Register a keyword; call compile() before matching again"""
+        keyword = keyword.lower()
+        if not keyword:
+            raise ValueError("Keyword must not be empty")
+        order = len(self._patterns)
+        self._patterns.append((keyword, value, priority, whole_word, order))
+        self._by_first_word = None
+        return self
+
+    def compile(self):
+        """Index whole-word keywords by their first word"""
+        by_first_word = {}
+        scanned = []
+        for index, (keyword, _, _, whole_word, _) in enumerate(self._patterns):
+            first = WORD_PATTERN.match(keyword) if whole_word else None
+            if first is None:
+                scanned.append(index)
+            else:
+                by_first_word.setdefault(first.group(), []).append(index)
+
+        self._by_first_word = {word: tuple(indices) for word, indices in by_first_word.items()}
+        self._scanned = tuple(scanned)
+        self._rank = [(priority, order) for _, _, priority, _, order in self._patterns]
+        return self
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _candidates(self, text):
+        """Indices of the keywords that can occur in lower-cased text"""
+        if self._by_first_word is None:
+            self.compile()
+        by_first_word = self._by_first_word
+        words = text.split()
+        # Plain words split on whitespace already; otherwise let the regex find them
+        if not ''.join(words).isalnum():
+            words = WORD_PATTERN.findall(text)
+        words = by_first_word.keys() & words
+        candidates = [index for word in words for index in by_first_word[word]]
+        candidates.extend(self._scanned)
+        return candidates
+
+    @staticmethod
+    def _find(text, keyword, whole_word, start=0):
+        """Offset of the next hit of keyword at or after start, or -1"""
+        start = text.find(keyword, start)
+        if not whole_word:
+            return start
+        length = len(text)
+        while start >= 0:
+            end = start + len(keyword)
+            if not (start > 0 and _is_word_char(text[start - 1])):
+                if not (end < length and _is_word_char(text[end])):
+                    return start
+            start = text.find(keyword, start + 1)
+        return -1
+
+    def find_all(self, text):
+        """Return every whole-word-respecting keyword hit in text"""
+        text = text.lower()
+        matches = []
+        for index in self._candidates(text):
+            keyword, value, priority, whole_word, order = self._patterns[index]
+            start = self._find(text, keyword, whole_word)
+            while start >= 0:
+                matches.append(KeywordMatch(start, start + len(keyword), keyword, value, priority, order))
+                start = self._find(text, keyword, whole_word, start + 1)
+        return matches
+
+    def ranked(self, text):
+        """Return each keyword's first hit, ordered by priority, then registration order"""
+        text = text.lower()
+        candidates = self._candidates(text)
+        candidates.sort(key=self._rank.__getitem__)
+        matches = []
+        for index in candidates:
+            keyword, value, priority, whole_word, order = self._patterns[index]
+            start = self._find(text, keyword, whole_word)
+            if start >= 0:
+                matches.append(KeywordMatch(start, start + len(keyword), keyword, value, priority, order))
+        return matches
+
+    def best(self, text):
+        """Return the highest-priority hit, or None"""
+        ranked = self.ranked(text)
+        return ranked[0] if ranked else None
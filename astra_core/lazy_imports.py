@@ -0,0 +1,31 @@
+# astra_core/lazy_imports.py - Optional dependencies for Astra Mobile
+# Checked without importing, loaded on first use, so they cost nothing at startup
+
+import importlib
+import importlib.util
+import sys
+
+_MODULES = {}
+
+
+def is_available(name):
+    """Whether an optional module is installed, without importing it"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def optional_import(name):
+    """Import an optional module on first use; None if it is missing
+
+    The outcome is remembered, so a missing module is only searched for once.
+    """
+    if name not in _MODULES:
+        try:
+            _MODULES[name] = importlib.import_module(name)
+        except ImportError:
+            _MODULES[name] = None
+    return _MODULES[name]
@@ -0,0 +1,199 @@
+# astra_core/log.py - Structured ring-buffer logging for Astra Mobile
+# No I/O on the calling thread: records go to memory, a background thread writes batches
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+class RingLogger:
+    """Leveled, structured log kept in a fixed-size ring buffer
+
+    The level check happens before anything else, so a filtered call costs
+    one comparison; messages use %-style args and are only formatted when
+    read or written. Records keep keyword fields as structured data.
+
+    Once set_path() is called, a daemon thread appends new records to the
+    file as JSON lines `flush_interval` seconds after the first unwritten
+    record (or as soon as `batch_size` are waiting), rotating it at
+    `max_bytes`. With nothing logged the thread does not wake up. With
+    echo, WARNING and above are also printed (desktop development).
+    """
+
+    def __init__(self, capacity=500, level=INFO, echo=False, flush_interval=2.0,
+                 batch_size=64, max_bytes=256 * 1024):
+        self.level = level
+        self.echo = echo
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.path = None
+        self.export_dir = None
+        self.dropped = 0
+        self._records = deque(maxlen=capacity)
+        self._pending = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def is_enabled_for(self, level):
+        return level >= self.level
+
+    def log(self, level, message, *args, exc_info=False, **fields):
+        if level < self.level:
+            return
+        trace = None
+        if exc_info:
+            # Only error paths pay for the traceback module
+            import traceback
+            trace = traceback.format_exc()
+        record = (time.time(), level, message, args, fields or None, trace)
+        with self._lock:
+            self._records.append(record)
+            if self._thread is not None:
+                if len(self._pending) == self._pending.maxlen:
+                    self.dropped += 1
+                self._pending.append(record)
+                # Wake the writer for the first record of a batch and when it is full
+                if len(self._pending) in (1, self.batch_size):
+                    self._wake.set()
+        if self.echo and level >= WARNING:
+            print(self.format(record), file=sys.stderr)
+
+    def debug(self, message, *args, **fields):
+        self.log(DEBUG, message, *args, **fields)
+
+    def info(self, message, *args, **fields):
+        self.log(INFO, message, *args, **fields)
+
+    def warning(self, message, *args, **fields):
+        self.log(WARNING, message, *args, **fields)
+
+    def error(self, message, *args, **fields):
+        self.log(ERROR, message, *args, **fields)
+
+    def exception(self, message, *args, **fields):
+        """ERROR with the current traceback attached"""
+        self.log(ERROR, message, *args, exc_info=True, **fields)
+
+    # Reading
+
+    @staticmethod
+    def to_dict(record):
+        timestamp, level, message, args, fields, trace = record
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
+        entry = {'time': round(timestamp, 3), 'level': LEVEL_NAMES.get(level, str(level)), 'message': message}
+        if fields:
+            entry['fields'] = {key: value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+                               for key, value in fields.items()}
+        if trace:
+            entry['traceback'] = trace
+        return entry
+
+    @classmethod
+    def format(cls, record):
+        entry = cls.to_dict(record)
+        line = f"{time.strftime('%H:%M:%S', time.localtime(entry['time']))} {entry['level']} {entry['message']}"
+        if 'fields' in entry:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in entry['fields'].items())
+        if 'traceback' in entry:
+            line += '\n' + entry['traceback'].rstrip()
+        return line
+
+    def records(self, min_level=DEBUG, limit=None):
+        """Recent records as dicts, oldest first"""
+        with self._lock:
+            selected = [record for record in self._records if record[1] >= min_level]
+        if limit is not None:
+            selected = selected[-limit:]
+        return [self.to_dict(record) for record in selected]
+
+    def export(self, path=None):
+        """Write the whole ring buffer as JSON lines and return the path"""
+        if path is None:
+            directory = self.export_dir
+            if directory is None:
+                import tempfile
+                directory = tempfile.gettempdir()
+            path = os.path.join(directory, 'astra_logs_export.jsonl')
+        lines = [json.dumps(entry, ensure_ascii=False) for entry in self.records()]
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write('\n'.join(lines) + ('\n' if lines else ''))
+        return path
+
+    # Disk
+
+    def set_path(self, path):
+        """Persist records to path from a background thread"""
+        self.path = path
+        self.export_dir = os.path.dirname(path) or self.export_dir
+        with self._lock:
+            if self._thread is None:
+                # Everything logged so far goes to disk too
+                self._pending.extend(self._records)
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='astra-log', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            # Sleep until something is logged (no idle wakeups), then give
+            # the batch flush_interval to fill up
+            self._wake.wait()
+            self._wake.clear()
+            if not self._stopping and len(self._pending) < self.batch_size:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Append waiting records to the log file"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch or self.path is None:
+            return
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+            with open(self.path, 'a', encoding='utf-8') as output:
+                output.write(''.join(json.dumps(self.to_dict(record), ensure_ascii=False) + '\n'
+                                     for record in batch))
+        except OSError:
+            # Nowhere to report it; the records stay in the ring buffer
+            self.dropped += len(batch)
+
+    def close(self):
+        """Stop the writer thread after a final flush"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        thread.join(timeout=2)
+        self._thread = None
+        self.flush()
+
+
+def default_level():
+    return LEVELS.get(os.environ.get('ASTRA_LOG_LEVEL', '').upper(), INFO)
+
+
+# Android's stdout is logcat, written synchronously; only echo on desktop
+LOG = RingLogger(level=default_level(), echo='ANDROID_ARGUMENT' not in os.environ)
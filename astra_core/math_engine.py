@@ -0,0 +1,191 @@
+# astra_core/math_engine.py - Bounded arithmetic engine for Astra Mobile
+# Parses expressions once into RPN, caches them and evaluates within fixed limits
+
+import math
+import re
+from functools import lru_cache
+
+# Limits that keep every calculation within a small, fixed time budget
+MAX_EXPRESSION_LENGTH = 200
+MAX_STEPS = 128
+MAX_VALUE = 10 ** 15
+MAX_EXPONENT = 64
+MAX_RESULT_DIGITS = 15
+
+
+class MathError(ValueError):
+    """Raised when an expression cannot be parsed or evaluated"""
+
+
+class MathLimitError(MathError):
+    """Raised when an expression exceeds the engine's limits"""
+
+
+# Word operators, longest first so 'divided by' wins over 'divide'
+_WORD_OPERATORS = {
+    'divided by': '/',
+    'multiplied by': '*',
+    'to the power of': '**',
+    'plus': '+',
+    'minus': '-',
+    'times': '*',
+    'multiply': '*',
+    'divide': '/',
+}
+_WORD_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(word) for word in _WORD_OPERATORS) + r')\b'
+)
+_NON_MATH_PATTERN = re.compile(r'[^0-9+\-*/(). ]')
+_TOKEN_PATTERN = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|(\*\*|[-+*/()]))')
+
+# Operator precedence and associativity ('neg' is unary minus)
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, 'neg': 3, '**': 4}
+_RIGHT_ASSOCIATIVE = {'**', 'neg'}
+
+
+def extract_expression(query):
+    """Turn a natural-language query into a bare arithmetic expression"""
+    text = _WORD_PATTERN.sub(lambda match: _WORD_OPERATORS[match.group(1)], query.lower())
+    return _NON_MATH_PATTERN.sub('', text).strip()
+
+
+def _tokenize(expression):
+    """Split an expression into number and operator tokens"""
+    tokens = []
+    position = 0
+    length = len(expression)
+    while position < length:
+        match = _TOKEN_PATTERN.match(expression, position)
+        if not match:
+            if expression[position:].strip():
+                raise MathError(f"Unexpected input at position {position}")
+            break
+        number, operator = match.groups()
+        if number is not None:
+            value = float(number) if '.' in number else int(number)
+            if abs(value) > MAX_VALUE:
+                raise MathLimitError("Operand too large")
+            tokens.append(value)
+        else:
+            tokens.append(operator)
+        position = match.end()
+    return tokens
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expression):
+    """Parse an expression into an RPN tuple (cached per expression)"""
+    output = []
+    operators = []
+    expect_operand = True
+
+    for token in _tokenize(expression):
+        if not isinstance(token, str):
+            if not expect_operand:
+                raise MathError("Missing operator")
+            output.append(token)
+            expect_operand = False
+        elif token == '(':
+            if not expect_operand:
+                raise MathError("Missing operator")
+            operators.append(token)
+        elif token == ')':
+            if expect_operand:
+                raise MathError("Empty parentheses")
+            while operators and operators[-1] != '(':
+                output.append(operators.pop())
+            if not operators:
+                raise MathError("Unbalanced parentheses")
+            operators.pop()
+        elif expect_operand:
+            # Prefix sign: '-' negates, '+' is a no-op
+            if token == '-':
+                operators.append('neg')
+            elif token != '+':
+                raise MathError(f"Unexpected operator {token!r}")
+        else:
+            precedence = _PRECEDENCE[token]
+            while operators and operators[-1] != '(':
+                top = _PRECEDENCE[operators[-1]]
+                if top > precedence or (top == precedence and token not in _RIGHT_ASSOCIATIVE):
+                    output.append(operators.pop())
+                else:
+                    break
+            operators.append(token)
+            expect_operand = True
+
+    if expect_operand:
+        raise MathError("Incomplete expression")
+    while operators:
+        operator = operators.pop()
+        if operator == '(':
+            raise MathError("Unbalanced parentheses")
+        output.append(operator)
+
+    if len(output) > MAX_STEPS:
+        raise MathLimitError("Expression too complex")
+    return tuple(output)
+
+
+def _power(base, exponent):
+    """Exponentiation with the result size checked before computing"""
+    if abs(exponent) > MAX_EXPONENT:
+        raise MathLimitError("Exponent too large")
+    if base == 0 and exponent < 0:
+        raise MathError("Division by zero")
+    # exponent * log10|base| is the result's order of magnitude: positive and
+    # large both for big bases and for tiny bases raised to negative powers
+    if base != 0 and exponent * math.log10(abs(base)) > MAX_RESULT_DIGITS:
+        raise MathLimitError("Result too large")
+    if base < 0 and exponent != int(exponent):
+        raise MathError("Complex result")
+    return base ** exponent
+
+
+def evaluate(rpn):
+    """Evaluate a compiled RPN tuple"""
+    try:
+        return _evaluate(rpn)
+    except OverflowError:
+        raise MathLimitError("Result too large")
+
+
+def _evaluate(rpn):
+    stack = []
+    for token in rpn:
+        if not isinstance(token, str):
+            stack.append(token)
+            continue
+        if token == 'neg':
+            stack.append(-stack.pop())
+            continue
+
+        right = stack.pop()
+        left = stack.pop()
+        if token == '+':
+            result = left + right
+        elif token == '-':
+            result = left - right
+        elif token == '*':
+            result = left * right
+        elif token == '/':
+            if right == 0:
+                raise MathError("Division by zero")
+            result = left / right
+        else:
+            result = _power(left, right)
+
+        if abs(result) > MAX_VALUE:
+            raise MathLimitError("Result too large")
+        stack.append(result)
+
+    return stack[0]
+
+
+def calculate(expression):
+    """Compile (or reuse) and evaluate an arithmetic expression"""
+    if not expression:
+        raise MathError("Empty expression")
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise MathLimitError("Expression too long")
+    return evaluate(compile_expression(expression))
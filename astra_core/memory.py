@@ -0,0 +1,114 @@
+# astra_core/memory.py - Memory budget for Astra Mobile
+# Measures resident memory and sheds caches before the OS kills the app
+
+import gc
+
+from .engine import QUERY_CACHE, QUERY_CACHE_SIZE
+from .log import LOG
+from .math_engine import compile_expression
+from .metrics import current_rss
+from .settings import MEMORY_BUDGET_MB
+
+# Pressure levels passed to trimmers
+NORMAL = 0
+MODERATE = 1
+CRITICAL = 2
+
+# android.content.ComponentCallbacks2 trim levels
+TRIM_MEMORY_RUNNING_MODERATE = 5
+TRIM_MEMORY_RUNNING_LOW = 10
+TRIM_MEMORY_RUNNING_CRITICAL = 15
+TRIM_MEMORY_UI_HIDDEN = 20
+TRIM_MEMORY_BACKGROUND = 40
+TRIM_MEMORY_MODERATE = 60
+TRIM_MEMORY_COMPLETE = 80
+
+
+def pressure_from_android(level):
+    """Map an onTrimMemory level to MODERATE/CRITICAL (NORMAL to ignore)"""
+    if level == TRIM_MEMORY_RUNNING_CRITICAL or level >= TRIM_MEMORY_MODERATE:
+        return CRITICAL
+    if level >= TRIM_MEMORY_RUNNING_MODERATE:
+        return MODERATE
+    return NORMAL
+
+
+def trim_core_caches(level):
+    """Shrink the response cache under pressure and restore it afterwards"""
+    if level == NORMAL:
+        QUERY_CACHE.resize(QUERY_CACHE_SIZE)
+    elif level == MODERATE:
+        QUERY_CACHE.resize(QUERY_CACHE_SIZE // 4)
+    else:
+        QUERY_CACHE.resize(0)
+        compile_expression.cache_clear()
+
+
+class MemoryGovernor:
+    """Keep resident memory under a budget
+
+    Trimmers are callables taking a pressure level. check() measures RSS:
+    above `soft_limit` of the budget it trims at MODERATE, above the budget
+    at CRITICAL, and once usage is back under the soft limit it calls the
+    trimmers with NORMAL so they can grow again. on_pressure() applies a
+    level reported by the OS (or simulated) regardless of the measurement.
+    """
+
+    def __init__(self, budget_bytes=MEMORY_BUDGET_MB * 1024 * 1024, rss=current_rss,
+                 soft_limit=0.8):
+        self.budget = budget_bytes
+        self.rss = rss
+        self.soft_limit = soft_limit
+        self.level = NORMAL
+        self.signals = 0
+        self.trims = {MODERATE: 0, CRITICAL: 0}
+        self._trimmers = []
+
+    def register(self, name, trimmer):
+        """Add a trimmer(level); they run in registration order"""
+        self._trimmers.append((name, trimmer))
+
+    def check(self, *args):
+        """Measure RSS and trim if it is over the soft limit or the budget"""
+        rss = self.rss()
+        if rss is None:
+            return self.level
+        if rss > self.budget:
+            self.trim(CRITICAL)
+        elif rss > self.budget * self.soft_limit:
+            self.trim(MODERATE)
+        elif self.level != NORMAL:
+            self.trim(NORMAL)
+        return self.level
+
+    def on_pressure(self, level):
+        """Memory pressure reported by the platform"""
+        self.signals += 1
+        if level != NORMAL:
+            self.trim(level)
+
+    def trim(self, level):
+        """Run every trimmer at this level"""
+        self.level = level
+        for name, trimmer in self._trimmers:
+            try:
+                trimmer(level)
+            except Exception:
+                LOG.exception("Error trimming %s", name)
+        if level != NORMAL:
+            self.trims[level] += 1
+        if level == CRITICAL:
+            gc.collect()
+
+    def stats(self):
+        """Current RSS against the budget, and how often trimming ran"""
+        rss = self.rss()
+        return {
+            'rss': rss,
+            'budget': self.budget,
+            'usage': round(rss / self.budget, 3) if rss is not None and self.budget else None,
+            'level': self.level,
+            'signals': self.signals,
+            'moderate_trims': self.trims[MODERATE],
+            'critical_trims': self.trims[CRITICAL]
+        }
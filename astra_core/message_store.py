@@ -0,0 +1,172 @@
+# astra_core/message_store.py - Bounded chat history for Astra Mobile
+# Recent messages stay in a fixed-size ring; older pages spill to a local file
+
+import json
+import os
+import tempfile
+from array import array
+
+from .messages import Message, MessageLog
+
+
+class MessageStore:
+    """Chat history with constant resident memory
+
+    The newest `capacity` messages live in memory as a compact MessageLog.
+    When the ring overflows, the oldest `page_size` messages are written
+    to the spill file as one page, and only that page's byte offset is
+    kept in memory. Older messages are read back a page at a time with
+    get_range() when the user scrolls up. Without a spill_path the pages
+    go to a private temporary file, removed by close().
+    """
+
+    def __init__(self, capacity=200, page_size=50, spill_path=None):
+        if page_size <= 0 or capacity < page_size:
+            raise ValueError("capacity must be at least page_size, and page_size positive")
+        self.capacity = capacity
+        self.page_size = page_size
+        # None: a private temporary file, created on the first spill
+        self.spill_path = spill_path
+        self._temporary = spill_path is None
+        self._recent = MessageLog()
+        self._spilled = 0
+        self._page_offsets = array('Q')
+        self._file = None
+
+    def __len__(self):
+        return self._spilled + len(self._recent)
+
+    @property
+    def first_in_memory(self):
+        """Index of the oldest message still held in memory"""
+        return self._spilled
+
+    def append(self, message):
+        """Add a Message at the end, spilling the oldest page if the ring is full"""
+        self._recent.append_message(message)
+        if len(self._recent) > self.capacity:
+            self._spill_page()
+        return len(self) - 1
+
+    def last(self):
+        """The newest message, or None"""
+        return self._recent[-1] if len(self._recent) else None
+
+    def update_last_text(self, text):
+        """Replace the newest message's text (streamed replies grow in place)"""
+        if not len(self._recent):
+            raise IndexError("update_last_text on empty store")
+        self._recent.set_last_text(text)
+
+    def append_to_last(self, chunk):
+        """Add a streamed chunk to the newest message's text"""
+        if not len(self._recent):
+            raise IndexError("append_to_last on empty store")
+        self._recent.append_last_text(chunk)
+
+    def get_range(self, start, stop):
+        """Messages with indices in [start, stop), paging from disk as needed"""
+        start = max(0, start)
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+
+        messages = []
+        index = start
+        while index < stop and index < self._spilled:
+            page = index // self.page_size
+            page_messages = self._read_page(page)
+            offset = index - page * self.page_size
+            take = min(stop, (page + 1) * self.page_size) - index
+            messages.extend(page_messages[offset:offset + take])
+            index += take
+
+        if index < stop:
+            first = index - self._spilled
+            last = stop - self._spilled
+            messages.extend(self._recent[i] for i in range(first, last))
+        return messages
+
+    def trim(self, keep):
+        """Spill whole pages while at least `keep` messages would stay in memory
+
+        Pages are fixed-size, so memory is rounded up to a page: at least
+        `keep` and fewer than `keep + page_size` messages stay resident
+        (trim(10) with page_size 25 leaves 30 of 30 untouched).
+        """
+        while len(self._recent) - self.page_size >= max(keep, 0):
+            self._spill_page()
+
+    def search(self, needle):
+        """Indices of in-memory messages containing needle"""
+        return [self._spilled + index for index in self._recent.search(needle)]
+
+    def nbytes(self):
+        """Resident bytes: the in-memory ring plus the page index"""
+        return self._recent.nbytes() + len(self._page_offsets) * self._page_offsets.itemsize
+
+    def stats(self):
+        """Message counts and resident bytes"""
+        return {
+            'messages': len(self),
+            'in_memory': len(self._recent),
+            'spilled': self._spilled,
+            'bytes': self.nbytes()
+        }
+
+    def clear(self):
+        """Drop all history, in memory and on disk"""
+        self._recent.clear()
+        self._spilled = 0
+        self._page_offsets = array('Q')
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+
+    def close(self):
+        """Close and remove the spill file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            if self._temporary:
+                self.spill_path = None
+
+    def _open(self):
+        if self._file is None:
+            if self._temporary:
+                # Unique per store, so no two processes or stores share a file
+                handle, self.spill_path = tempfile.mkstemp(prefix='astra_mobile_history_', suffix='.jsonl')
+                self._file = os.fdopen(handle, 'w+b')
+                return self._file
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # History is per session: start from an empty spill file
+            self._file = open(self.spill_path, 'w+b')
+        return self._file
+
+    def _spill_page(self):
+        """Write the oldest page_size messages to disk and drop them from memory"""
+        spill = self._open()
+        spill.seek(0, os.SEEK_END)
+        self._page_offsets.append(spill.tell())
+        lines = []
+        for index in range(self.page_size):
+            lines.append(json.dumps(self._recent[index].to_record(), ensure_ascii=False))
+        self._recent.drop_first(self.page_size)
+        spill.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        spill.flush()
+        self._spilled += self.page_size
+
+    def _read_page(self, page):
+        """Load one spilled page from disk"""
+        spill = self._open()
+        spill.seek(self._page_offsets[page])
+        messages = []
+        for _ in range(self.page_size):
+            messages.append(Message.from_record(json.loads(spill.readline().decode('utf-8'))))
+        return messages
@@ -0,0 +1,162 @@
+# astra_core/messages.py - Compact chat message model for Astra Mobile
+# One source of truth for the transcript: slotted records over array-backed columns
+
+import sys
+from array import array
+
+ROLE_USER = sys.intern('user')
+ROLE_ASSISTANT = sys.intern('assistant')
+ROLE_SYSTEM = sys.intern('system')
+
+# Role table shared by every log; columns store a one-byte index into it
+_ROLES = [ROLE_USER, ROLE_ASSISTANT, ROLE_SYSTEM]
+_ROLE_IDS = {role: index for index, role in enumerate(_ROLES)}
+
+
+def role_id(role):
+    """One-byte id for a role, registering new roles on first use"""
+    index = _ROLE_IDS.get(role)
+    if index is None:
+        if len(_ROLES) >= 256:
+            raise ValueError("Too many message roles")
+        role = sys.intern(role)
+        index = len(_ROLES)
+        _ROLES.append(role)
+        _ROLE_IDS[role] = index
+    return index
+
+
+class Message:
+    """A single chat message (role strings are interned)"""
+    __slots__ = ('timestamp', 'role', 'text')
+
+    def __init__(self, timestamp, role, text):
+        self.timestamp = timestamp
+        self.role = _ROLES[role_id(role)]
+        self.text = text
+
+    def to_record(self):
+        """Compact JSON-friendly form"""
+        return [self.timestamp, self.role, self.text]
+
+    @classmethod
+    def from_record(cls, record):
+        timestamp, role, text = record
+        return cls(timestamp, role, text)
+
+    def __eq__(self, other):
+        if not isinstance(other, Message):
+            return NotImplemented
+        return (self.timestamp, self.role, self.text) == (other.timestamp, other.role, other.text)
+
+    def __repr__(self):
+        return f"Message({self.role!r}, {self.text[:30]!r})"
+
+
+class MessageLog:
+    """Append-only message columns
+
+    Timestamps (8 bytes), role ids (1 byte) and text end offsets (8 bytes)
+    live in typed arrays; all text is one UTF-8 buffer. Per-message overhead
+    is 17 bytes plus the encoded text, instead of a Python object, a float
+    and a str per message. Message objects are built on access.
+    """
+
+    def __init__(self):
+        self._timestamps = array('d')
+        self._roles = array('B')
+        self._ends = array('Q')
+        self._text = bytearray()
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def append(self, timestamp, role, text):
+        """Add a message and return its index"""
+        self._timestamps.append(timestamp)
+        self._roles.append(role_id(role))
+        self._text += text.encode('utf-8')
+        self._ends.append(len(self._text))
+        return len(self._timestamps) - 1
+
+    def append_message(self, message):
+        return self.append(message.timestamp, message.role, message.text)
+
+    def _bounds(self, index):
+        start = self._ends[index - 1] if index > 0 else 0
+        return start, self._ends[index]
+
+    def text(self, index):
+        """Text of one message"""
+        index = self._index(index)
+        start, end = self._bounds(index)
+        return self._text[start:end].decode('utf-8')
+
+    def role(self, index):
+        return _ROLES[self._roles[self._index(index)]]
+
+    def timestamp(self, index):
+        return self._timestamps[self._index(index)]
+
+    def __getitem__(self, index):
+        index = self._index(index)
+        return Message(self._timestamps[index], _ROLES[self._roles[index]], self.text(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _index(self, index):
+        length = len(self._timestamps)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("message index out of range")
+        return index
+
+    def set_last_text(self, text):
+        """Replace the newest message's text (streamed replies grow in place)"""
+        index = self._index(-1)
+        start, _ = self._bounds(index)
+        del self._text[start:]
+        self._text += text.encode('utf-8')
+        self._ends[index] = len(self._text)
+
+    def append_last_text(self, chunk):
+        """Extend the newest message's text; only the chunk is encoded"""
+        index = self._index(-1)
+        self._text += chunk.encode('utf-8')
+        self._ends[index] = len(self._text)
+
+    def drop_first(self, count):
+        """Remove the oldest `count` messages and compact the columns"""
+        count = min(count, len(self))
+        if count <= 0:
+            return
+        cut = self._ends[count - 1]
+        del self._timestamps[:count]
+        del self._roles[:count]
+        del self._ends[:count]
+        del self._text[:cut]
+        for index in range(len(self._ends)):
+            self._ends[index] -= cut
+
+    def search(self, needle):
+        """Indices of messages containing needle (case-insensitive)"""
+        needle = needle.casefold()
+        return [index for index in range(len(self)) if needle in self.text(index).casefold()]
+
+    def clear(self):
+        self._timestamps = array('d')
+        self._roles = array('B')
+        self._ends = array('Q')
+        self._text = bytearray()
+
+    def nbytes(self):
+        """Bytes held by the columns (buffer contents, excluding slack)"""
+        return (
+            len(self._timestamps) * self._timestamps.itemsize
+            + len(self._roles) * self._roles.itemsize
+            + len(self._ends) * self._ends.itemsize
+            + len(self._text)
+        )
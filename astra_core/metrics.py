@@ -0,0 +1,219 @@
+# astra_core/metrics.py - Runtime metrics for Astra Mobile
+# Cheap enough to stay on in release builds: counters and fixed-size histograms
+
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from threading import get_ident
+
+from .lazy_imports import optional_import
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None if unknown"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    psutil = optional_import('psutil')
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def _bucket_bounds(low=0.0001, high=60.0, factor=1.25):
+    """Upper bounds in seconds, growing by `factor` (about ±12% precision)"""
+    bounds = []
+    bound = low
+    while bound < high:
+        bounds.append(bound)
+        bound *= factor
+    bounds.append(high)
+    return bounds
+
+BUCKET_BOUNDS = _bucket_bounds()
+
+
+class LatencyHistogram:
+    """Latency distribution in log-spaced buckets
+
+    Recording is a bisect and an increment; memory is one counter per
+    bucket no matter how many samples arrive. Percentiles are reported as
+    the upper bound of the bucket they fall in.
+    """
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        # One overflow bucket past the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        """Add another histogram's samples to this one"""
+        for index, bucket in enumerate(other.counts):
+            if bucket:
+                self.counts[index] += bucket
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+
+    def percentile(self, fraction):
+        """Approximate latency below which `fraction` of samples fall"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                if index >= len(BUCKET_BOUNDS):
+                    return self.max
+                return min(BUCKET_BOUNDS[index], self.max)
+        return self.max
+
+    def summary(self):
+        """Count, mean, p50/p95/p99 and max in milliseconds"""
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 2)
+        return {
+            'count': self.count,
+            'mean_ms': ms(self.total / self.count) if self.count else None,
+            'p50_ms': ms(self.percentile(0.50)),
+            'p95_ms': ms(self.percentile(0.95)),
+            'p99_ms': ms(self.percentile(0.99)),
+            'max_ms': ms(self.max) if self.count else None
+        }
+
+
+class Metrics:
+    """Process-wide metrics
+
+    Queries are counted and timed per handler from any thread. Each thread
+    records into its own histograms without taking a lock; readers merge
+    them, so a report may miss a sample still being recorded. Other
+    subsystems (caches, power, memory, frames) register providers: zero
+    argument callables returning a dict, only called when a snapshot is
+    taken, so they cost nothing in between.
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        # Thread id -> {handler: LatencyHistogram}, written only by that thread
+        self._shards = {}
+        self._providers = {}
+
+    def record_query(self, handler, seconds):
+        """Count one query and add its latency to the handler's histogram"""
+        try:
+            histogram = self._shards[get_ident()][handler]
+        except KeyError:
+            histogram = self._shards.setdefault(get_ident(), {}).setdefault(handler, LatencyHistogram())
+        histogram.record(seconds)
+
+    def _merged(self):
+        """Every thread's histograms combined per handler"""
+        merged = {}
+        for shard in list(self._shards.values()):
+            for handler, histogram in list(shard.items()):
+                combined = merged.get(handler)
+                if combined is None:
+                    combined = merged[handler] = LatencyHistogram()
+                combined.merge(histogram)
+        return merged
+
+    @property
+    def queries(self):
+        """Queries recorded so far, across threads"""
+        return sum(histogram.count for shard in list(self._shards.values())
+                   for histogram in list(shard.values()))
+
+    def register_provider(self, name, provider):
+        """Add (or replace) a named stats source"""
+        self._providers[name] = provider
+
+    def unregister_provider(self, name):
+        self._providers.pop(name, None)
+
+    def provider(self, name):
+        """One provider's stats, or None if it is not registered"""
+        provider = self._providers.get(name)
+        return provider() if provider is not None else None
+
+    def uptime(self):
+        return time.monotonic() - self.started_at
+
+    def latency(self):
+        """Per-handler latency summaries plus 'all' across handlers"""
+        merged = self._merged()
+        report = {name: histogram.summary() for name, histogram in merged.items()}
+        combined = LatencyHistogram()
+        for histogram in merged.values():
+            combined.merge(histogram)
+        report['all'] = combined.summary()
+        return report
+
+    def snapshot(self):
+        """Everything, ready for JSON"""
+        report = {
+            'uptime_seconds': round(self.uptime(), 1),
+            'cpu_seconds': round(time.process_time(), 3),
+            'rss_bytes': current_rss(),
+            'queries': self.queries,
+            'latency': self.latency()
+        }
+        for name, provider in list(self._providers.items()):
+            try:
+                report[name] = provider()
+            except Exception as e:
+                report[name] = {'error': str(e)}
+        return report
+
+    def reset(self):
+        """Clear query counters and histograms (providers stay registered)"""
+        self._shards = {}
+
+
+class FrameTimer:
+    """Frame-time statistics fed by a per-frame callback (Kivy passes dt)"""
+
+    def __init__(self, window=120):
+        self.histogram = LatencyHistogram()
+        self.recent = deque(maxlen=window)
+
+    def tick(self, dt):
+        self.histogram.record(dt)
+        self.recent.append(dt)
+
+    def stats(self):
+        """Frame-time percentiles plus the FPS over the recent window"""
+        report = self.histogram.summary()
+        elapsed = sum(self.recent)
+        report['fps'] = len(self.recent) / elapsed if elapsed else 0.0
+        return report
+
+
+def format_bytes(count):
+    """Human-readable byte count"""
+    if count is None:
+        return "unknown"
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.0f}{unit}"
+        count /= 1024
+    return f"{count:.1f}GB"
+
+
+# Shared by the engine, the app and tools
+METRICS = Metrics()
@@ -0,0 +1,168 @@
+# astra_core/power.py - Battery saver for Astra Mobile
+# Drops the frame rate and stops periodic work when nobody is using the app
+
+import time
+
+from .settings import BATTERY_SAVER
+
+ACTIVE = 'active'
+IDLE = 'idle'
+PAUSED = 'paused'
+
+
+class PowerManager:
+    """Adaptive frame rate and idle sleep
+
+    The app is ACTIVE while the user is interacting or a query is running.
+    After `idle_timeout` seconds without input it goes IDLE: the frame cap
+    drops to `idle_fps` and every periodic job registered through
+    schedule_interval() is unscheduled. PAUSED (app in the background)
+    does the same with `paused_fps`. Any input (poke) restores full speed.
+
+    `clock` needs Kivy's Clock interface (schedule_once/schedule_interval
+    returning events with cancel()); `set_max_fps(fps)` applies a frame
+    cap and `frame_counter()` returns the number of main loop iterations
+    so far (Kivy: Clock.frames), which is how wakeups are measured.
+    With enabled=False the app always stays ACTIVE.
+    """
+
+    def __init__(self, clock, set_max_fps=None, frame_counter=None,
+                 active_fps=60, idle_fps=10, paused_fps=1, idle_timeout=5.0,
+                 enabled=BATTERY_SAVER, now=time.monotonic):
+        self.clock = clock
+        self.set_max_fps = set_max_fps
+        self.frame_counter = frame_counter
+        self.fps = {ACTIVE: active_fps, IDLE: idle_fps, PAUSED: paused_fps}
+        self.idle_timeout = idle_timeout
+        self.enabled = enabled
+        self.now = now
+
+        self.state = ACTIVE
+        self.busy = False
+        self.transitions = 0
+        self._jobs = {}
+        self._next_job = 0
+        self._idle_event = None
+        self._last_activity = now()
+        self._state_since = self._last_activity
+        self._frames_since = self._frames()
+        self._time_in = {ACTIVE: 0.0, IDLE: 0.0, PAUSED: 0.0}
+        self._frames_in = {ACTIVE: 0, IDLE: 0, PAUSED: 0}
+
+        self._apply_fps()
+        self._arm_idle_timer(idle_timeout)
+
+    def _frames(self):
+        return self.frame_counter() if self.frame_counter is not None else 0
+
+    # Periodic work
+
+    def schedule_interval(self, callback, interval):
+        """Run callback every interval seconds, but only while ACTIVE"""
+        handle = self._next_job
+        self._next_job += 1
+        job = [callback, interval, None]
+        self._jobs[handle] = job
+        if self.state == ACTIVE:
+            job[2] = self.clock.schedule_interval(callback, interval)
+        return handle
+
+    def unschedule(self, handle):
+        job = self._jobs.pop(handle, None)
+        if job is not None and job[2] is not None:
+            job[2].cancel()
+
+    # Activity
+
+    def poke(self, *args):
+        """Input happened: stay (or become) fully responsive"""
+        self._last_activity = self.now()
+        if self.state == IDLE:
+            self._enter(ACTIVE)
+            self._arm_idle_timer(self.idle_timeout)
+
+    def set_busy(self, busy):
+        """While busy (e.g. a query is streaming) the app never goes idle"""
+        self.busy = busy
+        self.poke()
+
+    def pause(self):
+        """App went to the background"""
+        self._cancel_idle_timer()
+        self._enter(PAUSED)
+
+    def resume(self):
+        """App came back to the foreground"""
+        self._last_activity = self.now()
+        self._enter(ACTIVE)
+        self._arm_idle_timer(self.idle_timeout)
+
+    def _check_idle(self, *args):
+        """Idle timer fired: sleep, or re-arm for the rest of the timeout"""
+        self._idle_event = None
+        if self.state != ACTIVE:
+            return
+        remaining = self.idle_timeout - (self.now() - self._last_activity)
+        if self.busy or remaining > 0:
+            # Input only stamps a time; the one timer catches up here
+            self._arm_idle_timer(self.idle_timeout if self.busy else remaining)
+            return
+        self._enter(IDLE)
+
+    def _arm_idle_timer(self, timeout):
+        if not self.enabled or self._idle_event is not None:
+            return
+        self._idle_event = self.clock.schedule_once(self._check_idle, timeout)
+
+    def _cancel_idle_timer(self):
+        if self._idle_event is not None:
+            self._idle_event.cancel()
+            self._idle_event = None
+
+    # State changes
+
+    def _enter(self, state):
+        if not self.enabled or state == self.state:
+            return
+        self._account()
+        previous = self.state
+        self.state = state
+        self.transitions += 1
+        self._apply_fps()
+
+        if state == ACTIVE:
+            for job in self._jobs.values():
+                if job[2] is None:
+                    job[2] = self.clock.schedule_interval(job[0], job[1])
+        elif previous == ACTIVE:
+            for job in self._jobs.values():
+                if job[2] is not None:
+                    job[2].cancel()
+                    job[2] = None
+
+    def _apply_fps(self):
+        if self.set_max_fps is not None:
+            self.set_max_fps(self.fps[self.state] if self.enabled else self.fps[ACTIVE])
+
+    def _account(self):
+        """Charge time and frames since the last change to the current state"""
+        now = self.now()
+        frames = self._frames()
+        self._time_in[self.state] += now - self._state_since
+        self._frames_in[self.state] += frames - self._frames_since
+        self._state_since = now
+        self._frames_since = frames
+
+    def stats(self):
+        """Time, frames and wakeups per second spent in each state"""
+        self._account()
+        report = {'state': self.state, 'transitions': self.transitions}
+        for state in (ACTIVE, IDLE, PAUSED):
+            seconds = self._time_in[state]
+            frames = self._frames_in[state]
+            report[state] = {
+                'seconds': round(seconds, 3),
+                'frames': frames,
+                'wakeups_per_second': round(frames / seconds, 2) if seconds else 0.0
+            }
+        return report
@@ -0,0 +1,224 @@
+# astra_core/query_worker.py - Background query execution for Astra Mobile
+# Keeps slow handlers off the UI thread; results come back in submission order
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+from .engine import process_mobile_query
+
+
+class QueryCancelled(Exception):
+    """Passed as the error when a query is cancelled before it is delivered"""
+
+
+class QueryTicket:
+    """Handle for one submitted query"""
+    __slots__ = (
+        'seq', 'query', 'callback', 'on_chunk', 'submitted_at',
+        'first_chunk_at', 'cancelled', 'started', 'buffered'
+    )
+
+    def __init__(self, seq, query, callback, on_chunk=None):
+        self.seq = seq
+        self.query = query
+        self.callback = callback
+        self.on_chunk = on_chunk
+        self.submitted_at = time.perf_counter()
+        self.first_chunk_at = None
+        self.cancelled = False
+        self.started = False
+        self.buffered = []
+
+    def cancel(self):
+        """Drop the result; the callback gets QueryCancelled instead, in order"""
+        self.cancelled = True
+
+    @property
+    def time_to_first_chunk(self):
+        """Seconds from submit until the first chunk reached the UI, or None"""
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.submitted_at
+
+
+class QueryWorker:
+    """Run queries on worker threads with a bounded queue
+
+    submit() never blocks: when max_pending queries are already waiting it
+    returns None so the UI can push back. Results are handed to `deliver`
+    (for Kivy, a Clock.schedule_once wrapper) strictly in submission order,
+    and `on_state` is told how many queries are still in flight.
+
+    Handlers may return a string or an iterable of chunks. With on_chunk,
+    chunks are delivered as they are produced; chunks of a query that is
+    not yet at the head of the line are held back until it is.
+    """
+
+    def __init__(self, handler=process_mobile_query, deliver=None, on_state=None,
+                 max_pending=8, workers=1):
+        self.handler = handler
+        self.deliver = deliver or (lambda func: func())
+        self.on_state = on_state
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._seq = itertools.count()
+        # Re-entrant: deliveries happen under the lock to keep chunk order
+        self._lock = threading.RLock()
+        self._ready = {}
+        self._next_delivery = 0
+        self._in_flight = 0
+        self._tickets = {}
+        self.first_chunk_latencies = deque(maxlen=256)
+        self._threads = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._run, name=f"astra-query-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def in_flight(self):
+        """Queries submitted but not yet delivered or cancelled"""
+        return self._in_flight
+
+    def submit(self, query, callback, on_chunk=None):
+        """Queue a query; callback(ticket, response, error) runs via deliver
+
+        on_chunk(ticket, chunk), if given, receives streamed output first.
+        """
+        with self._lock:
+            # Only submit() adds work, so the queue cannot fill up under us;
+            # checking first keeps sequence numbers gapless for ordered delivery
+            if self._queue.full():
+                return None
+            ticket = QueryTicket(next(self._seq), query, callback, on_chunk)
+            self._queue.put_nowait(ticket)
+            self._tickets[ticket.seq] = ticket
+            self._in_flight += 1
+        self._notify_state()
+        return ticket
+
+    def cancel(self, ticket):
+        """Cancel one query"""
+        ticket.cancel()
+
+    def cancel_all(self):
+        """Cancel every query that has not been delivered yet"""
+        with self._lock:
+            for ticket in self._tickets.values():
+                ticket.cancel()
+
+    def latest(self):
+        """Most recently submitted undelivered ticket, or None"""
+        with self._lock:
+            if not self._tickets:
+                return None
+            return self._tickets[max(self._tickets)]
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker threads"""
+        self.cancel_all()
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+    def _run(self):
+        while True:
+            ticket = self._queue.get()
+            if ticket is None:
+                return
+
+            response = error = None
+            if not ticket.cancelled:
+                try:
+                    response = self._execute(ticket)
+                except Exception as e:
+                    error = e
+            self._complete(ticket, response, error)
+
+    def _execute(self, ticket):
+        """Run the handler, streaming chunks when the ticket asks for them"""
+        result = self.handler(ticket.query)
+        if isinstance(result, str):
+            if ticket.on_chunk is not None:
+                self._emit_chunk(ticket, result)
+            return result
+
+        parts = []
+        try:
+            for chunk in result:
+                if ticket.cancelled:
+                    break
+                parts.append(chunk)
+                if ticket.on_chunk is not None:
+                    self._emit_chunk(ticket, chunk)
+        finally:
+            close = getattr(result, 'close', None)
+            if close is not None:
+                close()
+        return ''.join(parts)
+
+    def _emit_chunk(self, ticket, chunk):
+        """Deliver a chunk now if its query is at the head of the line"""
+        with self._lock:
+            if ticket.seq != self._next_delivery:
+                ticket.buffered.append(chunk)
+                return
+            self.deliver(self._chunk_callback(ticket, chunk))
+
+    def _complete(self, ticket, response, error):
+        """Buffer a finished query and release everything now in order"""
+        released = False
+        with self._lock:
+            self._ready[ticket.seq] = (ticket, response, error)
+            while self._next_delivery in self._ready:
+                done, response, error = self._ready.pop(self._next_delivery)
+                self._tickets.pop(self._next_delivery, None)
+                self._next_delivery += 1
+                self._in_flight -= 1
+                released = True
+                self._release(done, response, error)
+
+                # The next query becomes head: flush what it streamed so far
+                upcoming = self._tickets.get(self._next_delivery)
+                if upcoming is not None and upcoming.buffered:
+                    for chunk in upcoming.buffered:
+                        self.deliver(self._chunk_callback(upcoming, chunk))
+                    upcoming.buffered = []
+
+        if released:
+            self._notify_state()
+
+    def _release(self, ticket, response, error):
+        """Deliver buffered chunks and the final result of a finished query"""
+        for chunk in ticket.buffered:
+            self.deliver(self._chunk_callback(ticket, chunk))
+        ticket.buffered = []
+        self.deliver(self._callback(ticket, response, error))
+
+    def _chunk_callback(self, ticket, chunk):
+        def call():
+            if ticket.cancelled:
+                return
+            if not ticket.started:
+                ticket.started = True
+                ticket.first_chunk_at = time.perf_counter()
+                self.first_chunk_latencies.append(ticket.time_to_first_chunk)
+            ticket.on_chunk(ticket, chunk)
+        return call
+
+    def _callback(self, ticket, response, error):
+        def call():
+            # Re-check: the UI may cancel between release and delivery.
+            # Cancelled queries are still reported, streamed output or not,
+            # so the UI can close them off instead of losing them.
+            ticket.callback(ticket, response, QueryCancelled() if ticket.cancelled else error)
+        return call
+
+    def _notify_state(self):
+        if self.on_state is not None:
+            # Read the count at delivery time so late updates never show stale state
+            self.deliver(lambda: self.on_state(self._in_flight))
@@ -0,0 +1,115 @@
+# astra_core/response_cache.py - Response caching for Astra Mobile
+# Static replies are memoized, dynamic (callable) replies expire after a TTL
+
+import threading
+import time
+from collections import OrderedDict
+
+# Freshness window for dynamic responses that do not declare their own
+DEFAULT_DYNAMIC_TTL = 1.0
+
+# Sentence punctuation trimmed from both ends of a query ('.' only at the
+# end, so '.5 + 1' keeps its meaning); '/' is kept so commands stay commands
+_TRIM_CHARS = ' ?!,;:\'"'
+
+
+def canonical_query(query):
+    """Canonical form: case-folded, whitespace-collapsed, punctuation-trimmed
+
+    Used both as the cache key and as the text the handlers answer, so
+    queries that share an entry always get the same reply.
+    """
+    key = ' '.join(query.casefold().split())
+    return key.strip(_TRIM_CHARS).rstrip('.').strip(_TRIM_CHARS)
+
+
+def dynamic_response(ttl=DEFAULT_DYNAMIC_TTL):
+    """Mark a response callable and how long its answer stays fresh"""
+    def decorator(func):
+        func.ttl = ttl
+        return func
+    return decorator
+
+
+def resolve_response(entry):
+    """Render a response table entry, returning (text, ttl)
+
+    Static strings have no TTL; callables are evaluated now and carry
+    their own TTL.
+    """
+    if callable(entry):
+        return entry(), getattr(entry, 'ttl', DEFAULT_DYNAMIC_TTL)
+    return entry, None
+
+
+class ResponseCache:
+    """Bounded LRU cache whose entries may optionally expire
+
+    Shared by query worker threads, the UI-thread memory trimmer and tools,
+    so every operation on the entries holds a lock.
+    """
+
+    def __init__(self, maxsize=256, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires = entry
+            if expires is not None and self._clock() >= expires:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        """Store a value; ttl=None keeps it until evicted, ttl=0 skips caching"""
+        if self.maxsize <= 0 or ttl == 0:
+            return
+        expires = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Change the capacity, evicting least recently used entries"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or self._clock() < entry[1])
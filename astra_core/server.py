@@ -0,0 +1,344 @@
+# astra_core/server.py - HTTP/JSON API for the Astra Mobile engine
+# asyncio streams only: keep-alive, batching and NDJSON streaming with no extra dependencies
+
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from .engine import handle_mobile_commands, process_mobile_query, stream_mobile_query
+from .lazy_imports import optional_import
+from .log import LOG
+from .metrics import METRICS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Request limits; anything larger is refused before it is read
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 256 * 1024
+MAX_BATCH = 100
+KEEP_ALIVE_TIMEOUT = 15.0
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class HTTPError(Exception):
+    """Turned into a JSON error response with this status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    __slots__ = ('method', 'path', 'params', 'version', 'headers', 'body')
+
+    def __init__(self, method, path, params, version, headers):
+        self.method = method
+        self.path = path
+        self.params = params
+        self.version = version
+        self.headers = headers
+        self.body = b''
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def json(self):
+        """The body as a JSON object"""
+        try:
+            payload = json.loads(self.body or b'{}')
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return payload
+
+    def text(self, name):
+        """A string field from the JSON body, or ?name= on GET"""
+        if self.method == 'GET':
+            value = self.params.get(name, [None])[0]
+        else:
+            value = self.json().get(name)
+        if not isinstance(value, str):
+            raise HTTPError(400, f"'{name}' must be a string")
+        return value
+
+
+def parse_head(head):
+    """Parse the request line and headers (bytes up to the blank line)"""
+    try:
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    if not version.startswith('HTTP/1.'):
+        raise HTTPError(400, f"Unsupported protocol {version}")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    url = urlsplit(target)
+    return Request(method.upper(), url.path, parse_qs(url.query), version, headers)
+
+
+def encode_json(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(status, payload, keep_alive, extra_headers=''):
+    """A complete HTTP/1.1 response with a JSON body"""
+    body = encode_json(payload)
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"{extra_headers}\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+def parse_address(address=None):
+    """'host:port', 'port' or None to (host, port)"""
+    if not address:
+        return DEFAULT_HOST, DEFAULT_PORT
+    host, separator, port = address.rpartition(':')
+    if not separator:
+        return DEFAULT_HOST, int(port)
+    return host.strip('[]') or DEFAULT_HOST, int(port)
+
+
+class AstraServer:
+    """Serve the query engine over HTTP/JSON on one asyncio event loop
+
+    Endpoints (JSON in and out, UTF-8):
+      GET  /health                      liveness and server counters
+      GET  /metrics                     METRICS.snapshot(), as /status sees it
+      POST /query   {"query": ...}      one reply (GET /query?query=... too)
+      POST /command {"command": ...}    a slash command without the slash
+      POST /batch   {"queries": [...]}  up to MAX_BATCH replies in order
+      POST /stream  {"query": ...}      NDJSON lines {"chunk": ...} as the
+                                        reply is produced, then {"done": true}
+
+    Connections are kept alive (HTTP/1.1 default) and pipelined requests are
+    answered in order. Queries run on the event loop itself: offline
+    replies take microseconds, so handing them to threads would cost more
+    than it saves. uvloop is used when installed.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, keep_alive_timeout=KEEP_ALIVE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.started_at = None
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.ready = threading.Event()
+        self.routes = {
+            '/health': {'GET': self.health},
+            '/metrics': {'GET': self.metrics},
+            '/query': {'GET': self.query, 'POST': self.query},
+            '/command': {'POST': self.command},
+            '/batch': {'POST': self.batch},
+            '/stream': {'POST': self.stream}
+        }
+        self._connections = {}
+        self._loop = None
+        self._stopping = None
+
+    # Endpoints
+
+    def health(self, request):
+        return {'status': 'ok', **self.stats()}
+
+    def metrics(self, request):
+        return METRICS.snapshot()
+
+    def query(self, request):
+        return {'response': process_mobile_query(request.text('query'))}
+
+    def command(self, request):
+        return {'response': handle_mobile_commands(request.text('command'))}
+
+    def batch(self, request):
+        queries = request.json().get('queries')
+        if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+            raise HTTPError(400, "'queries' must be a list of strings")
+        if len(queries) > MAX_BATCH:
+            raise HTTPError(413, f"At most {MAX_BATCH} queries per batch")
+        return {'responses': [process_mobile_query(query) for query in queries]}
+
+    async def stream(self, request, writer, keep_alive):
+        """Write the reply chunk by chunk as NDJSON (chunked transfer encoding)"""
+        chunks = stream_mobile_query(request.text('query'))
+        # HTTP/1.0 has no chunked encoding: send raw lines and close instead
+        chunked = request.version != 'HTTP/1.0'
+        keep_alive = keep_alive and chunked
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            + ("Transfer-Encoding: chunked\r\n" if chunked else "")
+            + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1'))
+
+        def frame(payload):
+            line = encode_json(payload) + b'\n'
+            return b'%x\r\n%s\r\n' % (len(line), line) if chunked else line
+
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                writer.write(frame({'chunk': chunk}))
+                await writer.drain()
+        finally:
+            chunks.close()
+        writer.write(frame({'done': True, 'length': size}) + (b'0\r\n\r\n' if chunked else b''))
+        return keep_alive
+
+    # Connections
+
+    async def handle_connection(self, reader, writer):
+        self.connections += 1
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                # A connection that is idle, or slow to send a whole request
+                # (headers and body), is dropped after the timeout; a timer
+                # handle is much cheaper per request than wait_for()
+                idle = self._loop.call_later(self.keep_alive_timeout, writer.transport.abort)
+                try:
+                    try:
+                        head = await reader.readuntil(b'\r\n\r\n')
+                    except asyncio.LimitOverrunError:
+                        writer.write(json_response(431, {'error': "Request headers too large"}, False))
+                        break
+                    self.requests += 1
+                    try:
+                        request = parse_head(head)
+                        if 'chunked' in request.headers.get('transfer-encoding', '').lower():
+                            raise HTTPError(411, "Send a Content-Length instead of a chunked body")
+                        try:
+                            length = int(request.headers.get('content-length') or 0)
+                        except ValueError:
+                            raise HTTPError(400, "Invalid Content-Length")
+                        if length > MAX_BODY_BYTES or length < 0:
+                            raise HTTPError(413, f"Body over {MAX_BODY_BYTES} bytes")
+                        if length:
+                            request.body = await reader.readexactly(length)
+                    except HTTPError as e:
+                        # The rest of the stream can't be trusted: answer and close
+                        self.errors += 1
+                        writer.write(json_response(e.status, {'error': str(e)}, False))
+                        break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                finally:
+                    idle.cancel()
+                if not await self.respond(request, writer):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def respond(self, request, writer):
+        """Route one request; returns whether the connection stays open"""
+        keep_alive = request.keep_alive
+        methods = self.routes.get(request.path)
+        try:
+            if methods is None:
+                raise HTTPError(404, f"No endpoint {request.path}")
+            handler = methods.get(request.method)
+            if handler is None:
+                allowed = ', '.join(methods)
+                self.errors += 1
+                writer.write(json_response(405, {'error': f"Use {allowed}"}, keep_alive, f"Allow: {allowed}\r\n"))
+                return keep_alive
+            if handler == self.stream:
+                return await handler(request, writer, keep_alive)
+            payload = handler(request)
+            status = 200
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ConnectionError:
+            raise
+        except Exception:
+            LOG.exception("API request failed", path=request.path)
+            status, payload = 500, {'error': "Internal error"}
+        if status != 200:
+            self.errors += 1
+        writer.write(json_response(status, payload, keep_alive))
+        return keep_alive
+
+    # Lifecycle
+
+    def stats(self):
+        return {
+            'uptime_seconds': round(time.monotonic() - self.started_at, 1) if self.started_at else 0.0,
+            'requests': self.requests,
+            'errors': self.errors,
+            'connections': self.connections,
+            'open_connections': len(self._connections)
+        }
+
+    async def serve(self):
+        """Listen until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self.started_at = time.monotonic()
+        METRICS.register_provider('server', self.stats)
+        LOG.info("API listening on %s:%s", self.host, self.port)
+        self.ready.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            self.ready.clear()
+            METRICS.unregister_provider('server')
+            server.close()
+            # Closing the transports ends each connection's read loop
+            tasks = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            if tasks:
+                await asyncio.wait(tasks, timeout=5)
+            await server.wait_closed()
+
+    def run(self):
+        """Serve on a new event loop, blocking until stop() or Ctrl+C"""
+        uvloop = optional_import('uvloop')
+        runner = uvloop.run if uvloop is not None and hasattr(uvloop, 'run') else asyncio.run
+        runner(self.serve())
+
+    def stop(self):
+        """Ask a running server to shut down (safe from any thread)"""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
@@ -0,0 +1,8 @@
+# astra_core/settings.py - Global settings for mobile optimization
+
+MOBILE_MODE = True
+LOW_MEMORY_MODE = True
+BATTERY_SAVER = True
+
+# Resident memory budget enforced by the memory governor in low memory mode
+MEMORY_BUDGET_MB = 96 if LOW_MEMORY_MODE else 256
@@ -0,0 +1,138 @@
+# astra_core/startup_profile.py - Startup timeline for Astra Mobile
+# Records when each startup phase finished so cold-start regressions show up
+
+import functools
+import json
+import os
+import time
+
+# README_MOBILE.md promises "Cold Start: <2 seconds"
+STARTUP_BUDGET_MS = 2000
+
+
+def process_age():
+    """Seconds since this process was exec'd (Linux/Android), or None"""
+    try:
+        with open('/proc/self/stat') as stat:
+            # Skip past the command name, which may contain spaces
+            fields = stat.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as uptime:
+            booted_for = float(uptime.read().split()[0])
+        return booted_for - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfiler:
+    """Startup timeline of phases and spans
+
+    Disabled by default; every hook is then a single attribute check.
+    mark(name) closes a phase: it records the time since the previous mark
+    (imports, first frame). timed(name) wraps a function and records its
+    own duration as a span (App.__init__, build, screen constructors), so
+    spans can overlap phases. Times are milliseconds since the process
+    started, or since enable() where the OS does not report process age.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = None
+        self.from_process_start = False
+        self.events = []
+        self._last = None
+
+    def enable(self, started_at=None):
+        """Start recording; started_at is perf_counter() at the top of the entry script"""
+        now = time.perf_counter()
+        started_at = now if started_at is None else started_at
+        age = process_age()
+        self.enabled = True
+        self.events = []
+        self.from_process_start = age is not None and now - age <= started_at
+        self.origin = now - age if self.from_process_start else started_at
+        if self.from_process_start:
+            self._record('interpreter startup', 'phase', self.origin, started_at)
+        self._last = started_at
+
+    def _record(self, name, kind, start, end):
+        self.events.append({
+            'name': name,
+            'kind': kind,
+            'start_ms': round((start - self.origin) * 1000, 2),
+            'end_ms': round((end - self.origin) * 1000, 2),
+            'duration_ms': round((end - start) * 1000, 2)
+        })
+
+    def mark(self, name):
+        """End the current phase under this name"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._record(name, 'phase', self._last, now)
+        self._last = now
+
+    def timed(self, name):
+        """Decorator recording each call of the function as a span"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._record(name, 'span', start, time.perf_counter())
+            return wrapper
+        return decorate
+
+    def report(self, budget_ms=STARTUP_BUDGET_MS):
+        """Timeline plus summary, ready for JSON"""
+        events = sorted(self.events, key=lambda event: (event['start_ms'], -event['duration_ms']))
+        first_frame = next((event['end_ms'] for event in events if event['name'] == 'first frame'), None)
+        interactive = next((event['end_ms'] for event in events if event['name'] == 'interactive'), None)
+        # Gate on time to interactive; fall back to the first frame
+        launched = interactive if interactive is not None else first_frame
+        slowest = sorted(events, key=lambda event: event['duration_ms'], reverse=True)[:5]
+        return {
+            'origin': 'process start' if self.from_process_start else 'launcher start',
+            'events': events,
+            'summary': {
+                'time_to_first_frame_ms': first_frame,
+                'time_to_interactive_ms': interactive,
+                'budget_ms': budget_ms,
+                'within_budget': launched is not None and launched <= budget_ms,
+                'slowest': [{'name': event['name'], 'duration_ms': event['duration_ms']} for event in slowest]
+            }
+        }
+
+    def write(self, path, budget_ms=STARTUP_BUDGET_MS):
+        """Write the JSON timeline and return the report"""
+        report = self.report(budget_ms)
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        return report
+
+
+def format_summary(report):
+    """Human-readable startup summary"""
+    summary = report['summary']
+    lines = [f"⏱️ Startup timeline (ms since {report['origin']}):"]
+    for event in report['events']:
+        indent = "    " if event['kind'] == 'span' else "  "
+        lines.append(f"{indent}{event['end_ms']:>9.1f}  {event['name']} (+{event['duration_ms']:.1f})")
+    first_frame = summary['time_to_first_frame_ms']
+    interactive = summary['time_to_interactive_ms']
+    if first_frame is None:
+        lines.append("❌ First frame was never rendered")
+        return '\n'.join(lines)
+    lines.append(f"🖼️ First frame: {first_frame:.0f}ms")
+    if interactive is not None:
+        lines.append(f"⚡ Interactive: {interactive:.0f}ms")
+    verdict = "✅ within" if summary['within_budget'] else "❌ over"
+    lines.append(f"{verdict} budget of {summary['budget_ms']}ms")
+    return '\n'.join(lines)
+
+
+# Shared by the entry scripts and the app
+STARTUP = StartupProfiler()
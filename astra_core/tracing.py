@@ -0,0 +1,131 @@
+# astra_core/tracing.py - Lightweight tracing spans for Astra Mobile
+# Spans land in a ring buffer and dump as Chrome trace-event JSON (chrome://tracing, Perfetto)
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    """Returned by a disabled tracer: entering and leaving do nothing"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, time.perf_counter() - self.start, self.args)
+        return False
+
+
+def trace_from_environment():
+    """Whether ASTRA_TRACE asks for tracing ('0', 'false', 'no' and 'off' do not)"""
+    return os.environ.get('ASTRA_TRACE', '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+class Tracer:
+    """Collect timed spans into a bounded ring buffer
+
+    Disabled by default (set ASTRA_TRACE=1 to trace from launch); span()
+    then returns a shared no-op object. Hot paths check `enabled` once and
+    time their stages with complete(), so they pay nothing more when
+    tracing is off. When enabled each span is
+    one tuple appended to a deque of `capacity` entries; the oldest spans
+    fall off. Safe to use from worker threads.
+    """
+
+    def __init__(self, capacity=4096, enabled=None):
+        self.enabled = trace_from_environment() if enabled is None else enabled
+        # Defaults to the temp directory; the app points it at user_data_dir
+        self.dump_path = None
+        self._origin = time.perf_counter()
+        self._spans = deque(maxlen=capacity)
+
+    def span(self, name, args=None):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, args)
+
+    def complete(self, name, start, duration, args=None):
+        """Record a span measured elsewhere (start from perf_counter)"""
+        if self.enabled:
+            self._spans.append((name, start, duration, threading.get_ident(), args))
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self._spans.clear()
+
+    def __len__(self):
+        return len(self._spans)
+
+    def summary(self):
+        """Per-span-name count and total/mean milliseconds, slowest total first"""
+        totals = {}
+        for name, _, duration, _, _ in list(self._spans):
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + duration)
+        rows = [
+            {'name': name, 'count': count, 'total_ms': round(total * 1000, 3),
+             'mean_ms': round(total * 1000 / count, 3)}
+            for name, (count, total) in totals.items()
+        ]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def chrome_trace(self):
+        """Spans as a Chrome trace-event document ('X' complete events, microseconds)"""
+        pid = os.getpid()
+        events = []
+        for name, start, duration, tid, args in list(self._spans):
+            event = {
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 3),
+                'dur': round(duration * 1e6, 3),
+                'pid': pid,
+                'tid': tid
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path=None):
+        """Write the Chrome trace JSON and return the path"""
+        path = path or self.dump_path
+        if path is None:
+            import tempfile
+            path = os.path.join(tempfile.gettempdir(), 'astra_trace.json')
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(self.chrome_trace(), output)
+        return path
+
+
+# Shared by the engine and the app
+TRACER = Tracer()
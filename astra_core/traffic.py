@@ -0,0 +1,94 @@
+# astra_core/traffic.py - Query traffic recording for Astra Mobile
+# Captures real sessions (query, arrival gap, reply size) for replay with benchmarks/replay_traffic.py
+
+import json
+import os
+import threading
+import time
+
+TRAFFIC_FORMAT = 1
+
+
+class TrafficRecorder:
+    """Append each query to a compact JSON-lines log
+
+    The first line is a header; every following line is one query:
+    {"dt": seconds since the previous query arrived, "q": query text,
+    "n": reply size in UTF-8 bytes}. Off unless a path is given (set
+    ASTRA_RECORD_TRAFFIC=<path> to record from launch); the log holds
+    query text, so only record sessions you are allowed to keep.
+    """
+
+    def __init__(self, path=None, clock=time.monotonic, flush_every=32):
+        self.clock = clock
+        self.flush_every = flush_every
+        self.path = None
+        self.recorded = 0
+        self._file = None
+        self._last_arrival = None
+        self._lock = threading.Lock()
+        if path:
+            self.start(path)
+
+    @property
+    def enabled(self):
+        return self._file is not None
+
+    def start(self, path):
+        """Start appending to path (a new file gets a header line)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self._file = open(path, 'a', encoding='utf-8')
+            if new:
+                self._file.write(json.dumps({'astra_traffic': TRAFFIC_FORMAT, 'started': round(time.time(), 3)}) + '\n')
+            self.path = path
+            self._last_arrival = None
+
+    def record(self, query, response_bytes, arrived=None):
+        """Log one query; `arrived` is when it came in, on this recorder's clock"""
+        if self._file is None:
+            return
+        arrived = self.clock() if arrived is None else arrived
+        with self._lock:
+            if self._file is None:
+                return
+            gap = 0.0 if self._last_arrival is None else max(arrived - self._last_arrival, 0.0)
+            self._last_arrival = arrived
+            self._file.write(json.dumps({'dt': round(gap, 4), 'q': query, 'n': response_bytes},
+                                        ensure_ascii=False) + '\n')
+            self.recorded += 1
+            if self.recorded % self.flush_every == 0:
+                self._file.flush()
+
+    def stop(self):
+        """Flush and close the log"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_traffic(path):
+    """Read a traffic log into a list of (gap_seconds, query, response_bytes)"""
+    entries = []
+    with open(path, encoding='utf-8') as log:
+        for number, line in enumerate(log, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'astra_traffic' in record:
+                if record['astra_traffic'] > TRAFFIC_FORMAT:
+                    raise ValueError(f"{path}:{number}: traffic format {record['astra_traffic']} is newer than this tool")
+                continue
+            entries.append((float(record.get('dt', 0.0)), record['q'], record.get('n')))
+    return entries
+
+
+# Shared by the engine and the app
+TRAFFIC = TrafficRecorder(os.environ.get('ASTRA_RECORD_TRAFFIC'), clock=time.perf_counter)
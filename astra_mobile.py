@@ -2,196 +2,291 @@
 # Designed for low-end smartphones with minimal resource usage
 
 import os
-import json
-import threading
+import signal
+import tempfile
 import time
 from datetime import datetime
+
+from astra_core.startup_profile import STARTUP, process_age
+
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.popup import Popup
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.cache import Cache
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.metrics import dp
 from kivy.utils import platform
+STARTUP.mark('import kivy')
 
-# Mobile-specific imports
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
-    print("Warning: requests not available. Online features disabled.")
+# Response engine lives in the Kivy-free core; re-exported here for callers
+from astra_core import (
+    BATTERY_SAVER,
+    LOW_MEMORY_MODE,
+    MEMORY_BUDGET_MB,
+    MOBILE_MODE,
+    OFFLINE_RESPONSES,
+    get_offline_response,
+    handle_mobile_commands,
+    process_mobile_query,
+    simple_math,
+    stream_mobile_query
+)
+from astra_core.frame_scheduler import FrameCoalescer
+from astra_core.lazy_imports import is_available, optional_import
+from astra_core.log import LOG
+from astra_core.memory import (
+    CRITICAL,
+    MODERATE,
+    NORMAL,
+    MemoryGovernor,
+    pressure_from_android,
+    trim_core_caches
+)
+from astra_core.message_store import MessageStore
+from astra_core.metrics import METRICS, FrameTimer
+from astra_core.tracing import TRACER
+from astra_core.traffic import TRAFFIC
+from astra_core.messages import ROLE_ASSISTANT, ROLE_USER, Message
+from astra_core.power import PowerManager
+from astra_core.query_worker import QueryCancelled, QueryWorker
+from android_permissions import register_trim_memory_callback
 
-# Global settings for mobile optimization
-MOBILE_MODE = True
-LOW_MEMORY_MODE = True
-BATTERY_SAVER = True
+# Online features use requests, which is only imported on first use
+REQUESTS_AVAILABLE = is_available('requests')
+if not REQUESTS_AVAILABLE:
+    LOG.warning("requests not available; online features disabled")
 
-# Simple offline responses for mobile
-OFFLINE_RESPONSES = {
-    'hello': "👋 Hi! I'm Astra Mobile - your lightweight AI assistant!",
-    'hi': "👋 Hello! How can I help you today?",
-    'help': "📱 **Astra Mobile Help**\n\n• Ask me questions\n• I work offline\n• Lightweight & fast\n• Battery friendly",
-    'what can you do': "🤖 I can:\n• Answer questions\n• Work offline\n• Save battery\n• Run on low-end phones",
-    'time': f"⏰ Current time: {datetime.now().strftime('%H:%M:%S')}",
-    'date': f"📅 Today: {datetime.now().strftime('%Y-%m-%d')}",
-    'weather': "🌤️ I can't check weather offline, but I'm here to help with other questions!",
-    'calculator': "🧮 I can do simple math! Try: 'calculate 15 + 23'",
-    'battery': "🔋 Astra Mobile is optimized for battery life!",
-    'memory': "💾 Astra Mobile uses minimal memory for smooth performance!",
-    'offline': "📡 Astra Mobile works completely offline!",
-    'lightweight': "⚡ Astra Mobile is designed to be lightweight and fast!",
-    'mobile': "📱 Astra Mobile - optimized for smartphones!",
-    'fast': "🚀 Astra Mobile is fast and responsive!",
-    'simple': "✨ Astra Mobile keeps things simple and efficient!"
-}
+def get_requests():
+    """The requests module, imported on first call (None if missing)"""
+    return optional_import('requests')
 
-# Math operations
-def simple_math(query):
-    """Handle simple math calculations"""
-    try:
-        import re
-        # Extract numbers and operators
-        query_lower = query.lower()
-        
-        # Replace words with symbols
-        query_lower = query_lower.replace('plus', '+')
-        query_lower = query_lower.replace('minus', '-')
-        query_lower = query_lower.replace('times', '*')
-        query_lower = query_lower.replace('multiply', '*')
-        query_lower = query_lower.replace('divided by', '/')
-        query_lower = query_lower.replace('divide', '/')
-        
-        # Extract math expression
-        math_expr = re.sub(r'[^0-9+\-*/(). ]', '', query_lower)
-        math_expr = math_expr.strip()
-        
-        if re.match(r'^[\d+\-*/(). ]+$', math_expr):
-            result = eval(math_expr)
-            return f"🧮 Result: {round(result, 2)}"
-        
-        return None
-    except:
-        return None
+def app_data_dir():
+    """Writable per-app directory (App.user_data_dir once the app is running)"""
+    app = App.get_running_app()
+    if app is not None:
+        return app.user_data_dir
+    return tempfile.gettempdir()
 
-# Simple offline AI responses
-def get_offline_response(query):
-    """Get offline response for common queries"""
-    query_lower = query.lower().strip()
-    
-    # Check for exact matches
-    for keyword, response in OFFLINE_RESPONSES.items():
-        if keyword in query_lower:
-            return response
-    
-    # Check for math
-    if any(word in query_lower for word in ['calculate', 'math', 'plus', 'minus', 'times', 'divide']):
-        math_result = simple_math(query)
-        if math_result:
-            return math_result
-    
-    # Check for greetings
-    greeting_words = ['hello', 'hi', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening']
-    if any(word in query_lower for word in greeting_words):
-        return "👋 Hello! I'm Astra Mobile - your lightweight AI assistant!"
-    
-    # Check for help requests
-    if any(word in query_lower for word in ['help', 'what can you do', 'capabilities']):
-        return "📱 **Astra Mobile Help**\n\n• Ask me questions\n• I work offline\n• Lightweight & fast\n• Battery friendly\n• Simple math\n• Time & date"
-    
-    # Default response
-    return "🤖 I'm Astra Mobile - a lightweight AI assistant. I work offline and am optimized for mobile devices. Ask me anything!"
+def run_on_ui_thread(func):
+    """Run func on the Kivy main thread at the next frame (safe from any thread)"""
+    Clock.schedule_once(lambda dt: func(), 0)
 
-# Mobile-optimized query processor
-def process_mobile_query(query):
-    """Process queries with mobile optimization"""
-    if not query or len(query.strip()) == 0:
-        return "🤖 Please ask me a question!"
-    
-    if len(query.strip()) < 2:
-        return "🤖 Please ask a more detailed question."
-    
-    try:
-        # Check for commands
-        if query.startswith('/'):
-            return handle_mobile_commands(query[1:])
-        
-        # Get offline response
-        response = get_offline_response(query)
-        
-        # Add mobile indicator
-        return f"{response} [mobile]"
-        
-    except Exception as e:
-        print(f"Mobile query error: {e}")
-        return "🤖 Sorry, I encountered an error. Please try again. [mobile]"
+# Kivy caches that only hold re-creatable textures and text measurements
+KIVY_CACHE_CATEGORIES = ('kv.image', 'kv.texture', 'textinput.label', 'textinput.width')
 
-def handle_mobile_commands(command):
-    """Handle mobile-specific commands"""
-    command_lower = command.lower()
-    
-    if 'help' in command_lower:
-        return """📱 **Astra Mobile Commands**
+def release_kivy_caches(level):
+    """Memory governor hook: drop Kivy's texture and label caches"""
+    if level != NORMAL:
+        for category in KIVY_CACHE_CATEGORIES:
+            Cache.remove(category)
 
-**Basic Commands:**
-• /help - Show this help
-• /time - Current time
-• /date - Current date
-• /status - App status
-• /clear - Clear chat
-• /battery - Battery info
-• /memory - Memory usage
-• /offline - Offline status
+def set_max_fps(fps):
+    """Change Kivy's frame cap at runtime (Config maxfps is only read at startup)"""
+    Clock._max_fps = float(fps)
 
-**Features:**
-• 🔋 Battery optimized
-• 💾 Low memory usage
-• 📡 Works offline
-• ⚡ Fast responses
-• 📱 Mobile friendly
+# Transcript row metrics (font 14 on mobile)
+CHAT_FONT_SIZE = 14
+CHAT_LINE_HEIGHT = 20
+CHAT_ROW_PADDING = 8
+
+class ChatRow(RecycleDataViewBehavior, Label):
+    """One transcript row; views are recycled as the user scrolls"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.color = (0, 1, 0, 1)
+        self.font_size = CHAT_FONT_SIZE
+        self.halign = 'left'
+        self.valign = 'top'
+        self.padding = (10, CHAT_ROW_PADDING)
+        self.index = None
+        self.transcript = None
+        self.bind(width=self.update_text_width, texture_size=self.report_height)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        """Bind this view to a data row"""
+        self.index = index
+        self.transcript = rv
+        return super().refresh_view_attrs(rv, index, data)
+    
+    def update_text_width(self, *args):
+        """Wrap text to the row width"""
+        self.text_size = (self.width - 20, None)
+    
+    def report_height(self, *args):
+        """Correct the estimated row height once the text is rendered"""
+        if self.transcript is not None and self.index is not None:
+            self.transcript.update_row_height(self.index, self.texture_size[1])
 
-**Examples:**
-• "Hello" - Get greeting
-• "Calculate 15 + 23" - Math
-• "What time is it?" - Time
-• "Help" - Get help
+def format_message(message):
+    """Display text for a message; the transcript rows are derived from this"""
+    if message.role == ROLE_USER:
+        timestamp = datetime.fromtimestamp(message.timestamp).strftime("%H:%M")
+        return f"[{timestamp}] You: {message.text}"
+    if message.role == ROLE_ASSISTANT:
+        return f"Astra: {message.text}"
+    return message.text
 
-I'm designed for low-end smartphones! 🚀"""
+class ChatTranscript(RecycleView):
+    """Virtualized chat transcript
+    
+    Each message is a data row with a precomputed height estimate, so
+    appending only adds one row and only rows in view are instantiated and
+    laid out. Estimates are corrected when a visible row renders.
+    
+    The rows are a window over a MessageStore no larger than its in-memory
+    ring. Scrolling to the top pages older messages in from disk and drops
+    the newest rows; scrolling back down pages them in again.
+    """
+    
+    def __init__(self, store, frame, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.frame = frame
+        self.window_start = 0
+        self.viewclass = ChatRow
+        self.do_scroll_x = False
+        self.bar_width = 10
+        self.bar_color = (0, 1, 0, 0.7)
+        self.bar_inactive_color = (0, 1, 0, 0.3)
+        self.scroll_type = ['bars', 'content']
+        
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, CHAT_LINE_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=4
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        frame.register('sizes', self.refresh_from_data, order=0)
+        self.bind(scroll_y=self.on_scroll_position)
+    
+    @property
+    def window_size(self):
+        """Rows kept in the view; matches the store's in-memory ring"""
+        return self.store.capacity
     
-    elif 'time' in command_lower:
-        return f"⏰ Current time: {datetime.now().strftime('%H:%M:%S')} [mobile]"
+    @property
+    def window_end(self):
+        return self.window_start + len(self.data)
     
-    elif 'date' in command_lower:
-        return f"📅 Today: {datetime.now().strftime('%Y-%m-%d')} [mobile]"
+    def at_tail(self):
+        """Whether the newest message is inside the window"""
+        return self.window_end >= len(self.store)
     
-    elif 'status' in command_lower:
-        return "✅ Astra Mobile is running smoothly!\n📱 Optimized for mobile\n🔋 Battery friendly\n💾 Low memory usage [mobile]"
+    def estimate_height(self, text):
+        """Approximate wrapped height without laying the text out"""
+        chars_per_line = max(int((self.width - 20) / (CHAT_FONT_SIZE * 0.55)), 10)
+        lines = sum(max(1, -(-len(line) // chars_per_line)) for line in text.split('\n'))
+        return lines * CHAT_LINE_HEIGHT + 2 * CHAT_ROW_PADDING
     
-    elif 'clear' in command_lower:
-        return "🗑️ Chat cleared. [mobile]"
+    def make_row(self, message):
+        """Derive a view row from a stored message"""
+        text = format_message(message)
+        return {'text': text, 'height': self.estimate_height(text)}
+    
+    def add_message(self, message):
+        """Add one message at the bottom"""
+        following = self.at_tail()
+        self.store.append(message)
+        if not following:
+            return
+        self.data.append(self.make_row(message))
+        overflow = len(self.data) - self.window_size
+        if overflow > 0:
+            del self.data[:overflow]
+            self.window_start += overflow
+    
+    def extend_last_message(self, chunk):
+        """Append text to the newest message (streamed replies)"""
+        try:
+            # Only the chunk is encoded; the stored text is never rebuilt
+            self.store.append_to_last(chunk)
+        except IndexError:
+            self.add_message(Message(time.time(), ROLE_ASSISTANT, chunk))
+            return
+        if self.at_tail() and self.data:
+            # format_message only prefixes the text, so the row grows by the chunk too
+            text = self.data[-1]['text'] + chunk
+            self.data[-1] = {'text': text, 'height': self.estimate_height(text)}
     
-    elif 'battery' in command_lower:
-        return "🔋 Astra Mobile is optimized for battery life!\n• Minimal CPU usage\n• Efficient responses\n• Lightweight design [mobile]"
+    def update_row_height(self, index, text_height):
+        """Store a row's rendered height and re-position rows on the next frame"""
+        if index >= len(self.data):
+            return
+        height = text_height + 2 * CHAT_ROW_PADDING
+        row = self.data[index]
+        if abs(row.get('height', 0) - height) > 1:
+            row['height'] = height
+            self.frame.request('sizes')
     
-    elif 'memory' in command_lower:
-        return "💾 Astra Mobile uses minimal memory!\n• Lightweight code\n• No heavy models\n• Fast startup [mobile]"
+    def on_scroll_position(self, instance, scroll_y):
+        """Page history in or out when the user reaches either end"""
+        if scroll_y >= 1 and self.window_start > 0:
+            self.load_older()
+        elif scroll_y <= 0 and not self.at_tail():
+            self.load_newer()
     
-    elif 'offline' in command_lower:
-        return "📡 Astra Mobile works completely offline!\n• No internet required\n• Instant responses\n• Always available [mobile]"
+    def load_older(self):
+        """Prepend the previous page and drop the same number of newest rows"""
+        start = max(0, self.window_start - self.store.page_size)
+        rows = [self.make_row(message) for message in self.store.get_range(start, self.window_start)]
+        if not rows:
+            return
+        keep = max(self.window_size - len(rows), 0)
+        self.data = rows + list(self.data[:keep])
+        self.window_start = start
+        # Keep the reading position, clear of both paging edges
+        self.scroll_y = min(max(1 - len(rows) / max(len(self.data), 1), 0.01), 0.99)
     
-    else:
-        return "❓ Unknown command. Type /help for available commands. [mobile]"
+    def load_newer(self):
+        """Append the next page and drop the same number of oldest rows"""
+        end = self.window_end
+        rows = [self.make_row(message) for message in self.store.get_range(end, end + self.store.page_size)]
+        if not rows:
+            return
+        drop = max(len(self.data) + len(rows) - self.window_size, 0)
+        self.data = list(self.data[drop:]) + rows
+        self.window_start += drop
+        self.scroll_y = min(max(len(rows) / max(len(self.data), 1), 0.01), 0.99)
+    
+    def scroll_to_bottom(self):
+        """Jump to the newest row (only visible rows are re-bound)"""
+        if not self.at_tail():
+            start = max(0, len(self.store) - self.window_size)
+            self.data = [self.make_row(message) for message in self.store.get_range(start, len(self.store))]
+            self.window_start = start
+        self.scroll_y = 0
+    
+    def trim(self, keep):
+        """Keep only the newest `keep` rows in memory (the store rounds up to a page)"""
+        self.store.trim(keep)
+        drop = len(self.data) - keep
+        if drop > 0:
+            self.data = list(self.data[drop:])
+            self.window_start += drop
+    
+    def clear(self):
+        """Remove every row and the stored history"""
+        self.store.clear()
+        self.data = []
+        self.window_start = 0
 
 # Mobile-optimized chat screen
 class MobileChatScreen(Screen):
-    def __init__(self, **kwargs):
+    @STARTUP.timed('MobileChatScreen.__init__')
+    def __init__(self, power=None, **kwargs):
         super().__init__(**kwargs)
         self.name = 'mobile_chat'
+        self.power = power
         
         # Main layout with mobile optimization
         layout = BoxLayout(orientation='vertical', spacing=5, padding=10)
@@ -203,50 +298,41 @@ class MobileChatScreen(Screen):
             color=(0, 1, 0, 1),
             font_size=18,
             bold=True,
-            size_hint_x=0.6
+            size_hint_x=0.5
         )
         self.status_label = Label(
             text="Ready",
             color=(0, 1, 0, 1),
             font_size=14,
-            size_hint_x=0.4
+            size_hint_x=0.35
         )
+        settings_btn = Button(
+            text="⚙",
+            font_size=18,
+            background_color=(0, 0.3, 0, 1),
+            color=(0, 1, 0, 1),
+            size_hint_x=0.15
+        )
+        settings_btn.bind(on_press=self.open_settings)
         header.add_widget(title)
         header.add_widget(self.status_label)
+        header.add_widget(settings_btn)
         
         # Chat area (larger for mobile)
         chat_container = BoxLayout(orientation='vertical', size_hint=(1, 0.82))
         
-        # Scroll view for chat
-        self.scroll = ScrollView(
-            do_scroll_x=False,
-            do_scroll_y=True,
-            scroll_type=['bars'],
-            bar_width=10,
-            bar_color=(0, 1, 0, 0.7),
-            bar_inactive_color=(0, 1, 0, 0.3)
-        )
-        
-        self.chat_log = TextInput(
-            size_hint_y=None,
-            readonly=True,
-            multiline=True,
-            background_color=(0, 0, 0, 1),
-            foreground_color=(0, 1, 0, 1),
-            cursor_color=(0, 1, 0, 1),
-            selection_color=(0, 0.5, 0, 0.3),
-            font_size=14,  # Smaller font for mobile
-            padding=(10, 10),
-            border=(0, 0, 0, 0),
-            write_tab=False
+        # Virtualized transcript over a bounded history; older pages spill to disk
+        self.history = MessageStore(
+            capacity=100 if LOW_MEMORY_MODE else 500,
+            page_size=25 if LOW_MEMORY_MODE else 50,
+            spill_path=os.path.join(app_data_dir(), 'chat_history.jsonl')
         )
-        self.chat_log.bind(text=self.update_log_height)
-        self.scroll.add_widget(self.chat_log)
+        # Height, layout and scroll requests collapse into one pass per frame
+        self.frame = FrameCoalescer(lambda callback: Clock.create_trigger(callback, 0))
+        self.transcript = ChatTranscript(self.history, self.frame)
+        self.frame.register('scroll', self.scroll_to_bottom, order=1)
         
-        # Set initial height
-        self.chat_log.height = 500
-        
-        chat_container.add_widget(self.scroll)
+        chat_container.add_widget(self.transcript)
         
         # Compact input area
         input_container = BoxLayout(size_hint=(1, 0.1), spacing=5)
@@ -268,6 +354,16 @@ class MobileChatScreen(Screen):
             size_hint_x=0.25
         )
         self.send_btn.bind(on_press=self.on_send)
+        self.input.bind(text=self.update_send_button)
+        
+        # Queries run on a worker thread; chunks and results return via the Clock
+        self.streaming_ticket = None
+        self.worker = QueryWorker(
+            handler=stream_mobile_query,
+            deliver=run_on_ui_thread,
+            on_state=self.on_worker_state,
+            max_pending=4 if LOW_MEMORY_MODE else 16
+        )
         
         input_container.add_widget(self.input)
         input_container.add_widget(self.send_btn)
@@ -279,8 +375,9 @@ class MobileChatScreen(Screen):
         
         self.add_widget(layout)
         
-        # Welcome message
-        Clock.schedule_once(lambda dt: self.show_welcome(), 0.5)
+        # Welcome message is in the data before the first layout pass, so
+        # the first rendered frame already shows it
+        self.show_welcome()
     
     def show_welcome(self):
         """Show welcome message"""
@@ -304,79 +401,139 @@ Type /help for commands! 🚀"""
         
         self.append_message("", welcome_msg)
     
-    def update_log_height(self, *args):
-        """Update chat log height based on content"""
-        try:
-            lines = self.chat_log.text.count('\n') + 1
-            line_height = 24  # Smaller for mobile
-            min_height = 500
-            calculated_height = max(min_height, lines * line_height)
-            self.chat_log.height = calculated_height
-            
-            # Force scroll to bottom
-            Clock.schedule_once(lambda dt: self.scroll_to_bottom(), 0.1)
-        except Exception as e:
-            print(f"Error updating log height: {e}")
+    def is_interactive(self):
+        """Whether the input can take focus and the welcome row is on screen"""
+        if self.input.get_root_window() is None or self.input.disabled:
+            return False
+        return self.transcript.view_adapter.get_visible_view(0) is not None
+    
+    def open_settings(self, instance):
+        """Show the settings screen (built on first visit)"""
+        App.get_running_app().show_screen('mobile_settings')
+    
+    def trim_history(self, level):
+        """Memory governor hook: keep fewer messages resident under pressure"""
+        if level == NORMAL:
+            return
+        keep = self.history.page_size if level == CRITICAL else self.history.capacity // 2
+        self.transcript.trim(keep)
     
     def scroll_to_bottom(self):
         """Scroll chat to bottom"""
         try:
-            self.scroll.scroll_y = 0
-        except Exception as e:
-            print(f"Error scrolling to bottom: {e}")
+            self.transcript.scroll_to_bottom()
+        except Exception:
+            LOG.exception("Error scrolling to bottom")
     
     def append_message(self, user_msg, bot_msg):
         """Add a message to the chat"""
         try:
-            timestamp = datetime.now().strftime("%H:%M")
+            now = time.time()
             if user_msg:
-                new_text = f"[{timestamp}] You: {user_msg}\nAstra: {bot_msg}\n\n"
-            else:
-                new_text = f"Astra: {bot_msg}\n\n"
-            
-            current_text = self.chat_log.text
-            self.chat_log.text = current_text + new_text
+                self.transcript.add_message(Message(now, ROLE_USER, user_msg))
+            self.transcript.add_message(Message(now, ROLE_ASSISTANT, bot_msg))
             
-            # Update scroll view height and scroll to bottom
-            Clock.schedule_once(lambda dt: self.update_log_height(), 0.1)
+            # Scroll to the new message at the next frame
+            self.frame.request('scroll')
             
-        except Exception as e:
-            print(f"Error in append_message: {e}")
+        except Exception:
+            LOG.exception("Error in append_message")
+    
+    def begin_message(self, user_msg):
+        """Start a streamed reply: show the user message and an empty reply"""
+        now = time.time()
+        self.transcript.add_message(Message(now, ROLE_USER, user_msg))
+        self.transcript.add_message(Message(now, ROLE_ASSISTANT, ""))
+    
+    def append_chunk(self, chunk):
+        """Render one streamed chunk of the current reply"""
+        try:
+            self.transcript.extend_last_message(chunk)
+            self.frame.request('scroll')
+        except Exception:
+            LOG.exception("Error in append_chunk")
+    
+    def end_message(self):
+        """Finish the current streamed reply"""
+        self.frame.request('scroll')
     
     def on_send(self, instance):
         """Handle send button press"""
         try:
             user_query = self.input.text.strip()
             if not user_query:
+                # Empty input while busy: Send acts as Stop for the latest query
+                ticket = self.worker.latest()
+                if ticket is not None:
+                    self.worker.cancel(ticket)
+                    self.status_label.text = "Cancelling..."
                 return
-
-            # Clear input immediately
-            self.input.text = ""
-            
-            # Show processing indicator
-            self.status_label.text = "Processing..."
             
-            # Process the message
-            try:
-                response = process_mobile_query(user_query)
-            except Exception as e:
-                response = "🤖 Sorry, I encountered an error. Please try again. [mobile]"
-            
-            self.append_message(user_query, response)
+            # Process the message off the UI thread
+            ticket = self.worker.submit(user_query, self.on_response, on_chunk=self.on_chunk)
+            if ticket is None:
+                self.status_label.text = "Busy - please wait"
+                return
             
-            # Reset status
-            Clock.schedule_once(lambda dt: self.reset_status(), 1)
+            # Clear input once the query is accepted
+            self.input.text = ""
             
-        except Exception as e:
-            print(f"Error in on_send: {e}")
+        except Exception:
+            LOG.exception("Error in on_send")
             self.status_label.text = "Error occurred"
     
+    def on_chunk(self, ticket, chunk):
+        """Render streamed output as it arrives (UI thread, in order)"""
+        if self.streaming_ticket is not ticket:
+            self.streaming_ticket = ticket
+            self.begin_message(ticket.query)
+        self.append_chunk(chunk)
+    
+    def on_response(self, ticket, response, error):
+        """Finish a query (runs on the UI thread, in submission order)"""
+        if isinstance(error, QueryCancelled):
+            if self.streaming_ticket is not ticket:
+                # Cancelled before any output: still show what was asked
+                self.append_message(ticket.query, "[cancelled]")
+                return
+            self.append_chunk(" [cancelled]")
+        elif error is not None:
+            LOG.error("Error processing query: %r", error)
+            response = "🤖 Sorry, I encountered an error. Please try again. [mobile]"
+            if self.streaming_ticket is ticket:
+                self.append_chunk(f"\n{response}")
+        
+        if self.streaming_ticket is ticket:
+            self.end_message()
+            self.streaming_ticket = None
+        else:
+            self.append_message(ticket.query, response)
+    
+    def on_worker_state(self, in_flight):
+        """Reflect real in-flight work in the status label"""
+        if self.power is not None:
+            # Keep full frame rate while replies are streaming in
+            self.power.set_busy(in_flight > 0)
+        if in_flight == 0:
+            self.reset_status()
+        elif in_flight == 1:
+            self.status_label.text = "Processing..."
+        else:
+            self.status_label.text = f"Processing ({in_flight})..."
+        self.update_send_button()
+    
+    def update_send_button(self, *args):
+        """Send doubles as Stop while a query runs and the input is empty"""
+        busy = self.worker.in_flight > 0 and not self.input.text.strip()
+        self.send_btn.text = "Stop" if busy else "Send"
+    
     def reset_status(self):
         """Reset status label"""
         self.status_label.text = "Ready"
 
 # Mobile-optimized settings screen
 class MobileSettingsScreen(Screen):
+    @STARTUP.timed('MobileSettingsScreen.__init__')
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = 'mobile_settings'
@@ -410,7 +567,7 @@ class MobileSettingsScreen(Screen):
 
 **Optimization:**
 • 🔋 Battery Saver: {'ON' if BATTERY_SAVER else 'OFF'}
-• 💾 Low Memory Mode: {'ON' if LOW_MEMORY_MODE else 'OFF'}
+• 💾 Low Memory Mode: {'ON' if LOW_MEMORY_MODE else 'OFF'} (budget {MEMORY_BUDGET_MB} MB)
 • 📡 Offline Mode: {'ON' if not REQUESTS_AVAILABLE else 'AUTO'}
 
 **Performance:**
@@ -448,11 +605,19 @@ class MobileSettingsScreen(Screen):
         """Go back to chat screen"""
         self.manager.current = 'mobile_chat'
 
+# Screens constructed on first navigation, by name
+LAZY_SCREENS = {
+    'mobile_settings': MobileSettingsScreen
+}
+
 # Mobile-optimized main app
 class AstraMobileApp(App):
+    @STARTUP.timed('AstraMobileApp.__init__')
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.title = "Astra Mobile"
+        self.created_at = time.perf_counter()
+        self.time_to_interactive = None
         
         # Mobile-specific settings
         if platform == 'android':
@@ -462,22 +627,40 @@ class AstraMobileApp(App):
         # Set window size for mobile
         Window.size = (400, 600)
     
+    @STARTUP.timed('AstraMobileApp.build')
     def build(self):
         """Build the mobile app"""
         try:
+            # Log records are written to disk in batches off the UI thread
+            LOG.set_path(os.path.join(self.user_data_dir, 'astra.log'))
+            
+            # Battery saver: lower frame cap and no periodic work when idle
+            self.power = PowerManager(
+                Clock,
+                set_max_fps=set_max_fps,
+                frame_counter=lambda: Clock.frames
+            )
+            Window.bind(
+                on_touch_down=self.power.poke,
+                on_touch_move=self.power.poke,
+                on_key_down=self.power.poke
+            )
+            
             # Create screen manager
             sm = ScreenManager()
+            self.screen_manager = sm
+            
+            # Only the chat screen is built up front; others on first visit
+            self.chat_screen = MobileChatScreen(power=self.power)
+            sm.add_widget(self.chat_screen)
             
-            # Add screens
-            sm.add_widget(MobileChatScreen())
-            sm.add_widget(MobileSettingsScreen())
+            self.setup_memory_governor()
+            self.setup_metrics()
             
             return sm
             
         except Exception as e:
-            print(f"Error building mobile app: {e}")
-            import traceback
-            traceback.print_exc()
+            LOG.exception("Error building mobile app")
             
             # Fallback error screen
             from kivy.uix.label import Label
@@ -490,6 +673,101 @@ class AstraMobileApp(App):
             )
             error_layout.add_widget(error_label)
             return error_layout
+    
+    def setup_metrics(self):
+        """Expose UI-side stats to /status, /memory and /battery"""
+        # Per-frame timing only runs while active (the power manager stops it when idle)
+        self.frame_timer = FrameTimer()
+        self.power.schedule_interval(self.frame_timer.tick, 0)
+        METRICS.register_provider('frames', self.frame_timer.stats)
+        METRICS.register_provider('power', self.power.stats)
+        METRICS.register_provider('memory', self.memory.stats)
+        METRICS.register_provider('history', self.chat_screen.history.stats)
+        # /trace dump writes where the user (or adb) can fetch it
+        TRACER.dump_path = os.path.join(self.user_data_dir, 'astra_trace.json')
+        METRICS.register_provider('startup', lambda: {
+            'time_to_interactive_ms': None if self.time_to_interactive is None
+            else round(self.time_to_interactive * 1000, 1)
+        })
+    
+    def show_screen(self, name):
+        """Switch screens, building a lazy screen on its first visit"""
+        if not self.screen_manager.has_screen(name):
+            self.screen_manager.add_widget(LAZY_SCREENS[name]())
+        self.screen_manager.current = name
+    
+    def on_start(self):
+        """Watch rendered frames until the chat is usable"""
+        self.first_frame_seen = False
+        Window.bind(on_flip=self.on_frame_rendered)
+    
+    def on_frame_rendered(self, *args):
+        """Record the first frame and time to interactive"""
+        if not self.first_frame_seen:
+            self.first_frame_seen = True
+            STARTUP.mark('first frame')
+        
+        chat_screen = getattr(self, 'chat_screen', None)
+        if chat_screen is not None and not chat_screen.is_interactive():
+            return
+        Window.unbind(on_flip=self.on_frame_rendered)
+        if chat_screen is None:
+            return
+        
+        # Measured from process start where the OS reports it
+        age = process_age()
+        self.time_to_interactive = age if age is not None else time.perf_counter() - self.created_at
+        STARTUP.mark('interactive')
+        LOG.info("Interactive after %.0fms", self.time_to_interactive * 1000)
+        # The logger only echoes warnings, so print the launch time directly
+        print(f"⚡ Interactive after {self.time_to_interactive * 1000:.0f}ms")
+        
+        if STARTUP.enabled:
+            # Startup profile run: stop once the chat is usable
+            Clock.schedule_once(lambda dt: self.stop(), 0)
+    
+    def setup_memory_governor(self):
+        """Trim history and caches when memory runs short"""
+        self.memory = MemoryGovernor()
+        self.memory.register('history', self.chat_screen.trim_history)
+        self.memory.register('caches', trim_core_caches)
+        self.memory.register('kivy', release_kivy_caches)
+        
+        # Low memory mode polls RSS against the budget (paused while idle)
+        if LOW_MEMORY_MODE:
+            self.power.schedule_interval(self.memory.check, 10)
+        
+        # Platform pressure signals arrive off the Kivy thread
+        def on_trim(level):
+            run_on_ui_thread(lambda: self.memory.on_pressure(pressure_from_android(level)))
+        self.trim_callbacks = register_trim_memory_callback(on_trim)
+        
+        # Desktop: simulate pressure with `kill -USR1` (moderate) or `-USR2` (critical)
+        if platform != 'android' and hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda *args: run_on_ui_thread(lambda: self.memory.on_pressure(MODERATE)))
+            signal.signal(signal.SIGUSR2, lambda *args: run_on_ui_thread(lambda: self.memory.on_pressure(CRITICAL)))
+    
+    def on_pause(self):
+        """Backgrounded: drop to the paused frame rate and stop periodic work"""
+        power = getattr(self, 'power', None)
+        if power is not None:
+            power.pause()
+        return True
+    
+    def on_resume(self):
+        """Foreground again: restore full responsiveness"""
+        power = getattr(self, 'power', None)
+        if power is not None:
+            power.resume()
+    
+    def on_stop(self):
+        """Stop background workers, drop the history spill file and flush logs"""
+        chat_screen = getattr(self, 'chat_screen', None)
+        if chat_screen is not None:
+            chat_screen.worker.shutdown()
+            chat_screen.history.close()
+        TRAFFIC.stop()
+        LOG.close()
 
 if __name__ == "__main__":
     try:
@@ -501,9 +779,7 @@ if __name__ == "__main__":
         app = AstraMobileApp()
         app.run()
         
-    except Exception as e:
-        print(f"❌ Error running Astra Mobile: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        LOG.exception("Error running Astra Mobile")
         print("Press Enter to exit...")
         input() 
\ No newline at end of file
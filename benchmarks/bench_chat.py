@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# benchmarks/bench_chat.py - Chat screen throughput benchmark for Astra Mobile
+# Fills MobileChatScreen offscreen with 100 / 1k / 10k messages and records append and frame times
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.headless import use_offscreen_window
+
+use_offscreen_window()
+
+from astra_core.metrics import LatencyHistogram, current_rss, format_bytes
+
+DEFAULT_SIZES = (100, 1000, 10000)
+PATHS = ('append', 'send')
+
+# A reply takes at most this long to come back through the worker
+SEND_TIMEOUT = 5.0
+
+REPLY_TEXT = ("Here is a reply long enough to wrap over a couple of lines on a phone screen, "
+              "like most of Astra's answers.")
+
+
+def git_commit():
+    """Current commit hash, so results can be lined up across commits"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class ChatBench:
+    """One MobileChatScreen attached to the window, pumped a frame at a time"""
+
+    def __init__(self):
+        from kivy.base import EventLoop
+        from kivy.core.window import Window
+        from astra_mobile import MobileChatScreen, set_max_fps
+
+        # No frame cap: a frame takes exactly as long as its work
+        set_max_fps(0)
+        EventLoop.ensure_window()
+        self.event_loop = EventLoop
+        self.window = Window
+        self.screen = MobileChatScreen()
+        self.window.add_widget(self.screen)
+        self.frames = LatencyHistogram()
+        self.frame()
+
+    def frame(self):
+        """Run one main loop iteration (Clock, layout, draw) and time it"""
+        started = time.perf_counter()
+        self.event_loop.idle()
+        self.frames.record(time.perf_counter() - started)
+
+    def append(self, index):
+        """Add one exchange through append_message; returns its latency"""
+        started = time.perf_counter()
+        self.screen.append_message(f"Question {index}", f"{index}. {REPLY_TEXT}")
+        return time.perf_counter() - started
+
+    def send(self, index):
+        """Ask one question through on_send and pump frames until it is answered"""
+        screen = self.screen
+        answered = []
+        on_response = screen.on_response
+
+        def record(ticket, response, error):
+            on_response(ticket, response, error)
+            answered.append(error)
+
+        screen.on_response = record
+        try:
+            started = time.perf_counter()
+            screen.input.text = f"Calculate {index} + {index}"
+            screen.on_send(screen.send_btn)
+            deadline = started + SEND_TIMEOUT
+            while not answered:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"no reply to query {index} within {SEND_TIMEOUT}s")
+                self.frame()
+            return time.perf_counter() - started
+        finally:
+            del screen.on_response
+
+    def close(self):
+        self.screen.worker.shutdown()
+        self.screen.history.close()
+        self.window.remove_widget(self.screen)
+
+
+def run(path, count):
+    """Fill a fresh chat screen with `count` exchanges through `path`"""
+    rss_before = current_rss()
+    bench = ChatBench()
+    latency = LatencyHistogram()
+    started = time.perf_counter()
+    try:
+        for index in range(count):
+            if path == 'append':
+                latency.record(bench.append(index))
+                bench.frame()
+            else:
+                latency.record(bench.send(index))
+        elapsed = time.perf_counter() - started
+        rss_after = current_rss()
+        return {
+            'path': path,
+            'messages': count,
+            'seconds': round(elapsed, 3),
+            'messages_per_second': round(count / elapsed, 1) if elapsed else None,
+            'latency': latency.summary(),
+            'frame': bench.frames.summary(),
+            'rss_before': rss_before,
+            'rss_after': rss_after,
+            'rss_growth': rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            'rows': len(bench.screen.transcript.data),
+            'history': bench.screen.history.stats(),
+            'frame_passes': bench.screen.frame.stats()
+        }
+    finally:
+        bench.close()
+
+
+def scaling(results):
+    """Mean latency at the largest size over the smallest, per path
+
+    Constant per-message cost keeps this near 1; a transcript that re-lays
+    out everything on each append grows it with the message count.
+    """
+    report = {}
+    for path in PATHS:
+        runs = sorted((run for run in results if run['path'] == path), key=lambda run: run['messages'])
+        if len(runs) >= 2 and runs[0]['latency']['mean_ms']:
+            report[path] = round(runs[-1]['latency']['mean_ms'] / runs[0]['latency']['mean_ms'], 2)
+    return report
+
+
+def compare(results, baseline, tolerance):
+    """Runs whose p95 latency or frame time grew more than `tolerance` over the baseline"""
+    previous = {(run['path'], run['messages']): run for run in baseline.get('results', [])}
+    regressions = []
+    for run in results:
+        before = previous.get((run['path'], run['messages']))
+        if before is None:
+            continue
+        for metric in ('latency', 'frame'):
+            old, new = before[metric]['p95_ms'], run[metric]['p95_ms']
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{run['path']} x{run['messages']} {metric} p95 {old}ms -> {new}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MobileChatScreen append throughput")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="message counts to run (default: 100 1000 10000)")
+    parser.add_argument('--path', choices=PATHS + ('all',), default='all',
+                        help="append_message directly, on_send through the worker, or both")
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON")
+    parser.add_argument('--compare', metavar='PATH', help="baseline JSON from an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed p95 growth over the baseline (default 0.25 = 25%%)")
+    args = parser.parse_args()
+    paths = PATHS if args.path == 'all' else (args.path,)
+
+    results = []
+    for path in paths:
+        for count in args.sizes:
+            print(f"💬 {path}: {count} messages...")
+            result = run(path, count)
+            results.append(result)
+            print(f"   ⚡ {result['messages_per_second']} msg/s, "
+                  f"latency p50 {result['latency']['p50_ms']}ms p95 {result['latency']['p95_ms']}ms, "
+                  f"frame p95 {result['frame']['p95_ms']}ms, "
+                  f"RSS +{format_bytes(result['rss_growth'])}")
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+        'scaling': scaling(results)
+    }
+    for path, ratio in report['scaling'].items():
+        print(f"📈 {path}: mean latency x{ratio} from {min(args.sizes)} to {max(args.sizes)} messages")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        print(f"📝 Results written to {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        if regressions:
+            for regression in regressions:
+                print(f"❌ Regression: {regression}")
+            return 1
+        print("✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
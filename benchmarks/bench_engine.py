@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# benchmarks/bench_engine.py - Offline engine micro-benchmarks for Astra Mobile
+# Runs the query entry points over a generated corpus and fails on regressions against a stored baseline
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from astra_core import get_offline_response, handle_mobile_commands, process_mobile_query, simple_math
+from astra_core.engine import GREETING_WORDS, HELP_WORDS, OFFLINE_RESPONSES, QUERY_CACHE
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'engine_baseline.json')
+
+# Ops/sec may drop, and p95 grow, by this fraction before it counts as a regression
+DEFAULT_TOLERANCE = 0.30
+
+VOCABULARY = (
+    'weather', 'river', 'train', 'garden', 'music', 'planet', 'coffee', 'window',
+    'history', 'football', 'recipe', 'engine', 'mountain', 'library', 'ticket', 'winter'
+)
+UNICODE_WORDS = (
+    'café', 'naïve', 'straße', 'привет', 'мир', 'こんにちは', '天気', '你好', '数学',
+    'مرحبا', 'שלום', 'नमस्ते', '🚀', '📱', '👋🏽', 'é', '🇬🇧', '∑', '½'
+)
+# Commands that only read state; /trace and /logs export would write files
+COMMAND_CORPUS = (
+    'help', 'time', 'date', 'status', 'battery', 'memory', 'offline', 'clear',
+    'logs', '?', 'now', 'mem', 'he', 'nosuchcommand', 'status extra args'
+)
+
+
+def generate_corpus(size=200, seed=1234):
+    """Deterministic queries per category: hits, misses, long, math, unicode, commands"""
+    rng = random.Random(seed)
+    keywords = list(OFFLINE_RESPONSES) + GREETING_WORDS + HELP_WORDS
+
+    def words(count, pool=VOCABULARY):
+        return ' '.join(rng.choice(pool) for _ in range(count))
+
+    def expression():
+        operators = ('+', '-', '*', '/', ' plus ', ' minus ', ' times ', ' divided by ')
+        terms = [str(rng.randint(1, 9999))]
+        for _ in range(rng.randint(1, 6)):
+            terms.append(rng.choice(operators))
+            terms.append(str(rng.randint(1, 999)))
+        text = ''.join(terms)
+        return f"({text})*2" if rng.random() < 0.3 else text
+
+    return {
+        'hits': [f"{words(rng.randint(0, 4))} {rng.choice(keywords)} {words(rng.randint(0, 4))}".strip()
+                 for _ in range(size)],
+        'misses': [words(rng.randint(3, 12)) for _ in range(size)],
+        'long': [words(rng.randint(100, 600)) + (f" {rng.choice(keywords)}" if rng.random() < 0.5 else '')
+                 for _ in range(size)],
+        'math': [f"{rng.choice(('calculate', 'what is', 'math'))} {expression()}" for _ in range(size)],
+        'unicode': [f"{words(rng.randint(1, 8), UNICODE_WORDS)} {rng.choice(keywords + ['', ''])}".strip()
+                    for _ in range(size)],
+        'commands': [rng.choice(COMMAND_CORPUS) for _ in range(size)]
+    }
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))]
+
+
+def measure(func, queries, rounds=5):
+    """Time func per query; ops/sec from the fastest round, percentiles over all rounds"""
+    for query in queries:
+        func(query)
+    samples = []
+    best = None
+    for _ in range(rounds):
+        round_total = 0
+        for query in queries:
+            started = time.perf_counter_ns()
+            func(query)
+            elapsed = time.perf_counter_ns() - started
+            samples.append(elapsed)
+            round_total += elapsed
+        best = round_total if best is None else min(best, round_total)
+    samples.sort()
+
+    def us(ns):
+        return round(ns / 1000, 2)
+
+    return {
+        'ops': len(queries),
+        'ops_per_sec': round(len(queries) / (best / 1e9), 1) if best else None,
+        'mean_us': us(sum(samples) / len(samples)),
+        'p50_us': us(percentile(samples, 0.50)),
+        'p95_us': us(percentile(samples, 0.95)),
+        'p99_us': us(percentile(samples, 0.99)),
+        'max_us': us(samples[-1])
+    }
+
+
+def benchmark_cases(corpus):
+    """(name, function, queries, cache) for every benchmarked entry point"""
+    text = corpus['hits'] + corpus['misses'] + corpus['long'] + corpus['math'] + corpus['unicode']
+    mixed = text + [f"/{command}" for command in corpus['commands']]
+    cases = [('get_offline_response', get_offline_response, text, False)]
+    for category in ('hits', 'misses', 'long', 'math', 'unicode'):
+        cases.append((f"get_offline_response[{category}]", get_offline_response, corpus[category], False))
+    cases += [
+        ('simple_math', simple_math, corpus['math'] + corpus['misses'], False),
+        ('handle_mobile_commands', handle_mobile_commands, corpus['commands'], False),
+        ('process_mobile_query[cold]', process_mobile_query, mixed, False),
+        ('process_mobile_query[warm]', process_mobile_query, mixed, True)
+    ]
+    return cases
+
+
+def run_suite(size=200, rounds=5, seed=1234, only=None):
+    """Run every case (or those whose name contains `only`); returns results by name"""
+    corpus = generate_corpus(size, seed)
+    results = {}
+    cache_size = QUERY_CACHE.maxsize
+    try:
+        for name, func, queries, cached in benchmark_cases(corpus):
+            if only and only not in name:
+                continue
+            # Cold runs compute every reply; warm runs are served from the cache
+            QUERY_CACHE.clear()
+            QUERY_CACHE.resize(max(cache_size, len(queries)) if cached else 0)
+            results[name] = measure(func, queries, rounds)
+    finally:
+        QUERY_CACHE.resize(cache_size)
+        QUERY_CACHE.clear()
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regressions of results against a baseline's: fewer ops/sec or a slower p95"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            continue
+        if before['ops_per_sec'] and result['ops_per_sec'] < before['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']} ops/s, baseline {before['ops_per_sec']}")
+        if before['p95_us'] and result['p95_us'] > before['p95_us'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_us']}us, baseline {before['p95_us']}us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Astra Mobile's offline query engine")
+    parser.add_argument('--size', type=int, default=200, help="queries per corpus category")
+    parser.add_argument('--rounds', type=int, default=5, help="timed passes over each corpus")
+    parser.add_argument('--seed', type=int, default=1234, help="corpus generator seed")
+    parser.add_argument('--only', metavar='NAME', help="run only cases whose name contains NAME")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before failing (default 0.30 = 30%%)")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    args = parser.parse_args()
+
+    print(f"⚡ Benchmarking the offline engine ({args.size} queries per category, {args.rounds} rounds)...")
+    results = run_suite(args.size, args.rounds, args.seed, args.only)
+    print(f"{'case':38} {'ops/s':>11} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9}")
+    for name, result in results.items():
+        print(f"{name:38} {result['ops_per_sec']:>11} {result['p50_us']:>9} "
+              f"{result['p95_us']:>9} {result['p99_us']:>9}")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': args.size,
+        'rounds': args.rounds,
+        'seed': args.seed,
+        'results': results
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+            output.write('\n')
+        print(f"📝 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("💡 No baseline yet; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    if (baseline.get('size'), baseline.get('seed')) != (args.size, args.seed):
+        print("⚠️ Baseline used a different corpus; results are not comparable")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        return 1
+    print(f"✅ No regressions against the baseline ({baseline.get('python')}, {baseline.get('platform')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
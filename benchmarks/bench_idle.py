@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# benchmarks/bench_idle.py - Idle energy benchmark for Astra Mobile
+# Launches the app offscreen, leaves the chat screen idle and fails if it keeps waking up
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.headless import use_offscreen_window
+
+use_offscreen_window()
+
+# Idle budgets, per second of idle time. The battery saver caps idle at
+# 10 FPS, so 10 main loop wakeups/s is the floor; nothing should redraw
+# or run callbacks while the chat sits unused.
+DEFAULT_BUDGETS = {
+    'wakeups_per_second': 12.0,
+    'frames_drawn_per_second': 1.0,
+    'callbacks_per_second': 1.0,
+    'cpu_percent': 2.0
+}
+
+CALLBACKS = Counter()
+MEASURING = [False]
+
+
+def count_callbacks(clock):
+    """Wrap Clock scheduling so every callback run while measuring is counted"""
+    def counted(callback):
+        name = getattr(callback, '__qualname__', None) or repr(callback)
+
+        def wrapper(*args):
+            if MEASURING[0]:
+                CALLBACKS[name] += 1
+            return callback(*args)
+        return wrapper
+
+    for method in ('schedule_once', 'schedule_interval', 'create_trigger'):
+        original = getattr(clock, method)
+
+        def patched(callback, *args, _original=original, **kwargs):
+            return _original(counted(callback), *args, **kwargs)
+        setattr(clock, method, patched)
+
+
+def run_idle(seconds, warmup):
+    """Start the app, idle for warmup + seconds, return the measurements"""
+    from kivy.clock import Clock
+    count_callbacks(Clock)
+
+    from astra_mobile import AstraMobileApp
+
+    app = AstraMobileApp()
+    result = {}
+
+    # Benchmark bookkeeping uses the raw clock methods so it is not counted
+    schedule = type(Clock).schedule_once.__get__(Clock)
+
+    def start(dt):
+        result['start'] = (time.perf_counter(), time.process_time(), Clock.frames, Clock.frames_displayed)
+        MEASURING[0] = True
+
+    def finish(dt):
+        MEASURING[0] = False
+        started, cpu, frames, drawn = result.pop('start')
+        elapsed = time.perf_counter() - started
+        result.update({
+            'seconds': round(elapsed, 2),
+            'wakeups': Clock.frames - frames,
+            'frames_drawn': Clock.frames_displayed - drawn,
+            'callbacks': sum(CALLBACKS.values()),
+            'callbacks_by_name': dict(CALLBACKS.most_common(10)),
+            'cpu_seconds': round(time.process_time() - cpu, 3),
+            'power_state': app.power.stats()['state'] if hasattr(app, 'power') else None
+        })
+        app.stop()
+
+    # Warm-up covers startup and the power manager's idle timeout
+    schedule(start, warmup)
+    schedule(finish, warmup + seconds)
+    app.run()
+    return result
+
+
+def evaluate(result, budgets):
+    """Per-second rates and the list of exceeded budgets"""
+    seconds = max(result['seconds'], 1e-9)
+    rates = {
+        'wakeups_per_second': result['wakeups'] / seconds,
+        'frames_drawn_per_second': result['frames_drawn'] / seconds,
+        'callbacks_per_second': result['callbacks'] / seconds,
+        'cpu_percent': result['cpu_seconds'] / seconds * 100
+    }
+    failures = [
+        f"{name} {rates[name]:.2f} > {budget}"
+        for name, budget in budgets.items() if rates[name] > budget
+    ]
+    if result.get('power_state') not in (None, 'idle'):
+        failures.append(f"power state '{result['power_state']}' after warm-up, expected 'idle'")
+    return {name: round(value, 2) for name, value in rates.items()}, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Astra Mobile's idle wakeups")
+    parser.add_argument('--seconds', type=float, default=20.0, help="idle time measured")
+    parser.add_argument('--warmup', type=float, default=7.0,
+                        help="time before measuring (startup plus the 5s idle timeout)")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    for name, budget in DEFAULT_BUDGETS.items():
+        parser.add_argument(f"--max-{name.replace('_', '-')}", type=float, default=budget, dest=name)
+    args = parser.parse_args()
+    budgets = {name: getattr(args, name) for name in DEFAULT_BUDGETS}
+
+    print(f"🔋 Idling Astra Mobile for {args.seconds:.0f}s (after {args.warmup:.0f}s warm-up)...")
+    result = run_idle(args.seconds, args.warmup)
+    if 'seconds' not in result:
+        print("❌ App exited before the measurement finished")
+        return 1
+    rates, failures = evaluate(result, budgets)
+
+    print(f"📊 Wakeups: {result['wakeups']} ({rates['wakeups_per_second']}/s)")
+    print(f"🖼️ Frames drawn: {result['frames_drawn']} ({rates['frames_drawn_per_second']}/s)")
+    print(f"⏰ Clock callbacks: {result['callbacks']} ({rates['callbacks_per_second']}/s)")
+    for name, count in result['callbacks_by_name'].items():
+        print(f"   • {name}: {count}")
+    print(f"⚙️ CPU: {result['cpu_seconds']}s ({rates['cpu_percent']}%)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump({'result': result, 'rates': rates, 'budgets': budgets, 'failures': failures},
+                      output, indent=2)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ Over idle budget: {failure}")
+        return 1
+    print("✅ Idle within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
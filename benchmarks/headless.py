@@ -0,0 +1,15 @@
+# benchmarks/headless.py - Shared window setup for the Kivy benchmarks
+# Call use_offscreen_window() before anything imports Kivy
+
+import os
+
+
+def use_offscreen_window():
+    """Headless by default: SDL's offscreen driver with Kivy's no-op GL backend
+
+    Set these yourself (or run under xvfb-run) if your SDL build lacks offscreen.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+    os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# benchmarks/replay_traffic.py - Replay recorded query traffic against the Astra Mobile engine
+# Record with ASTRA_RECORD_TRAFFIC=<path>, then replay at any concurrency and speed-up
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from astra_core import QUERY_CACHE, process_mobile_query
+from astra_core.metrics import LatencyHistogram
+from astra_core.traffic import TRAFFIC, load_traffic
+
+
+def arrival_plan(entries, speedup=1.0, loops=1):
+    """(offset_seconds, query, recorded_bytes) with gaps divided by speedup (0 = no gaps)"""
+    plan = []
+    offset = 0.0
+    for _ in range(loops):
+        for gap, query, size in entries:
+            if speedup > 0:
+                offset += gap / speedup
+            plan.append((offset, query, size))
+    return plan
+
+
+def http_handler(url):
+    """Query a running `mobile_launcher.py --serve` instead of the in-process engine
+
+    Each worker thread keeps its own keep-alive connection.
+    """
+    address = urlsplit(url)
+    local = threading.local()
+
+    def query(text):
+        connection = getattr(local, 'connection', None)
+        if connection is None:
+            connection = local.connection = http.client.HTTPConnection(
+                address.hostname, address.port or 80, timeout=10)
+        try:
+            connection.request('POST', '/query', json.dumps({'query': text}).encode('utf-8'),
+                               {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            payload = json.loads(response.read())
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            local.connection = None
+            raise
+        if response.status != 200:
+            raise RuntimeError(payload.get('error'))
+        return payload['response']
+    return query
+
+
+def replay(entries, concurrency=1, speedup=1.0, loops=1, handler=process_mobile_query):
+    """Send every query at its (scaled) arrival time through `concurrency` workers
+
+    Latency runs from the scheduled arrival to the reply, so it includes
+    time spent queued behind other queries; service time is the handler
+    alone. Replies whose size differs from the recording are counted.
+    """
+    plan = arrival_plan(entries, speedup, loops)
+
+    def run(scheduled, query, size):
+        began = time.perf_counter()
+        try:
+            reply = handler(query)
+        except Exception:
+            return scheduled, began, time.perf_counter(), None, True
+        finished = time.perf_counter()
+        changed = size is not None and len(reply.encode('utf-8')) != size
+        return scheduled, began, finished, changed, False
+
+    hits, misses = QUERY_CACHE.hits, QUERY_CACHE.misses
+    started = time.perf_counter()
+    lag = 0.0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = []
+        for offset, query, size in plan:
+            scheduled = started + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                lag = max(lag, -delay)
+            futures.append(executor.submit(run, scheduled, query, size))
+        outcomes = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    latency = LatencyHistogram()
+    service = LatencyHistogram()
+    errors = changed = 0
+    for scheduled, began, finished, size_changed, failed in outcomes:
+        latency.record(finished - scheduled)
+        service.record(finished - began)
+        errors += failed
+        changed += bool(size_changed)
+    lookups = QUERY_CACHE.hits - hits + QUERY_CACHE.misses - misses
+    return {
+        'queries': len(plan),
+        'concurrency': concurrency,
+        'speedup': speedup,
+        'seconds': round(elapsed, 3),
+        'throughput_qps': round(len(plan) / elapsed, 1) if elapsed else None,
+        'latency': latency.summary(),
+        'service': service.summary(),
+        'dispatch_lag_ms': round(lag * 1000, 2),
+        'errors': errors,
+        'size_changed': changed,
+        'cache_hit_rate': round((QUERY_CACHE.hits - hits) / lookups, 3) if lookups else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Astra Mobile traffic against the engine")
+    parser.add_argument('log', help="traffic log written with ASTRA_RECORD_TRAFFIC")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1],
+                        help="worker threads; several values run one replay each")
+    parser.add_argument('--speedup', type=float, nargs='+', default=[1.0],
+                        help="divide recorded gaps by this (0 = send as fast as possible)")
+    parser.add_argument('--loops', type=int, default=1, help="replay the log this many times per run")
+    parser.add_argument('--cold', action='store_true', help="disable the response cache (in-process only)")
+    parser.add_argument('--server', metavar='URL',
+                        help="replay against a running API server (mobile_launcher.py --serve)")
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON")
+    args = parser.parse_args()
+
+    # Replayed queries must not end up in a live recording
+    TRAFFIC.stop()
+    entries = load_traffic(args.log)
+    if not entries:
+        print(f"❌ No queries in {args.log}")
+        return 1
+    recorded = sum(gap for gap, _, _ in entries)
+    print(f"📼 {len(entries)} queries over {recorded:.1f}s recorded in {args.log}")
+
+    handler = http_handler(args.server) if args.server else process_mobile_query
+    cache_size = QUERY_CACHE.maxsize
+    results = []
+    try:
+        for speedup in args.speedup:
+            for concurrency in args.concurrency:
+                # Every run starts from the same cache state
+                QUERY_CACHE.clear()
+                QUERY_CACHE.resize(0 if args.cold else cache_size)
+                result = replay(entries, concurrency, speedup, args.loops, handler)
+                results.append(result)
+                print(f"⚡ x{speedup:g} speed, {concurrency} workers: {result['throughput_qps']} q/s, "
+                      f"p50 {result['latency']['p50_ms']}ms, p99 {result['latency']['p99_ms']}ms "
+                      f"(service p99 {result['service']['p99_ms']}ms), "
+                      f"cache hits {result['cache_hit_rate']}, errors {result['errors']}, "
+                      f"changed sizes {result['size_changed']}")
+    finally:
+        QUERY_CACHE.resize(cache_size)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump({'log': args.log, 'server': args.server, 'cold': args.cold, 'loops': args.loops,
+                       'results': results}, output, indent=2)
+        print(f"📝 Results written to {args.json}")
+    return 1 if any(result['errors'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
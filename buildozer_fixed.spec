@@ -5,7 +5,7 @@ package.domain = org.astra.mobile
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas,json,md,txt
 source.include_patterns = *.py,*.kv,*.json,*.md,*.txt
-source.exclude_dirs = tests,bin,venv,.git,.vscode,__pycache__,astra_env
+source.exclude_dirs = tests,benchmarks,bin,venv,.git,.vscode,__pycache__,astra_env
 source.exclude_patterns = *.pyc,*.pyo,*.pyd,__pycache__,*.so,*.dll,*.dylib
 version = 1.0.0
 
@@ -129,32 +129,37 @@ def test_installation():
     """Test the installation"""
     print("🧪 Testing installation...")
     
+    # Core first and on its own: it is headless and needs no Kivy
     try:
-        # Test Kivy import
-        import kivy
-        print("✅ Kivy import successful")
-        
-        # Test mobile app import
-        from astra_mobile import AstraMobileApp
-        print("✅ Astra Mobile import successful")
-        
-        # Test basic functionality
-        from astra_mobile import process_mobile_query
+        from astra_core import process_mobile_query
         response = process_mobile_query("hello")
         if response:
             print("✅ Query processing works")
         else:
             print("❌ Query processing failed")
             return False
+    except ImportError as e:
+        print(f"❌ Core import failed: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Core test failed: {e}")
+        return False
+    
+    # Then the UI, so a Kivy problem is reported as such
+    try:
+        import kivy
+        print("✅ Kivy import successful")
         
-        return True
-        
+        from astra_mobile import AstraMobileApp
+        print("✅ Astra Mobile import successful")
     except ImportError as e:
-        print(f"❌ Import test failed: {e}")
+        print(f"❌ UI import failed: {e}")
         return False
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        print(f"❌ UI test failed: {e}")
         return False
+    
+    return True
 
 def create_shortcuts():
     """Create shortcut scripts"""
@@ -244,6 +244,14 @@ def create_mobile_package():
             shutil.copy2(file, mobile_dir)
             print(f"✅ Copied {file}")
     
+    # Copy the Kivy-free core package
+    if os.path.isdir('astra_core'):
+        core_dir = mobile_dir / 'astra_core'
+        if core_dir.exists():
+            shutil.rmtree(core_dir)
+        shutil.copytree('astra_core', core_dir, ignore=shutil.ignore_patterns('__pycache__'))
+        print("✅ Copied astra_core/")
+    
     # Create README for mobile package
     readme_content = """# Astra Mobile Package
 
@@ -2,6 +2,11 @@
 # mobile_launcher.py - Astra Mobile Launcher
 # Simple launcher for mobile version with error handling
 
+import time
+
+# Taken before any other import so the startup profile covers them
+LAUNCHED_AT = time.perf_counter()
+
 import sys
 import os
 import traceback
@@ -63,6 +68,46 @@ def launch_mobile_app():
         traceback.print_exc()
         return False
 
+def profile_startup(output):
+    """Launch once, stop when interactive and write the startup timeline"""
+    # Kivy would reject our command line options
+    os.environ['KIVY_NO_ARGS'] = '1'
+    
+    from astra_core.startup_profile import STARTUP, format_summary
+    STARTUP.enable(LAUNCHED_AT)
+    STARTUP.mark('import astra_core')
+    
+    if not launch_mobile_app():
+        return False
+    
+    report = STARTUP.write(output)
+    print()
+    print(format_summary(report))
+    print(f"📄 Timeline written to {output}")
+    return report['summary']['within_budget']
+
+def serve_api(address):
+    """Run the engine as a local HTTP/JSON API (no Kivy needed)"""
+    from astra_core.server import AstraServer, parse_address
+    
+    try:
+        host, port = parse_address(address)
+    except ValueError:
+        print(f"❌ Invalid address: {address} (use host:port or port)")
+        return False
+    
+    print(f"🌐 Astra API on http://{host}:{port}")
+    print("💡 Try: curl -d '{\"query\": \"hello\"}' " f"http://{host}:{port}/query")
+    print("🛑 Press Ctrl+C to stop")
+    try:
+        AstraServer(host, port).run()
+    except OSError as e:
+        print(f"❌ Could not start the API server: {e}")
+        return False
+    except KeyboardInterrupt:
+        print("\n👋 API server stopped")
+    return True
+
 def show_help():
     """Show help information"""
     print("""
@@ -72,6 +117,12 @@ Usage:
   python mobile_launcher.py          # Launch mobile app
   python mobile_launcher.py --help   # Show this help
   python mobile_launcher.py --info   # Show app info
+  python mobile_launcher.py --profile-startup [file.json]
+                                     # Time startup until interactive,
+                                     # exit 1 if over the 2s budget
+  python mobile_launcher.py --serve [host:port]
+                                     # Serve the engine as an HTTP/JSON API
+                                     # (default 127.0.0.1:8765)
 
 Features:
   • Lightweight AI assistant
@@ -148,6 +199,14 @@ def main():
             show_info()
             return
         
+        elif arg == '--profile-startup':
+            output = sys.argv[2] if len(sys.argv) > 2 else 'startup_profile.json'
+            sys.exit(0 if profile_startup(output) else 1)
+        
+        elif arg == '--serve':
+            address = sys.argv[2] if len(sys.argv) > 2 else None
+            sys.exit(0 if serve_api(address) else 1)
+        
         else:
             print(f"❌ Unknown argument: {arg}")
             print("💡 Use --help for available options")
@@ -2,17 +2,43 @@
 # mobile_main.py - Main entry point for Astra Mobile APK
 # Optimized for Android build with Buildozer
 
+import time
+
+# Taken before any other import so the startup profile covers them
+LAUNCHED_AT = time.perf_counter()
+
 import os
 import sys
-from kivy.app import App
-from kivy.core.window import Window
-from kivy.utils import platform
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from astra_core.log import LOG
+from astra_core.startup_profile import STARTUP, format_summary
+
+def startup_profile_output():
+    """JSON path from --profile-startup [path] or ASTRA_PROFILE_STARTUP, else None"""
+    if '--profile-startup' in sys.argv:
+        index = sys.argv.index('--profile-startup')
+        if index + 1 < len(sys.argv) and not sys.argv[index + 1].startswith('-'):
+            return sys.argv[index + 1]
+        return 'startup_profile.json'
+    return os.environ.get('ASTRA_PROFILE_STARTUP')
+
+PROFILE_OUTPUT = startup_profile_output()
+if PROFILE_OUTPUT:
+    # Kivy would reject our command line options
+    os.environ['KIVY_NO_ARGS'] = '1'
+    STARTUP.enable(LAUNCHED_AT)
+    STARTUP.mark('import astra_core')
+
+from kivy.app import App
+from kivy.core.window import Window
+from kivy.utils import platform
+
 # Import mobile app
 from astra_mobile import AstraMobileApp
+STARTUP.mark('import astra_mobile')
 
 def main():
     """Main entry point for mobile app"""
@@ -30,10 +56,12 @@ def main():
         app = AstraMobileApp()
         app.run()
         
+        if PROFILE_OUTPUT:
+            report = STARTUP.write(PROFILE_OUTPUT)
+            print(format_summary(report))
+        
     except Exception as e:
-        print(f"Error starting Astra Mobile: {e}")
-        import traceback
-        traceback.print_exc()
+        LOG.exception("Error starting Astra Mobile")
         
         # Show error screen
         from kivy.uix.label import Label
@@ -26,12 +26,136 @@ def test_imports():
     
     return True
 
+# Budgets for importing the headless core (no Kivy, no window)
+CORE_IMPORT_BUDGET_SECONDS = 0.5
+CORE_IMPORT_BUDGET_BYTES = 2 * 1024 * 1024
+
+# Everything astra_mobile.py may import at module load. Anything else must be
+# imported lazily (first use or first navigation) to keep cold start fast.
+STARTUP_IMPORTS = {
+    'os', 'signal', 'tempfile', 'time', 'datetime',
+    'kivy.app', 'kivy.cache', 'kivy.clock', 'kivy.core.window', 'kivy.utils',
+    'kivy.uix.boxlayout', 'kivy.uix.button', 'kivy.uix.label', 'kivy.uix.textinput',
+    'kivy.uix.screenmanager', 'kivy.uix.recycleboxlayout', 'kivy.uix.recycleview',
+    'kivy.uix.recycleview.views',
+    'astra_core', 'astra_core.frame_scheduler', 'astra_core.lazy_imports', 'astra_core.log',
+    'astra_core.memory', 'astra_core.message_store', 'astra_core.messages', 'astra_core.metrics',
+    'astra_core.power', 'astra_core.query_worker', 'astra_core.startup_profile', 'astra_core.tracing',
+    'astra_core.traffic', 'android_permissions'
+}
+# Optional dependencies that must never load during startup
+LAZY_ONLY_MODULES = ('kivy', 'requests', 'psutil', 'jnius')
+
+def test_startup_imports():
+    """Test that app startup only pays for the imports it needs"""
+    print("\n🚚 Testing startup imports...")
+    
+    try:
+        import ast
+        import json
+        import subprocess
+        
+        here = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(here, 'astra_mobile.py'), encoding='utf-8') as source:
+            tree = ast.parse(source.read())
+        
+        eager = set()
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                eager.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                eager.add(node.module)
+        unexpected = sorted(eager - STARTUP_IMPORTS)
+        if unexpected:
+            print(f"❌ New eager imports in astra_mobile.py: {', '.join(unexpected)}")
+            print("💡 Import them on first use, or add them to STARTUP_IMPORTS deliberately")
+            return False
+        print(f"✅ {len(eager)} module-level imports, all expected")
+        
+        # The app's core modules together, in a fresh interpreter
+        core = sorted(name for name in eager if name.split('.')[0] == 'astra_core')
+        probe = (
+            "import json, sys, time\n"
+            "start = time.perf_counter()\n"
+            f"for name in {core!r}: __import__(name)\n"
+            "elapsed = time.perf_counter() - start\n"
+            f"lazy = sorted(m for m in sys.modules if m.split('.')[0] in {LAZY_ONLY_MODULES!r})\n"
+            "print(json.dumps({'seconds': elapsed, 'lazy': lazy}))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=here)
+        if result.returncode != 0:
+            print(f"❌ Core modules failed to import: {result.stderr.strip()}")
+            return False
+        
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"📊 App core modules: {report['seconds'] * 1000:.1f}ms")
+        if report['lazy']:
+            print(f"❌ Optional modules loaded at startup: {', '.join(report['lazy'])}")
+            return False
+        if report['seconds'] > CORE_IMPORT_BUDGET_SECONDS:
+            print(f"❌ Startup imports over budget ({CORE_IMPORT_BUDGET_SECONDS}s)")
+            return False
+        
+        print("✅ Startup imports within budget")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Startup imports test failed: {e}")
+        return False
+
+def test_core_import_budget():
+    """Test that the core engine imports fast, small and without Kivy"""
+    print("\n⏱️ Testing core import budget...")
+    
+    try:
+        import json
+        import subprocess
+        
+        # Fresh interpreter so earlier imports do not hide the real cost
+        probe = (
+            "import json, sys, time, tracemalloc\n"
+            "tracemalloc.start()\n"
+            "start = time.perf_counter()\n"
+            "import astra_core\n"
+            "elapsed = time.perf_counter() - start\n"
+            "peak = tracemalloc.get_traced_memory()[1]\n"
+            "heavy = sorted(m for m in sys.modules if m.split('.')[0] in ('kivy', 'requests'))\n"
+            "print(json.dumps({'seconds': elapsed, 'bytes': peak, 'heavy': heavy}))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if result.returncode != 0:
+            print(f"❌ Core import failed: {result.stderr.strip()}")
+            return False
+        
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"📊 Import: {report['seconds'] * 1000:.1f}ms, {report['bytes'] / 1024:.0f}KB")
+        
+        if report['heavy']:
+            print(f"❌ Core pulled in UI/network modules: {', '.join(report['heavy'])}")
+            return False
+        if report['seconds'] > CORE_IMPORT_BUDGET_SECONDS:
+            print(f"❌ Import time over budget ({CORE_IMPORT_BUDGET_SECONDS}s)")
+            return False
+        if report['bytes'] > CORE_IMPORT_BUDGET_BYTES:
+            print(f"❌ Import memory over budget ({CORE_IMPORT_BUDGET_BYTES // 1024}KB)")
+            return False
+        
+        print("✅ Core imports headless within budget")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Core import budget test failed: {e}")
+        return False
+
 def test_query_processing():
     """Test query processing functionality"""
     print("\n🧪 Testing query processing...")
     
     try:
-        from astra_mobile import process_mobile_query
+        from astra_core import process_mobile_query
         
         test_queries = [
             "hello",
@@ -63,7 +187,7 @@ def test_offline_responses():
     print("\n📚 Testing offline responses...")
     
     try:
-        from astra_mobile import OFFLINE_RESPONSES
+        from astra_core import OFFLINE_RESPONSES
         
         # Test a few responses
         test_cases = [
@@ -92,7 +216,7 @@ def test_math_operations():
     print("\n🧮 Testing math operations...")
     
     try:
-        from astra_mobile import simple_math
+        from astra_core import simple_math
         
         test_calculations = [
             ("calculate 15 + 23", "38"),
@@ -119,12 +243,69 @@ def test_math_operations():
         print(f"❌ Math operations test failed: {e}")
         return False
 
+def test_math_limits():
+    """Test that the math engine rejects runaway expressions"""
+    print("\n🛡️ Testing math limits...")
+    
+    try:
+        import time
+        from astra_core.math_engine import MathError, MathLimitError, calculate
+        
+        test_calculations = [
+            ("-2 ** 2", -4),
+            ("(1 + 2) * 3", 9),
+            ("2 ** -1", 0.5),
+            ("0.5 ** -2", 4.0),
+            ("10 / 4", 2.5)
+        ]
+        
+        for expression, expected in test_calculations:
+            result = calculate(expression)
+            if result != expected:
+                print(f"❌ '{expression}' → {result}, expected {expected}")
+                return False
+            print(f"✅ '{expression}' → {result}")
+        
+        for expression in ["9**9**9", "10 ** 100", "0.0000001 ** -64", "9" * 40, "+".join(["1"] * 200)]:
+            start = time.perf_counter()
+            try:
+                calculate(expression)
+                print(f"❌ '{expression[:20]}' was not rejected")
+                return False
+            except MathLimitError:
+                elapsed = time.perf_counter() - start
+                if elapsed > 0.05:
+                    print(f"❌ '{expression[:20]}' took {elapsed:.3f}s to reject")
+                    return False
+                print(f"✅ '{expression[:20]}' rejected in {elapsed * 1000:.2f}ms")
+        
+        for expression in ["1 / 0", "2 * (3", "import os"]:
+            try:
+                calculate(expression)
+                print(f"❌ '{expression}' should have failed")
+                return False
+            except MathError:
+                print(f"✅ '{expression}' rejected")
+        
+        from astra_core import get_offline_response, simple_math
+        reply = simple_math("calculate 0.0000001 ** -64")
+        if reply is None or "too big" not in reply or "too big" not in get_offline_response("calculate 0.0000001 ** -64"):
+            print(f"❌ Tiny base to a negative power not reported as too big: {reply}")
+            return False
+        print("✅ Tiny base to a negative power reported as too big")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Math limits test failed: {e}")
+        return False
+
 def test_commands():
     """Test command handling"""
     print("\n⚙️ Testing commands...")
     
     try:
-        from astra_mobile import handle_mobile_commands
+        from astra_core import handle_mobile_commands
         
         test_commands = [
             "/help",
@@ -155,12 +336,1335 @@ def test_commands():
         print(f"❌ Commands test failed: {e}")
         return False
 
+def test_response_cache():
+    """Test static memoization and dynamic TTL expiry"""
+    print("\n🗄️ Testing response cache...")
+    
+    try:
+        from astra_core.response_cache import ResponseCache, dynamic_response, resolve_response
+        
+        now = [0.0]
+        cache = ResponseCache(maxsize=2, clock=lambda: now[0])
+        cache.put('hello', 'static reply')
+        cache.put('time', 'dynamic reply', ttl=1.0)
+        
+        if cache.get('hello') != 'static reply' or cache.get('time') != 'dynamic reply':
+            print("❌ Cached replies not returned")
+            return False
+        print("✅ Static and dynamic replies cached")
+        
+        now[0] = 1.5
+        if cache.get('time') is not None or cache.get('hello') != 'static reply':
+            print("❌ TTL expiry incorrect")
+            return False
+        print("✅ Dynamic reply expired after its TTL")
+        
+        cache.put('a', 1)
+        cache.put('b', 2)
+        if len(cache) != 2 or 'hello' in cache:
+            print("❌ Cache not bounded")
+            return False
+        print("✅ Cache stays bounded")
+        
+        calls = []
+        
+        @dynamic_response(ttl=5.0)
+        def counter():
+            calls.append(1)
+            return f"call {len(calls)}"
+        
+        first = resolve_response(counter)
+        second = resolve_response(counter)
+        if first != ("call 1", 5.0) or second != ("call 2", 5.0):
+            print(f"❌ Dynamic entry not evaluated per request: {first}, {second}")
+            return False
+        if resolve_response("plain") != ("plain", None):
+            print("❌ Static entry resolved incorrectly")
+            return False
+        print("✅ Dynamic entries evaluated per request")
+        
+        from astra_core.response_cache import canonical_query
+        
+        if canonical_query("  What   TIME is it?! ") != canonical_query("what time is it"):
+            print("❌ Canonical query forms differ")
+            return False
+        if canonical_query("/Status") != "/status" or canonical_query("(1+2)*3") != "(1+2)*3":
+            print("❌ Canonical query changed commands or math")
+            return False
+        print("✅ Queries normalized to canonical keys")
+        
+        # Variants share one entry, and the handlers answer them alike: they see the key
+        from astra_core import QUERY_CACHE, process_mobile_query
+        for variant, query in (("Hello!", "hello"), ("hello   there", "hello there"),
+                               ("calculate 2 + 3.", "calculate 2 + 3"), ("good  morning", "good morning")):
+            QUERY_CACHE.clear()
+            expected = process_mobile_query(query)
+            QUERY_CACHE.clear()
+            if process_mobile_query(variant) != expected:
+                print(f"❌ '{variant}' and '{query}' answered differently")
+                return False
+            hits = QUERY_CACHE.hits
+            if process_mobile_query(query) != expected or QUERY_CACHE.hits != hits + 1 or len(QUERY_CACHE) != 1:
+                print(f"❌ '{query}' did not reuse the entry for '{variant}'")
+                return False
+        QUERY_CACHE.clear()
+        print("✅ Query variants share one entry and one reply")
+        
+        stats_cache = ResponseCache(maxsize=4)
+        stats_cache.put('hello', 'hi')
+        stats_cache.get('hello')
+        stats_cache.get('missing')
+        stats = stats_cache.stats()
+        if stats['hits'] != 1 or stats['misses'] != 1 or stats['hit_rate'] != 0.5:
+            print(f"❌ Hit/miss counters incorrect: {stats}")
+            return False
+        stats_cache.resize(0)
+        if len(stats_cache) != 0:
+            print("❌ Resize did not evict entries")
+            return False
+        print("✅ Hit/miss counters and resize work")
+        
+        # Worker threads and the memory trimmer share one cache
+        import threading
+        import time
+        def yielding_clock():
+            # Give other threads a chance to run mid-operation
+            time.sleep(0)
+            return time.monotonic()
+        
+        shared = ResponseCache(maxsize=4, clock=yielding_clock)
+        failures = []
+        
+        def hammer(seed):
+            try:
+                for step in range(2000):
+                    key = f"q{(seed * 7 + step) % 10}"
+                    if shared.get(key) is None:
+                        shared.put(key, key, ttl=60 if step % 3 else 0.0001)
+                    if step % 500 == 0:
+                        shared.resize(2 + step % 3)
+            except Exception as e:
+                failures.append(e)
+        
+        threads = [threading.Thread(target=hammer, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if failures or len(shared) > shared.maxsize:
+            print(f"❌ Concurrent use failed: {failures[:1]}")
+            return False
+        print("✅ Safe under concurrent get/put/resize")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Response cache test failed: {e}")
+        return False
+
+def test_keyword_matcher():
+    """Test the precompiled keyword matcher"""
+    print("\n🔎 Testing keyword matcher...")
+    
+    try:
+        from astra_core.keyword_matcher import KeywordMatcher
+        
+        matcher = KeywordMatcher()
+        matcher.add('time', 'time', priority=0)
+        matcher.add('hi', 'hi', priority=0)
+        matcher.add('good morning', 'greeting', priority=1)
+        matcher.add('times', 'math', priority=2)
+        matcher.compile()
+        
+        test_cases = [
+            ("what time is it?", 'time'),
+            ("Good Morning!", 'greeting'),
+            ("10 times 5", 'math'),
+            ("this is a test query", None),
+            ("hi", 'hi')
+        ]
+        
+        for query, expected in test_cases:
+            match = matcher.best(query)
+            value = match.value if match else None
+            if value == expected:
+                print(f"✅ '{query}' → {value}")
+            else:
+                print(f"❌ '{query}' → {value}, expected {expected}")
+                return False
+        
+        # Many keywords still resolve in a single pass
+        big = KeywordMatcher()
+        for i in range(5000):
+            big.add(f"keyword{i}", i)
+        big.compile()
+        match = big.best("please find keyword4321 quickly")
+        if not match or match.value != 4321:
+            print("❌ Large keyword set lookup failed")
+            return False
+        print("✅ 5000 keywords matched in one pass")
+        
+        # Against the substring path it replaced, which scanned the query once per keyword
+        import time
+        from astra_core.engine import GREETING_WORDS, HELP_WORDS, MATH_KEYWORDS, OFFLINE_MATCHER, OFFLINE_RESPONSES
+        
+        filler = ' '.join(["the river train and the garden music"] * 40)
+        queries = [
+            "What is the weather like today?", "calculate 15 plus 23 for me", "tell me about topic250 please",
+            "Good morning Astra", "nothing to see here", filler
+        ] * 40
+        
+        def substring_path(keywords):
+            def scan(query):
+                query_lower = query.lower().strip()
+                return [keyword for keyword in keywords if keyword in query_lower]
+            return scan
+        
+        def fastest(func):
+            best = None
+            for _ in range(5):
+                started = time.perf_counter()
+                for query in queries:
+                    func(query)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+        
+        topics = [f"topic{i}" for i in range(500)]
+        many = KeywordMatcher()
+        for topic in topics:
+            many.add(topic, topic)
+        many.compile()
+        matched, scanned = fastest(many.ranked), fastest(substring_path(topics))
+        if matched * 3 > scanned:
+            print(f"❌ 500 keywords: matcher {matched * 1000:.1f}ms, substring scans {scanned * 1000:.1f}ms")
+            return False
+        print(f"✅ 500 keywords: {scanned / matched:.1f}x faster than substring scans")
+        
+        engine_keywords = list(OFFLINE_RESPONSES) + MATH_KEYWORDS + GREETING_WORDS + HELP_WORDS
+        matched, scanned = fastest(OFFLINE_MATCHER.ranked), fastest(substring_path(engine_keywords))
+        if matched > scanned * 2:
+            print(f"❌ Engine keywords: matcher {matched * 1000:.1f}ms, substring scans {scanned * 1000:.1f}ms")
+            return False
+        print(f"✅ Engine keywords: {matched * 1000:.1f}ms vs {scanned * 1000:.1f}ms for substring scans")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Keyword matcher test failed: {e}")
+        return False
+
+def test_command_registry():
+    """Test exact, alias and prefix command dispatch"""
+    print("\n🗂️ Testing command registry...")
+    
+    try:
+        from astra_core.command_registry import CommandRegistry
+        
+        registry = CommandRegistry()
+        
+        @registry.command('time', 'now', cacheable=False)
+        def time_handler(args):
+            return 'time'
+        
+        @registry.command('timer')
+        def timer_handler(args):
+            return 'timer'
+        
+        @registry.command('battery')
+        def battery_handler(args):
+            return 'battery'
+        
+        test_cases = [
+            ('time', 'time'),
+            ('now', 'time'),
+            ('timer', 'timer'),
+            ('bat', 'battery'),
+            ('timeline', None),
+            ('tim', None),
+            ('', None)
+        ]
+        
+        for name, expected in test_cases:
+            command = registry.resolve(name)
+            result = command.handler('') if command else None
+            if result == expected:
+                print(f"✅ '/{name}' → {result}")
+            else:
+                print(f"❌ '/{name}' → {result}, expected {expected}")
+                return False
+        
+        if registry.candidates('tim') != ['time', 'timer']:
+            print("❌ Ambiguous prefix candidates incorrect")
+            return False
+        if registry.resolve('time').cacheable:
+            print("❌ Cacheable flag not recorded")
+            return False
+        
+        try:
+            registry.register('now', time_handler)
+            print("❌ Duplicate alias accepted")
+            return False
+        except ValueError:
+            print("✅ Duplicate names rejected")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Command registry test failed: {e}")
+        return False
+
+def test_query_worker():
+    """Test ordered delivery, cancellation and backpressure"""
+    print("\n🧵 Testing query worker...")
+    
+    try:
+        import random
+        import threading
+        import time
+        from astra_core.query_worker import QueryCancelled, QueryWorker
+        
+        def slow_handler(query):
+            time.sleep(random.random() * 0.01)
+            return query.upper()
+        
+        delivered = []
+        done = threading.Event()
+        
+        def on_result(ticket, response, error):
+            delivered.append('cancelled' if isinstance(error, QueryCancelled) else response)
+            if ticket.query == 'q19':
+                done.set()
+        
+        worker = QueryWorker(handler=slow_handler, max_pending=32, workers=4)
+        tickets = [worker.submit(f"q{i}", on_result) for i in range(20)]
+        tickets[3].cancel()
+        done.wait(5)
+        worker.shutdown()
+        
+        expected = [f"Q{i}" if i != 3 else 'cancelled' for i in range(20)]
+        if delivered != expected:
+            print(f"❌ Delivery out of order or incomplete: {delivered}")
+            return False
+        print("✅ Results delivered in submission order")
+        print("✅ Cancelled query reported as cancelled, not answered")
+        
+        # A query cancelled while still queued must not vanish without a trace
+        gate = threading.Event()
+        outcomes = []
+        finished = threading.Event()
+        
+        def on_outcome(ticket, response, error):
+            outcomes.append((ticket.query, type(error).__name__ if error else response))
+            if ticket.query == 'queued':
+                finished.set()
+        
+        held = QueryWorker(handler=lambda query: gate.wait(5) and query)
+        held.submit('running', on_outcome)
+        queued = held.submit('queued', on_outcome, on_chunk=lambda *args: None)
+        held.cancel(queued)
+        gate.set()
+        finished.wait(5)
+        held.shutdown()
+        if outcomes != [('running', 'running'), ('queued', 'QueryCancelled')] or queued.started:
+            print(f"❌ Query cancelled before its first chunk was dropped: {outcomes}")
+            return False
+        print("✅ Query cancelled before starting still reaches the callback")
+        
+        gate = threading.Event()
+        blocked = QueryWorker(handler=lambda query: gate.wait(5), max_pending=2)
+        accepted = [blocked.submit(str(i), lambda *args: None) is not None for i in range(6)]
+        gate.set()
+        blocked.shutdown()
+        if all(accepted) or not accepted[0]:
+            print(f"❌ Bounded queue did not push back: {accepted}")
+            return False
+        print("✅ Full queue pushes back instead of blocking")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Query worker test failed: {e}")
+        return False
+
+def test_streaming():
+    """Test chunked responses from the engine through the worker"""
+    print("\n📡 Testing streaming responses...")
+    
+    try:
+        import threading
+        import time
+        from astra_core import QUERY_CACHE, handle_mobile_commands, stream_mobile_query
+        from astra_core.query_worker import QueryWorker
+        
+        # A cached reply comes back as one chunk; start from a cold cache
+        QUERY_CACHE.clear()
+        chunks = list(stream_mobile_query("/help"))
+        if len(chunks) < 2 or ''.join(chunks) != handle_mobile_commands("/help"):
+            print("❌ /help did not stream in chunks")
+            return False
+        print(f"✅ /help streamed in {len(chunks)} chunks")
+        
+        def slow_stream(query):
+            for index in range(3):
+                time.sleep(0.005)
+                yield f"{query}-{index} "
+        
+        events = []
+        done = threading.Event()
+        
+        def on_result(ticket, response, error):
+            events.append(('done', ticket.query))
+            if ticket.query == 'b':
+                done.set()
+        
+        worker = QueryWorker(handler=slow_stream, workers=2)
+        for query in ('a', 'b'):
+            worker.submit(query, on_result, on_chunk=lambda ticket, chunk: events.append(chunk))
+        done.wait(5)
+        worker.shutdown()
+        
+        expected = ['a-0 ', 'a-1 ', 'a-2 ', ('done', 'a'), 'b-0 ', 'b-1 ', 'b-2 ', ('done', 'b')]
+        if events != expected:
+            print(f"❌ Chunks interleaved or lost: {events}")
+            return False
+        print("✅ Chunks arrive incrementally and in order")
+        
+        if len(worker.first_chunk_latencies) != 2:
+            print("❌ Time to first chunk not recorded")
+            return False
+        print(f"✅ Time to first chunk: {worker.first_chunk_latencies[0] * 1000:.1f}ms")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Streaming test failed: {e}")
+        return False
+
+def test_message_store():
+    """Test the bounded history ring and on-disk paging"""
+    print("\n📜 Testing message store...")
+    
+    try:
+        import tempfile
+        from astra_core.message_store import MessageStore
+        from astra_core.messages import Message
+        
+        def texts(messages):
+            return [message.text for message in messages]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            store = MessageStore(
+                capacity=20, page_size=5,
+                spill_path=os.path.join(directory, 'history.jsonl')
+            )
+            for i in range(1000):
+                store.append(Message(float(i), 'user' if i % 2 else 'assistant', f"message {i} ✨"))
+            
+            if len(store) != 1000 or len(store._recent) > store.capacity:
+                print(f"❌ Ring not bounded: {len(store._recent)} in memory")
+                return False
+            print(f"✅ 1000 messages, {len(store._recent)} in memory")
+            
+            older = store.get_range(3, 9)
+            if texts(older) != [f"message {i} ✨" for i in range(3, 9)] or older[0].role != 'user':
+                print(f"❌ Paged-in messages incorrect: {older}")
+                return False
+            spanning = store.get_range(store.first_in_memory - 2, store.first_in_memory + 2)
+            expected = [f"message {i} ✨" for i in range(store.first_in_memory - 2, store.first_in_memory + 2)]
+            if texts(spanning) != expected:
+                print("❌ Range across disk and memory incorrect")
+                return False
+            print("✅ Older pages read back from disk")
+            
+            store.update_last_text("edited")
+            if texts(store.get_range(999, 1000)) != ["edited"]:
+                print("❌ update_last_text failed")
+                return False
+            store.append_to_last(" and streamed ✨")
+            if texts(store.get_range(998, 1000)) != ["message 998 ✨", "edited and streamed ✨"]:
+                print("❌ append_to_last failed")
+                return False
+            
+            store.trim(5)
+            if len(store._recent) > 5 or texts(store.get_range(990, 991)) != ["message 990 ✨"]:
+                print("❌ Trim lost messages")
+                return False
+            print("✅ Trim spills to disk without losing history")
+            store.close()
+            
+            # Only whole pages spill: memory is rounded up to a page, never below keep
+            paged = MessageStore(capacity=50, page_size=25, spill_path=os.path.join(directory, 'paged.jsonl'))
+            for i in range(60):
+                paged.append(Message(float(i), 'user', f"message {i}"))
+            for keep, resident in ((40, 35), (30, 35), (10, 10), (0, 10)):
+                paged.trim(keep)
+                if len(paged._recent) != resident or len(paged) != 60:
+                    print(f"❌ trim({keep}) left {len(paged._recent)} in memory, expected {resident}")
+                    return False
+            print("✅ Trim keeps at least `keep` messages, rounded up to a page")
+            paged.close()
+        
+        # Default spill files are private to each store and removed on close
+        first, second = MessageStore(capacity=5, page_size=5), MessageStore(capacity=5, page_size=5)
+        for store in (first, second):
+            for i in range(10):
+                store.append(Message(float(i), 'user', f"message {i}"))
+        spilled = (first.spill_path, second.spill_path)
+        if spilled[0] == spilled[1] or not all(os.path.exists(path) for path in spilled):
+            print(f"❌ Default spill files shared or missing: {spilled}")
+            return False
+        first.close()
+        second.close()
+        if any(os.path.exists(path) for path in spilled):
+            print("❌ Default spill files left behind")
+            return False
+        print("✅ Default spill files are unique and removed on close")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Message store test failed: {e}")
+        return False
+
+def test_message_log():
+    """Test the compact column-backed message model"""
+    print("\n🧱 Testing message log...")
+    
+    try:
+        from astra_core.messages import Message, MessageLog
+        
+        log = MessageLog()
+        log.append(1.0, 'user', "hello")
+        log.append(2.0, 'assistant', "👋 Hi!")
+        log.set_last_text("👋 Hi! How can I help?")
+        
+        if log[1] != Message(2.0, 'assistant', "👋 Hi! How can I help?") or log.role(0) != 'user':
+            print(f"❌ Stored messages incorrect: {list(log)}")
+            return False
+        if log[0].role is not Message(0.0, ''.join(['us', 'er']), '').role:
+            print("❌ Role strings not interned")
+            return False
+        if log.search("HELP") != [1]:
+            print("❌ Search failed")
+            return False
+        # Streamed chunks extend the buffer in place, one chunk at a time
+        buffer = log._text
+        for chunk in (" Ask", " me ✨", ""):
+            log.append_last_text(chunk)
+        if log._text is not buffer or log.text(0) != "hello" or log.text(1) != "👋 Hi! How can I help? Ask me ✨":
+            print(f"❌ append_last_text failed: {list(log)}")
+            return False
+        log.set_last_text("👋 Hi! How can I help?")
+        log.drop_first(1)
+        if len(log) != 1 or log.text(0) != "👋 Hi! How can I help?":
+            print("❌ drop_first broke the columns")
+            return False
+        print("✅ Append, edit, search and trim work")
+        
+        # 100k messages must fit in a few MB
+        text = "This is a typical short chat message for sizing"
+        big = MessageLog()
+        for i in range(100000):
+            big.append(float(i), 'user' if i % 2 else 'assistant', text)
+        per_message = big.nbytes() / len(big)
+        print(f"📊 100k messages: {big.nbytes() / 1024 / 1024:.1f}MB ({per_message:.0f} bytes/message)")
+        if per_message - len(text) > 17 or big.nbytes() > 8 * 1024 * 1024:
+            print("❌ Per-message overhead over budget")
+            return False
+        print("✅ Per-message overhead within 17 bytes")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Message log test failed: {e}")
+        return False
+
+def test_frame_coalescer():
+    """Test that updates within a frame collapse into one pass"""
+    print("\n🎞️ Testing frame coalescer...")
+    
+    try:
+        from astra_core.frame_scheduler import FrameCoalescer
+        
+        calls = []
+        armed = []
+        frame = FrameCoalescer(lambda callback: (lambda: armed.append(callback)))
+        frame.register('scroll', lambda: calls.append('scroll'), order=1)
+        frame.register('sizes', lambda: calls.append('sizes'), order=0)
+        
+        for _ in range(10):
+            frame.request('sizes')
+            frame.request('scroll')
+        frame.flush()
+        
+        if calls != ['sizes', 'scroll']:
+            print(f"❌ Expected one ordered pass, got {calls}")
+            return False
+        stats = frame.stats()
+        if stats['passes'] != 1 or stats['skipped'] != 18:
+            print(f"❌ Counters incorrect: {stats}")
+            return False
+        print(f"✅ 20 requests → 1 pass, {stats['skipped']} redundant runs skipped")
+        
+        frame.flush()
+        if frame.passes != 1:
+            print("❌ Empty frame ran a pass")
+            return False
+        print("✅ Idle frames do no work")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Frame coalescer test failed: {e}")
+        return False
+
+def test_power_manager():
+    """Test battery saver idle sleep and wake-up"""
+    print("\n🔋 Testing power manager...")
+    
+    try:
+        from astra_core.power import ACTIVE, IDLE, PAUSED, PowerManager
+        
+        class FakeEvent:
+            def __init__(self, clock, callback, timeout, interval):
+                self.clock = clock
+                self.callback = callback
+                self.due = clock.time + timeout
+                self.interval = interval
+            def cancel(self):
+                if self in self.clock.events:
+                    self.clock.events.remove(self)
+        
+        class FakeClock:
+            def __init__(self):
+                self.time = 0.0
+                self.frames = 0
+                self.events = []
+            def schedule_once(self, callback, timeout):
+                event = FakeEvent(self, callback, timeout, None)
+                self.events.append(event)
+                return event
+            def schedule_interval(self, callback, interval):
+                event = FakeEvent(self, callback, interval, interval)
+                self.events.append(event)
+                return event
+            def advance(self, seconds, fps):
+                end = self.time + seconds
+                while self.time < end:
+                    self.time += 1.0 / fps
+                    self.frames += 1
+                    for event in [e for e in self.events if e.due <= self.time]:
+                        if event.interval is None:
+                            self.events.remove(event)
+                        else:
+                            event.due += event.interval
+                        event.callback(0)
+        
+        clock = FakeClock()
+        caps = []
+        ticks = []
+        power = PowerManager(
+            clock,
+            set_max_fps=caps.append,
+            frame_counter=lambda: clock.frames,
+            idle_timeout=5.0,
+            enabled=True,
+            now=lambda: clock.time
+        )
+        power.schedule_interval(lambda dt: ticks.append(clock.time), 1.0)
+        
+        clock.advance(3, caps[-1])
+        power.poke()
+        clock.advance(3, caps[-1])
+        if power.state != ACTIVE:
+            print("❌ Went idle despite recent input")
+            return False
+        clock.advance(3, caps[-1])
+        if power.state != IDLE or caps[-1] != 10:
+            print(f"❌ Expected idle at 10 FPS, got {power.state} at {caps[-1]}")
+            return False
+        
+        ticks_at_idle = len(ticks)
+        clock.advance(10, caps[-1])
+        if len(ticks) != ticks_at_idle:
+            print("❌ Periodic job kept running while idle")
+            return False
+        print("✅ Idle after timeout: frame cap lowered, periodic jobs stopped")
+        
+        power.poke()
+        if power.state != ACTIVE or caps[-1] != 60:
+            print("❌ Input did not restore full speed")
+            return False
+        clock.advance(2, caps[-1])
+        if len(ticks) == ticks_at_idle:
+            print("❌ Periodic job not resumed")
+            return False
+        print("✅ Input restores full speed and periodic jobs")
+        
+        power.set_busy(True)
+        clock.advance(20, caps[-1])
+        if power.state != ACTIVE:
+            print("❌ Went idle while busy")
+            return False
+        power.set_busy(False)
+        
+        power.pause()
+        clock.advance(5, caps[-1])
+        if power.state != PAUSED or caps[-1] != 1:
+            print("❌ Pause did not throttle")
+            return False
+        power.resume()
+        if power.state != ACTIVE:
+            print("❌ Resume did not restore")
+            return False
+        
+        stats = power.stats()
+        if stats[IDLE]['wakeups_per_second'] >= stats[ACTIVE]['wakeups_per_second']:
+            print(f"❌ Idle not cheaper than active: {stats}")
+            return False
+        print(f"✅ Wakeups/s active {stats[ACTIVE]['wakeups_per_second']}, "
+              f"idle {stats[IDLE]['wakeups_per_second']}, paused {stats[PAUSED]['wakeups_per_second']}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Power manager test failed: {e}")
+        return False
+
+def test_memory_governor():
+    """Test memory budget enforcement and pressure signals"""
+    print("\n💾 Testing memory governor...")
+    
+    try:
+        from astra_core import QUERY_CACHE
+        from astra_core.engine import QUERY_CACHE_SIZE
+        from astra_core.memory import (
+            CRITICAL, MODERATE, NORMAL, TRIM_MEMORY_COMPLETE,
+            TRIM_MEMORY_RUNNING_LOW, MemoryGovernor, current_rss,
+            pressure_from_android, trim_core_caches
+        )
+        
+        rss = current_rss()
+        if rss is not None and rss <= 0:
+            print(f"❌ Implausible RSS: {rss}")
+            return False
+        print(f"✅ Current RSS: {rss}")
+        
+        usage = [50]
+        levels = []
+        governor = MemoryGovernor(budget_bytes=100, rss=lambda: usage[0])
+        governor.register('probe', levels.append)
+        
+        governor.check()
+        usage[0] = 85
+        governor.check()
+        usage[0] = 120
+        governor.check()
+        usage[0] = 40
+        governor.check()
+        if levels != [MODERATE, CRITICAL, NORMAL]:
+            print(f"❌ Unexpected trim levels: {levels}")
+            return False
+        print("✅ Budget thresholds trim and relax")
+        
+        if pressure_from_android(TRIM_MEMORY_RUNNING_LOW) != MODERATE or \
+                pressure_from_android(TRIM_MEMORY_COMPLETE) != CRITICAL:
+            print("❌ Android trim levels mapped incorrectly")
+            return False
+        governor.on_pressure(pressure_from_android(TRIM_MEMORY_COMPLETE))
+        stats = governor.stats()
+        if stats['signals'] != 1 or stats['critical_trims'] != 2 or stats['usage'] != 0.4:
+            print(f"❌ Stats incorrect: {stats}")
+            return False
+        print("✅ Pressure signals trim immediately")
+        
+        trim_core_caches(CRITICAL)
+        QUERY_CACHE.put('probe', 'value')
+        if len(QUERY_CACHE) != 0:
+            print("❌ Query cache not shrunk under pressure")
+            return False
+        trim_core_caches(NORMAL)
+        if QUERY_CACHE.maxsize != QUERY_CACHE_SIZE:
+            print("❌ Query cache not restored")
+            return False
+        print("✅ Core caches shrink and recover")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Memory governor test failed: {e}")
+        return False
+
+def test_startup_profile():
+    """Test the startup timeline profiler"""
+    print("\n⏱️ Testing startup profiler...")
+    
+    try:
+        import json
+        import time
+        from astra_core.startup_profile import StartupProfiler, format_summary
+        
+        profiler = StartupProfiler()
+        
+        @profiler.timed('build')
+        def build():
+            time.sleep(0.01)
+            return 'root'
+        
+        profiler.mark('ignored while disabled')
+        build()
+        if profiler.events:
+            print("❌ Disabled profiler recorded events")
+            return False
+        
+        profiler.enable(time.perf_counter())
+        profiler.mark('import kivy')
+        if build() != 'root':
+            print("❌ Timed function result lost")
+            return False
+        profiler.mark('first frame')
+        profiler.mark('interactive')
+        
+        report = json.loads(json.dumps(profiler.report(budget_ms=60000)))
+        names = [event['name'] for event in report['events']]
+        for name in ('import kivy', 'build', 'first frame', 'interactive'):
+            if name not in names:
+                print(f"❌ Missing event {name}: {names}")
+                return False
+        span = next(event for event in report['events'] if event['name'] == 'build')
+        if span['kind'] != 'span' or span['duration_ms'] < 10:
+            print(f"❌ Span not timed: {span}")
+            return False
+        summary = report['summary']
+        if not summary['within_budget'] or summary['time_to_first_frame_ms'] is None or \
+                summary['time_to_interactive_ms'] < summary['time_to_first_frame_ms']:
+            print(f"❌ Summary incorrect: {summary}")
+            return False
+        print(f"✅ Interactive at {summary['time_to_interactive_ms']:.1f}ms since {report['origin']}")
+        
+        if profiler.report(budget_ms=0)['summary']['within_budget']:
+            print("❌ Budget gate did not fail")
+            return False
+        if 'first frame' not in format_summary(report):
+            print("❌ Summary text incomplete")
+            return False
+        print("✅ Timeline, spans and budget gate work")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Startup profiler test failed: {e}")
+        return False
+
+def test_metrics():
+    """Test latency histograms, providers and the live status commands"""
+    print("\n📊 Testing metrics...")
+    
+    try:
+        import json
+        from astra_core import process_mobile_query
+        from astra_core.engine import is_uncached_command
+        from astra_core.metrics import METRICS, FrameTimer, LatencyHistogram, Metrics
+        
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+        summary = histogram.summary()
+        for key, expected in (('p50_ms', 50), ('p95_ms', 95), ('p99_ms', 99)):
+            if not expected <= summary[key] <= expected * 1.25:
+                print(f"❌ {key} out of range: {summary}")
+                return False
+        if summary['max_ms'] != 100 or summary['count'] != 100:
+            print(f"❌ Count/max incorrect: {summary}")
+            return False
+        print(f"✅ Histogram p50 {summary['p50_ms']}ms, p95 {summary['p95_ms']}ms, p99 {summary['p99_ms']}ms")
+        
+        metrics = Metrics()
+        metrics.record_query('offline', 0.002)
+        metrics.record_query('/status', 0.004)
+        metrics.register_provider('probe', lambda: {'value': 1})
+        metrics.register_provider('broken', lambda: 1 / 0)
+        snapshot = metrics.snapshot()
+        if snapshot['queries'] != 2 or snapshot['latency']['all']['count'] != 2:
+            print(f"❌ Snapshot counters incorrect: {snapshot}")
+            return False
+        if snapshot['probe'] != {'value': 1} or 'error' not in snapshot['broken']:
+            print("❌ Providers not collected safely")
+            return False
+        json.dumps(snapshot)
+        print("✅ Snapshot collects counters and providers")
+        
+        import threading
+        threaded = Metrics()
+        def record_many(handler):
+            for _ in range(1000):
+                threaded.record_query(handler, 0.001)
+        workers = [threading.Thread(target=record_many, args=(handler,))
+                   for handler in ('offline', 'offline', 'math', 'math')]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        latency = threaded.latency()
+        if threaded.queries != 4000 or latency['all']['count'] != 4000:
+            print(f"❌ Threaded queries lost: {threaded.queries}")
+            return False
+        if latency['offline']['count'] != 2000 or latency['math']['count'] != 2000:
+            print(f"❌ Per-thread histograms not merged: {latency}")
+            return False
+        threaded.reset()
+        if threaded.queries != 0:
+            print("❌ Reset did not clear per-thread counters")
+            return False
+        print("✅ Queries recorded from several threads merge without a lock")
+        
+        frames = FrameTimer()
+        for _ in range(60):
+            frames.tick(1 / 60)
+        if round(frames.stats()['fps']) != 60:
+            print(f"❌ FPS incorrect: {frames.stats()}")
+            return False
+        print("✅ Frame timer reports FPS and frame-time percentiles")
+        
+        before = METRICS.queries
+        process_mobile_query("hello there")
+        process_mobile_query("/time")
+        if METRICS.queries != before + 2:
+            print("❌ Engine queries not counted")
+            return False
+        latency = METRICS.latency()
+        if 'offline' not in latency or '/time' not in latency:
+            print(f"❌ Handlers not recorded: {sorted(latency)}")
+            return False
+        print("✅ Engine records per-handler latency")
+        
+        for command in ('status', 'memory', 'battery'):
+            if not is_uncached_command(command):
+                print(f"❌ /{command} must not be cached")
+                return False
+        status = process_mobile_query("/status")
+        if f"Queries: {METRICS.queries - 1}" not in status or "p95" not in status:
+            print(f"❌ /status not live: {status}")
+            return False
+        memory = process_mobile_query("/memory")
+        if "RSS" not in memory or "budget" not in memory:
+            print(f"❌ /memory not live: {memory}")
+            return False
+        print("✅ /status, /memory and /battery report live numbers")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Metrics test failed: {e}")
+        return False
+
+def test_tracing():
+    """Test pipeline tracing spans and Chrome trace export"""
+    print("\n🔬 Testing tracing...")
+    
+    try:
+        import json
+        import tempfile
+        from astra_core import QUERY_CACHE, process_mobile_query
+        from astra_core.tracing import NULL_SPAN, TRACER, Tracer
+        
+        tracer = Tracer(capacity=8, enabled=False)
+        if tracer.span('stage') is not NULL_SPAN:
+            print("❌ Disabled tracer allocated a span")
+            return False
+        with tracer.span('stage'):
+            pass
+        if len(tracer):
+            print("❌ Disabled tracer recorded a span")
+            return False
+        print("✅ Disabled path records nothing")
+        
+        saved = os.environ.get('ASTRA_TRACE')
+        try:
+            for value, expected in (('', False), ('0', False), ('false', False), ('No', False),
+                                    ('1', True), ('true', True), ('yes', True)):
+                os.environ['ASTRA_TRACE'] = value
+                if Tracer().enabled != expected:
+                    print(f"❌ ASTRA_TRACE={value!r} should {'enable' if expected else 'not enable'} tracing")
+                    return False
+        finally:
+            if saved is None:
+                os.environ.pop('ASTRA_TRACE', None)
+            else:
+                os.environ['ASTRA_TRACE'] = saved
+        print("✅ ASTRA_TRACE=0/false leaves tracing off")
+        
+        tracer.enable()
+        for index in range(20):
+            with tracer.span('stage.inner', {'index': index}):
+                pass
+        if len(tracer) != 8:
+            print(f"❌ Ring buffer not bounded: {len(tracer)}")
+            return False
+        trace = tracer.chrome_trace()
+        event = trace['traceEvents'][-1]
+        if event['ph'] != 'X' or event['cat'] != 'stage' or event['args'] != {'index': 19}:
+            print(f"❌ Chrome event malformed: {event}")
+            return False
+        print("✅ Ring buffer keeps the newest spans as Chrome 'X' events")
+        
+        was_enabled = TRACER.enabled
+        TRACER.clear()
+        TRACER.enable()
+        # Cached replies skip the offline stages; start from a cold cache
+        QUERY_CACHE.clear()
+        try:
+            process_mobile_query("calculate 12 + 30 please")
+            process_mobile_query("/status")
+        finally:
+            if not was_enabled:
+                TRACER.disable()
+        names = {row['name'] for row in TRACER.summary()}
+        for stage in ('query', 'query.canonicalize', 'offline.scan', 'offline.math',
+                      'query.cache_store', 'command.parse'):
+            if stage not in names:
+                print(f"❌ Missing pipeline stage {stage}: {sorted(names)}")
+                return False
+        print(f"✅ Pipeline stages traced: {', '.join(sorted(names))}")
+        
+        if not was_enabled:
+            traced = len(TRACER)
+            QUERY_CACHE.clear()
+            process_mobile_query("calculate 12 + 30 please")
+            if len(TRACER) != traced:
+                print("❌ Disabled tracer still recorded spans")
+                return False
+            print("✅ Disabled tracer records nothing")
+        
+        path = TRACER.dump(os.path.join(tempfile.gettempdir(), 'astra_trace_test.json'))
+        with open(path, encoding='utf-8') as dumped:
+            if not json.load(dumped)['traceEvents']:
+                print("❌ Dump is empty")
+                return False
+        os.remove(path)
+        TRACER.clear()
+        print("✅ Trace dumps as Chrome trace-event JSON")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Tracing test failed: {e}")
+        return False
+
+def test_logging():
+    """Test the ring-buffer logger"""
+    print("\n📋 Testing logging...")
+    
+    try:
+        import json
+        import tempfile
+        from astra_core.log import DEBUG, ERROR, INFO, WARNING, RingLogger
+        
+        class Expensive:
+            formatted = 0
+            def __repr__(self):
+                Expensive.formatted += 1
+                return "expensive"
+        
+        log = RingLogger(capacity=5, level=INFO)
+        log.debug("value %r", Expensive())
+        log.info("value %r", Expensive())
+        if Expensive.formatted != 0:
+            print("❌ Message formatted at log time")
+            return False
+        if len(log.records(min_level=DEBUG)) != 1:
+            print("❌ Level gate let DEBUG through")
+            return False
+        print("✅ Level gate before formatting; formatting deferred to read time")
+        
+        for index in range(10):
+            log.warning("warning %d", index, index=index)
+        records = log.records()
+        if len(records) != 5 or records[-1]['message'] != "warning 9" or records[-1]['fields'] != {'index': 9}:
+            print(f"❌ Ring buffer incorrect: {records}")
+            return False
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log.exception("boom")
+        last = log.records(min_level=ERROR)[-1]
+        if 'ZeroDivisionError' not in last.get('traceback', ''):
+            print("❌ Traceback not captured")
+            return False
+        print("✅ Bounded ring with structured fields and tracebacks")
+        
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'astra.log')
+        log = RingLogger(level=INFO, flush_interval=60, batch_size=1000)
+        log.info("before file")
+        log.set_path(path)
+        for index in range(50):
+            log.info("entry %d", index)
+        if os.path.exists(path):
+            print("❌ Log written synchronously")
+            return False
+        log.close()
+        with open(path, encoding='utf-8') as written:
+            lines = [json.loads(line) for line in written]
+        if len(lines) != 51 or lines[0]['message'] != "before file":
+            print(f"❌ Batched flush wrote {len(lines)} records")
+            return False
+        print("✅ Records flushed to disk in a batch off the calling thread")
+        
+        exported = log.export(os.path.join(directory, 'export.jsonl'))
+        with open(exported, encoding='utf-8') as export:
+            if not export.readline():
+                print("❌ Export empty")
+                return False
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+        print("✅ Logs export as JSON lines")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Logging test failed: {e}")
+        return False
+
+def test_engine_benchmark():
+    """Test the engine benchmark corpus, measurements and regression check"""
+    print("\n⏱️ Testing engine benchmark...")
+    
+    try:
+        from benchmarks.bench_engine import compare, generate_corpus, run_suite
+        
+        corpus = generate_corpus(size=5, seed=7)
+        if corpus != generate_corpus(size=5, seed=7):
+            print("❌ Corpus not deterministic")
+            return False
+        if any(len(queries) != 5 for queries in corpus.values()):
+            print(f"❌ Corpus sizes incorrect: {sorted(corpus)}")
+            return False
+        print(f"✅ Corpus categories: {', '.join(corpus)}")
+        
+        results = run_suite(size=5, rounds=1, seed=7)
+        for name in ('get_offline_response', 'simple_math', 'handle_mobile_commands',
+                     'process_mobile_query[cold]', 'process_mobile_query[warm]'):
+            result = results.get(name)
+            if result is None or not result['ops_per_sec'] or result['p50_us'] > result['p99_us']:
+                print(f"❌ Missing or inconsistent result for {name}: {result}")
+                return False
+        print(f"✅ {len(results)} cases measured")
+        
+        baseline = {'results': {name: dict(result) for name, result in results.items()}}
+        if compare(results, baseline):
+            print("❌ Identical results reported as a regression")
+            return False
+        baseline['results']['simple_math']['ops_per_sec'] = results['simple_math']['ops_per_sec'] * 10
+        regressions = compare(results, baseline, tolerance=0.3)
+        if len(regressions) != 1 or 'simple_math' not in regressions[0]:
+            print(f"❌ Slowdown not detected: {regressions}")
+            return False
+        print("✅ Regressions beyond the tolerance are reported")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Engine benchmark test failed: {e}")
+        return False
+
+def test_traffic():
+    """Test recording query traffic and replaying it"""
+    print("\n📼 Testing traffic record and replay...")
+    
+    try:
+        import tempfile
+        from astra_core import process_mobile_query
+        from astra_core.engine import record_traffic
+        from astra_core.traffic import TrafficRecorder, load_traffic
+        from benchmarks.replay_traffic import arrival_plan, replay
+        
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'traffic.jsonl')
+        now = [100.0]
+        recorder = TrafficRecorder(path, clock=lambda: now[0])
+        recorder.record("hello", 10)
+        now[0] += 1.5
+        recorder.record("calculate 2 + 2", 20)
+        now[0] += 0.25
+        recorder.record("héllo 👋", 30)
+        recorder.stop()
+        recorder.record("ignored after stop", 1)
+        
+        entries = load_traffic(path)
+        expected = [(0.0, "hello", 10), (1.5, "calculate 2 + 2", 20), (0.25, "héllo 👋", 30)]
+        if entries != expected:
+            print(f"❌ Log round trip incorrect: {entries}")
+            return False
+        print("✅ Queries, gaps and reply sizes round-trip through the log")
+        
+        plan = arrival_plan(entries, speedup=2, loops=2)
+        offsets = [offset for offset, _, _ in plan]
+        if len(plan) != 6 or offsets[:3] != [0.0, 0.75, 0.875] or offsets[3] != 0.875:
+            print(f"❌ Arrival plan incorrect: {offsets}")
+            return False
+        if any(offset for offset, _, _ in arrival_plan(entries, speedup=0)):
+            print("❌ Speed-up 0 should send without gaps")
+            return False
+        print("✅ Speed-up scales the recorded gaps")
+        
+        # The engine hook records each query with its real reply size
+        engine_path = os.path.join(directory, 'engine.jsonl')
+        engine_recorder = TrafficRecorder(engine_path)
+        import astra_core.engine as engine
+        original = engine.TRAFFIC
+        engine.TRAFFIC = engine_recorder
+        try:
+            reply = process_mobile_query("hello there")
+            list(record_traffic("manual", iter(["ab", "é"])))
+        finally:
+            engine.TRAFFIC = original
+            engine_recorder.stop()
+        recorded = load_traffic(engine_path)
+        if recorded[0][1:] != ("hello there", len(reply.encode('utf-8'))) or recorded[1][2] != 4:
+            print(f"❌ Engine recording incorrect: {recorded}")
+            return False
+        print("✅ Engine records live queries")
+        
+        result = replay(recorded * 10, concurrency=4, speedup=0)
+        if result['queries'] != 20 or result['errors'] or result['latency']['count'] != 20:
+            print(f"❌ Replay result incorrect: {result}")
+            return False
+        print(f"✅ Replayed {result['queries']} queries at {result['throughput_qps']} q/s")
+        
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Traffic test failed: {e}")
+        return False
+
+def test_server():
+    """Test the HTTP/JSON API: endpoints, keep-alive, batching and streaming"""
+    print("\n🌐 Testing API server...")
+    
+    try:
+        import http.client
+        import json
+        import socket
+        import threading
+        import time
+        from astra_core import QUERY_CACHE
+        from astra_core.server import AstraServer, parse_address
+        
+        if parse_address(None) != ('127.0.0.1', 8765) or parse_address('0.0.0.0:80') != ('0.0.0.0', 80):
+            print("❌ Address parsing incorrect")
+            return False
+        
+        server = AstraServer('127.0.0.1', 0)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        if not server.ready.wait(5):
+            print("❌ Server did not start")
+            return False
+        
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=5)
+            
+            def call(method, path, payload=None):
+                body = json.dumps(payload).encode('utf-8') if payload is not None else None
+                connection.request(method, path, body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                return response.status, response.read().decode('utf-8')
+            
+            # Every call below shares one keep-alive connection
+            status, body = call('POST', '/query', {'query': "calculate 2 + 3"})
+            if status != 200 or "5" not in json.loads(body)['response']:
+                print(f"❌ /query failed: {status} {body}")
+                return False
+            status, body = call('POST', '/command', {'command': "offline"})
+            if status != 200 or "offline" not in json.loads(body)['response']:
+                print(f"❌ /command failed: {status} {body}")
+                return False
+            status, body = call('POST', '/batch', {'queries': ["hello", "calculate 4 * 5", "héllo 👋"]})
+            responses = json.loads(body).get('responses', [])
+            if status != 200 or len(responses) != 3 or "20" not in responses[1]:
+                print(f"❌ /batch failed: {status} {body}")
+                return False
+            print("✅ /query, /command and /batch answer over one connection")
+            
+            # A cached reply comes back as one chunk; start from a cold cache
+            QUERY_CACHE.clear()
+            status, body = call('POST', '/stream', {'query': "/help"})
+            lines = [json.loads(line) for line in body.splitlines()]
+            text = ''.join(line.get('chunk', '') for line in lines)
+            if status != 200 or len(lines) < 3 or not lines[-1].get('done') or "/help" not in text:
+                print(f"❌ /stream failed: {status} {lines[:2]}")
+                return False
+            print(f"✅ /stream sent {len(lines) - 1} NDJSON chunks")
+            
+            for method, path, payload, expected in (
+                ('GET', '/missing', None, 404),
+                ('GET', '/batch', None, 405),
+                ('POST', '/query', {'query': 42}, 400),
+                ('POST', '/batch', {'queries': ["hi"] * 101}, 413)
+            ):
+                status, body = call(method, path, payload)
+                if status != expected or 'error' not in json.loads(body):
+                    print(f"❌ {method} {path} gave {status}, expected {expected}")
+                    return False
+            connection.close()
+            print("✅ Bad requests get JSON errors")
+            
+            # Pipelined requests are answered in order on one socket
+            request = (b'POST /query HTTP/1.1\r\nContent-Length: 17\r\n\r\n{"query":"hello"}')
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as raw:
+                raw.sendall(request * 5 + b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n')
+                data = b''
+                while True:
+                    received = raw.recv(65536)
+                    if not received:
+                        break
+                    data += received
+            if data.count(b'HTTP/1.1 200 OK') != 6 or b'"status":"ok"' not in data:
+                print("❌ Pipelined requests not all answered")
+                return False
+            print("✅ Pipelined requests answered in order")
+            
+            # A body that never arrives in full must not hold the connection open
+            server.keep_alive_timeout = 0.3
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as raw:
+                raw.sendall(b'POST /query HTTP/1.1\r\nContent-Length: 100\r\n\r\n{"query":')
+                started = time.perf_counter()
+                try:
+                    closed = raw.recv(65536) == b''
+                except ConnectionResetError:
+                    closed = True
+                elapsed = time.perf_counter() - started
+            if not closed or elapsed > 2:
+                print(f"❌ Truncated body kept the connection open ({elapsed:.1f}s)")
+                return False
+            print(f"✅ Truncated body dropped after {elapsed:.1f}s")
+            
+        finally:
+            server.stop()
+            thread.join(5)
+        if thread.is_alive():
+            print("❌ Server did not stop")
+            return False
+        print("✅ Server stops cleanly")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Server test failed: {e}")
+        return False
+
 def test_mobile_settings():
     """Test mobile-specific settings"""
     print("\n📱 Testing mobile settings...")
     
     try:
-        from astra_mobile import MOBILE_MODE, LOW_MEMORY_MODE, BATTERY_SAVER
+        from astra_core import MOBILE_MODE, LOW_MEMORY_MODE, BATTERY_SAVER
         
         settings = {
             'MOBILE_MODE': MOBILE_MODE,
@@ -212,10 +1716,30 @@ def run_all_tests():
     tests = [
         ("File Structure", test_file_structure),
         ("Imports", test_imports),
+        ("Core Import Budget", test_core_import_budget),
         ("Mobile Settings", test_mobile_settings),
         ("Offline Responses", test_offline_responses),
+        ("Keyword Matcher", test_keyword_matcher),
+        ("Response Cache", test_response_cache),
         ("Math Operations", test_math_operations),
+        ("Math Limits", test_math_limits),
         ("Commands", test_commands),
+        ("Command Registry", test_command_registry),
+        ("Query Worker", test_query_worker),
+        ("Streaming", test_streaming),
+        ("Message Store", test_message_store),
+        ("Message Log", test_message_log),
+        ("Frame Coalescer", test_frame_coalescer),
+        ("Power Manager", test_power_manager),
+        ("Memory Governor", test_memory_governor),
+        ("Startup Profile", test_startup_profile),
+        ("Startup Imports", test_startup_imports),
+        ("Metrics", test_metrics),
+        ("Tracing", test_tracing),
+        ("Logging", test_logging),
+        ("Engine Benchmark", test_engine_benchmark),
+        ("Traffic Replay", test_traffic),
+        ("API Server", test_server),
         ("Query Processing", test_query_processing)
     ]
     
@@ -255,10 +1779,30 @@ Usage:
 Tests:
   • File structure validation
   • Module imports
+  • Core import budget
   • Mobile settings
   • Offline responses
+  • Keyword matcher
+  • Response cache
   • Math operations
+  • Math limits
   • Command handling
+  • Command registry
+  • Query worker
+  • Streaming responses
+  • Message store
+  • Message log
+  • Frame coalescer
+  • Power manager
+  • Memory governor
+  • Startup profiler
+  • Startup imports
+  • Metrics
+  • Tracing
+  • Logging
+  • Engine benchmark
+  • Traffic replay
+  • API server
   • Query processing
 
 Examples:
@@ -291,11 +1835,14 @@ def main():
         print("💡 Check the errors above and fix them")
         print("💡 Make sure all requirements are installed")
     
-    # Wait for user input
-    try:
-        input("\nPress Enter to exit...")
-    except KeyboardInterrupt:
-        pass
+    # Wait for user input (interactive runs only, so CI and pipes don't block)
+    if sys.stdin is not None and sys.stdin.isatty():
+        try:
+            input("\nPress Enter to exit...")
+        except (KeyboardInterrupt, EOFError):
+            pass
+    
+    sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file